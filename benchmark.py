@@ -0,0 +1,393 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import math_lib
+from math_lib import num
+
+
+# Version of the JSON result layout, bumped whenever its fields change
+RESULT_VERSION = 1
+
+# Operand sizes (in decimal digits) of the default sweep, 10**1 to 10**7
+SIZES = tuple(10**k for k in range(1, 8))
+
+# Minimum time (in seconds) one timing sample runs, short operations are repeated until they reach it
+MIN_TIME = 0.2
+
+# Number of timing samples per measurement, the fastest one is reported
+REPEAT = 3
+
+# Time (in seconds) of a single call beyond which an operation is not run at larger sizes
+TIME_LIMIT = 60.0
+
+# Relative slowdown that `compare` reports as a regression
+TOLERANCE = 0.2
+
+# Seed of the random operands, so every run measures the same numbers
+SEED = 20240501
+
+# Tuning constants of `math_lib` recorded with every run, to explain crossovers that moved
+_THRESHOLDS = ("KARATSUBA_THRESHOLD", "KARATSUBA_SQR_THRESHOLD", "TOOM3_THRESHOLD", "TOOM3_SQR_THRESHOLD",
+               "NTT_THRESHOLD", "NEWTON_DIV_THRESHOLD", "CONVERSION_THRESHOLD_BITS", "CONVERSION_SPLIT_BITS",
+               "INT_BACKEND_MIN_LIMBS", "INT_BACKEND_MAX_LIMBS", "INT_BACKEND_MAX_DIV_LIMBS",
+               "GMPY2_BACKEND_MIN_LIMBS")
+
+
+def _random_digits(rng: random.Random, digits: int) -> str:
+    """
+    Draws the decimal string of a random number with exactly `digits` digits.
+
+    Args:
+        rng (random.Random): The random number generator.
+        digits (int): The number of digits, at least 1.
+
+    Returns:
+        str: The digits, without a leading zero.
+    """
+    return str(rng.randrange(1, 10)) + "".join(rng.choices("0123456789", k=digits - 1))
+
+
+# Every operation maps to its setup, taking the operand strings and returning the arguments,
+# and to the timed call for `num` and for the `int` baseline
+OPERATIONS = {
+    "init": (lambda a, b: (a,), num, int),
+    "str": (lambda a, b: (a,), str, str),
+    "add": (lambda a, b: (a, b), lambda x, y: x + y, lambda x, y: x + y),
+    "sub": (lambda a, b: (a, b), lambda x, y: x - y, lambda x, y: x - y),
+    "mul": (lambda a, b: (a, b), lambda x, y: x * y, lambda x, y: x * y),
+    "div": (lambda a, b: (a + b, b), lambda x, y: x // y, lambda x, y: x // y),
+    "compare": (lambda a, b: (a, a[:-1] + str(9 - int(a[-1]))), lambda x, y: x < y, lambda x, y: x < y),
+}
+
+
+@contextmanager
+def _unlimited_int_digits():
+    """
+    Lifts the limit on decimal conversions of Python integers for the `int` baseline.
+    """
+    # The limit only exists from Python 3.11 on
+    if not hasattr(sys, "set_int_max_str_digits"):
+        yield
+        return
+
+    limit = sys.get_int_max_str_digits()
+    sys.set_int_max_str_digits(0)
+    try:
+        yield
+    finally:
+        sys.set_int_max_str_digits(limit)
+
+
+def _operands(operation: str, texts: tuple, kind: type) -> tuple:
+    """
+    Builds the arguments of an operation for one of the measured types.
+
+    Args:
+        operation (str): The name of the operation.
+        texts (tuple): The decimal strings of the two random operands.
+        kind (type): `num` or `int`.
+
+    Returns:
+        tuple: The arguments of the timed call.
+    """
+    arguments = OPERATIONS[operation][0](*texts)
+
+    # Conversions are measured from the string, everything else from ready-made values
+    if operation == "init":
+        return arguments
+    if kind is int:
+        # Large `int(str)` calls are quadratic, the `num` conversion is not
+        return tuple(int(num(text)) for text in arguments)
+    return tuple(num(text) for text in arguments)
+
+
+def _time(function, arguments: tuple, repeat: int, min_time: float) -> tuple:
+    """
+    Times a call the way `timeit` does, repeating it until a sample lasts `min_time`.
+
+    Args:
+        function: The timed function.
+        arguments (tuple): Its arguments.
+        repeat (int): The number of samples.
+        min_time (float): The minimum duration of a sample in seconds.
+
+    Returns:
+        tuple: `(seconds, loops)`, the fastest time of a single call and the calls per sample.
+    """
+    # Calibrate the number of calls per sample, the calibration run counts as the first sample
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            function(*arguments)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2 if elapsed * 10 >= min_time else 10
+
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            function(*arguments)
+        best = min(best, time.perf_counter() - start)
+    return best / loops, loops
+
+
+def _peak_memory(function, arguments: tuple) -> int:
+    """
+    Measures the peak memory allocated by a single call.
+
+    Args:
+        function: The measured function.
+        arguments (tuple): Its arguments.
+
+    Returns:
+        int: The peak of the newly allocated bytes, the operands themselves are not counted.
+    """
+    tracemalloc.start()
+    try:
+        function(*arguments)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(operation: str, digits: int, repeat: int = REPEAT, min_time: float = MIN_TIME,
+            seed: int = SEED) -> dict:
+    """
+    Measures one operation at one operand size for `num` and for the `int` baseline.
+
+    Args:
+        operation (str): The name of the operation, a key of `OPERATIONS`.
+        digits (int): The number of decimal digits of the operands.
+        repeat (int): The number of timing samples, the fastest one is reported.
+        min_time (float): The minimum duration of a timing sample in seconds.
+        seed (int): The seed of the random operands.
+
+    Returns:
+        dict: The operation, the size, one entry per type with its time per call, throughput
+        and peak memory, and `ratio`, the time of `num` relative to `int`.
+    """
+    # Every size draws its own operands, independent of the other measurements of the run
+    rng = random.Random(f"{seed}:{digits}")
+    texts = (_random_digits(rng, digits), _random_digits(rng, digits))
+
+    result = {"operation": operation, "digits": digits}
+    with _unlimited_int_digits():
+        for kind, function in (("num", OPERATIONS[operation][1]), ("int", OPERATIONS[operation][2])):
+            arguments = _operands(operation, texts, num if kind == "num" else int)
+            seconds, loops = _time(function, arguments, repeat, min_time)
+            result[kind] = {
+                "seconds": seconds,
+                "loops": loops,
+                "ops_per_second": 1 / seconds if seconds else None,
+                "digits_per_second": digits / seconds if seconds else None,
+                "peak_bytes": _peak_memory(function, arguments),
+            }
+
+    result["ratio"] = result["num"]["seconds"] / result["int"]["seconds"] if result["int"]["seconds"] else None
+    return result
+
+
+def environment() -> dict:
+    """
+    Describes the interpreter, the machine, the arithmetic backend and the tuning constants of a run.
+
+    Returns:
+        dict: The environment, stored with the results so that runs can be told apart.
+    """
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "backend": math_lib.get_backend(),
+        "backends": math_lib.available_backends(),
+        "thresholds": {name: getattr(math_lib, name) for name in _THRESHOLDS},
+    }
+
+
+def run(sizes=SIZES, operations=None, repeat: int = REPEAT, min_time: float = MIN_TIME,
+        time_limit: float = TIME_LIMIT, seed: int = SEED, progress=None) -> dict:
+    """
+    Sweeps the operand sizes for every operation.
+
+    Once a single call of an operation takes longer than `time_limit`, its larger sizes
+    are skipped and listed in `skipped` instead, so a full sweep finishes in bounded time.
+
+    Args:
+        sizes: The operand sizes in decimal digits, in increasing order.
+        operations: The names of the measured operations, `None` for all of `OPERATIONS`.
+        repeat (int): The number of timing samples per measurement.
+        min_time (float): The minimum duration of a timing sample in seconds.
+        time_limit (float): The time of a single call in seconds beyond which larger sizes are skipped.
+        seed (int): The seed of the random operands.
+        progress: An optional function called with every finished measurement.
+
+    Returns:
+        dict: The results in the layout written by `save`.
+    """
+    operations = list(OPERATIONS) if operations is None else list(operations)
+    for operation in operations:
+        if operation not in OPERATIONS:
+            raise ValueError(f"unknown benchmark operation: {operation!r}")
+
+    results, skipped = [], []
+    for operation in operations:
+        for index, digits in enumerate(sizes):
+            result = measure(operation, digits, repeat, min_time, seed)
+            results.append(result)
+            if progress is not None:
+                progress(result)
+
+            # The baseline may be slow as well, whichever is slower stops the sweep
+            if max(result["num"]["seconds"], result["int"]["seconds"]) > time_limit:
+                skipped.extend({"operation": operation, "digits": size} for size in sizes[index + 1:])
+                break
+
+    return {
+        "version": RESULT_VERSION,
+        "environment": environment(),
+        "settings": {"repeat": repeat, "min_time": min_time, "time_limit": time_limit, "seed": seed},
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def save(results: dict, file) -> None:
+    """
+    Writes benchmark results as JSON.
+
+    Args:
+        results (dict): The results of `run`.
+        file: A path or a writable text file object.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "w") as handle:
+            save(results, handle)
+        return
+
+    json.dump(results, file, indent=2)
+    file.write("\n")
+
+
+def load(file) -> dict:
+    """
+    Reads benchmark results written by `save`.
+
+    Args:
+        file: A path or a readable text file object.
+
+    Returns:
+        dict: The results.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file) as handle:
+            return load(handle)
+
+    results = json.load(file)
+    if results.get("version") != RESULT_VERSION:
+        raise ValueError(f"unsupported benchmark result version: {results.get('version')!r}")
+    return results
+
+
+def compare(baseline: dict, current: dict, tolerance: float = TOLERANCE, key: str = "ratio") -> list:
+    """
+    Compares two runs measurement by measurement.
+
+    By default the `num`/`int` time ratios are compared, which cancels most of the speed
+    difference between machines and between noisy runs. `key="seconds"` compares the raw
+    times of `num` instead, which is only meaningful for runs on the same machine.
+
+    Args:
+        baseline (dict): The results of the reference run.
+        current (dict): The results of the new run.
+        tolerance (float): The relative change that is still considered noise.
+        key (str): `"ratio"` or `"seconds"`.
+
+    Returns:
+        list: One dict per measurement present in both runs that changed by more than
+        `tolerance`, with the old and new value and the relative `change` (positive when slower).
+    """
+    if key not in ("ratio", "seconds"):
+        raise ValueError("compare() key must be 'ratio' or 'seconds'")
+
+    def value(result: dict):
+        return result["ratio"] if key == "ratio" else result["num"]["seconds"]
+
+    reference = {(result["operation"], result["digits"]): value(result) for result in baseline["results"]}
+    changes = []
+    for result in current["results"]:
+        old = reference.get((result["operation"], result["digits"]))
+        new = value(result)
+        if not old or new is None:
+            continue
+
+        change = new / old - 1
+        if abs(change) > tolerance:
+            changes.append({"operation": result["operation"], "digits": result["digits"],
+                            "old": old, "new": new, "change": change})
+    return changes
+
+
+def _report(result: dict) -> None:
+    """
+    Prints one finished measurement.
+
+    Args:
+        result (dict): The measurement from `measure`.
+    """
+    # The ratio is missing when the `int` call was too fast for the clock
+    ratio = "n/a" if result["ratio"] is None else f"{result['ratio']:.2f}"
+    print(f"{result['operation']:>8} {result['digits']:>9} digits: "
+          f"num {result['num']['seconds']:.3e}s  int {result['int']['seconds']:.3e}s  "
+          f"ratio {ratio}  peak {result['num']['peak_bytes']} bytes", file=sys.stderr)
+
+
+def main(argv=None) -> int:
+    """
+    Runs the benchmark suite from the command line.
+
+    Args:
+        argv: The command line arguments, `None` for `sys.argv`.
+
+    Returns:
+        int: The exit status, 1 when `--compare` found a regression.
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks `num` against Python integers.")
+    parser.add_argument("--max-digits", type=int, default=SIZES[-1], help="largest operand size in digits")
+    parser.add_argument("--operations", nargs="+", choices=list(OPERATIONS), help="operations to measure")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="timing samples per measurement")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME, help="minimum seconds per sample")
+    parser.add_argument("--time-limit", type=float, default=TIME_LIMIT, help="skip larger sizes after a slower call")
+    parser.add_argument("--seed", type=int, default=SEED, help="seed of the random operands")
+    parser.add_argument("--output", help="file receiving the JSON results, standard output by default")
+    parser.add_argument("--compare", help="JSON results of an earlier run to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="relative change treated as noise")
+    args = parser.parse_args(argv)
+
+    sizes = [size for size in SIZES if size <= args.max_digits]
+    results = run(sizes, args.operations, args.repeat, args.min_time, args.time_limit, args.seed, _report)
+    save(results, args.output or sys.stdout)
+
+    if args.compare is None:
+        return 0
+
+    changes = compare(load(args.compare), results, args.tolerance)
+    for change in changes:
+        print(f"{change['operation']:>8} {change['digits']:>9} digits: {change['change']:+.1%} "
+              f"({change['old']:.3g} -> {change['new']:.3g})", file=sys.stderr)
+    return 1 if any(change["change"] > 0 for change in changes) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
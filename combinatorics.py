@@ -0,0 +1,128 @@
+from bisect import bisect_right
+
+from math_lib import num, _int_to_limbs, _mul_limbs, _product_tree
+from primes import primes_up_to
+
+
+def _pack(factors, base: int) -> list:
+    """
+    Turns small integer factors into limb lists for a product tree.
+
+    Consecutive factors are multiplied as machine integers as long as their product
+    stays below one limb, which keeps the tree small.
+
+    Args:
+        factors: An iterable of positive Python integers.
+        base (int): The limb base.
+
+    Returns:
+        list: The limb lists of the packed factors.
+    """
+    packed = []
+    acc = 1
+    for factor in factors:
+        if factor >= base:
+            packed.append(_int_to_limbs(factor, base))
+        elif acc * factor < base:
+            acc *= factor
+        else:
+            packed.append([acc])
+            acc = factor
+
+    if acc > 1:
+        packed.append([acc])
+    return packed
+
+
+def _swing(n: int, primes: list, base: int) -> list:
+    """
+    Computes the swinging factorial `n! / (n // 2)!**2` from its prime factorization.
+
+    A prime `p` divides the swinging factorial with the exponent
+    `sum((n // p**i) % 2 for i >= 1)`.
+
+    Args:
+        n (int): The argument of the swinging factorial.
+        primes (list): All primes up to at least `n`.
+        base (int): The limb base.
+
+    Returns:
+        list: The limbs of the swinging factorial.
+    """
+    powers = []
+    for p in primes[:bisect_right(primes, n)]:
+        q, exponent = n, 0
+        while q >= p:
+            q //= p
+            exponent += q & 1
+        if exponent:
+            powers.append(p**exponent)
+    return _product_tree(_pack(powers, base), base)
+
+
+def factorial(n: "num | int", chunksize: int = 10) -> num:
+    """
+    Computes `n!` with the prime swing algorithm.
+
+    `n! = (n // 2)!**2 * swing(n)`, so the factorial costs one squaring and one
+    product tree over prime powers per halving of `n` instead of `n` multiplications.
+
+    Args:
+        n (num | int): The non-negative argument.
+        chunksize (int): Number of decimal digits per limb of the result.
+
+    Returns:
+        num: The factorial of `n`.
+    """
+    n = int(n)
+    if n < 0:
+        raise ValueError("factorial() not defined for negative values")
+
+    base = 10**chunksize
+    primes = primes_up_to(n)
+
+    def factorial_limbs(m: int) -> list:
+        if m < 2:
+            return [1]
+        half = factorial_limbs(m // 2)
+        return _mul_limbs(_mul_limbs(half, half, base), _swing(m, primes, base), base)
+
+    return num._from_limbs(factorial_limbs(n), False, chunksize)
+
+
+def binomial(n: "num | int", k: "num | int", chunksize: int = 10) -> num:
+    """
+    Computes the binomial coefficient `n choose k` from its prime factorization.
+
+    By Legendre's formula a prime `p` divides the coefficient with the exponent
+    `sum(n // p**i - k // p**i - (n - k) // p**i for i >= 1)`, the prime powers
+    are multiplied along a product tree.
+
+    Args:
+        n (num | int): The non-negative size of the set.
+        k (num | int): The non-negative size of the subsets.
+        chunksize (int): Number of decimal digits per limb of the result.
+
+    Returns:
+        num: The binomial coefficient, zero for `k > n`.
+    """
+    n, k = int(n), int(k)
+    if n < 0:
+        raise ValueError("n must be a non-negative integer")
+    if k < 0:
+        raise ValueError("k must be a non-negative integer")
+    if k > n:
+        return num(0, chunksize)
+
+    base = 10**chunksize
+    k = min(k, n - k)
+    powers = []
+    for p in primes_up_to(n):
+        exponent, power = 0, p
+        while power <= n:
+            exponent += n // power - k // power - (n - k) // power
+            power *= p
+        if exponent:
+            powers.append(p**exponent)
+
+    return num._from_limbs(_product_tree(_pack(powers, base), base), False, chunksize)
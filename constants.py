@@ -0,0 +1,226 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from math_lib import num
+from roots import isqrt
+
+
+# Chudnovsky series constants, every term adds about 14.18 digits
+_CHUDNOVSKY_A = 13591409
+_CHUDNOVSKY_B = 545140134
+_CHUDNOVSKY_C3_OVER_24 = 640320**3 // 24
+_CHUDNOVSKY_DIGITS_PER_TERM = 14.181647462725477
+
+# Extra digits computed beyond the requested ones (one limb), so the last digits come out exact
+GUARD_DIGITS = 10
+
+# Number of decimal digits in every streamed piece
+STREAM_CHUNK_DIGITS = 1 << 16
+
+
+def _chudnovsky_range(a: int, b: int) -> tuple:
+    """
+    Sums the Chudnovsky terms `a` to `b - 1` by binary splitting.
+
+    Args:
+        a (int): The first term.
+        b (int): The term after the last one.
+
+    Returns:
+        tuple: `(P, Q, T)` as `num` values.
+    """
+    if b - a == 1:
+        if a == 0:
+            p = q = num(1)
+        else:
+            p = num((6 * a - 5) * (2 * a - 1) * (6 * a - 1))
+            q = num(a * a * a * _CHUDNOVSKY_C3_OVER_24)
+        t = p * (_CHUDNOVSKY_A + _CHUDNOVSKY_B * a)
+        return p, q, -t if a % 2 else t
+
+    m = (a + b) // 2
+    return _chudnovsky_merge(_chudnovsky_range(a, m), _chudnovsky_range(m, b))
+
+
+def _chudnovsky_merge(left: tuple, right: tuple) -> tuple:
+    """
+    Combines the binary splitting results of two adjacent ranges of Chudnovsky terms.
+
+    Args:
+        left (tuple): `(P, Q, T)` of the lower range.
+        right (tuple): `(P, Q, T)` of the upper range.
+
+    Returns:
+        tuple: `(P, Q, T)` of both ranges together.
+    """
+    p1, q1, t1 = left
+    p2, q2, t2 = right
+    return p1 * p2, q1 * q2, q2 * t1 + p1 * t2
+
+
+def _e_range(a: int, b: int) -> tuple:
+    """
+    Sums `a! / k!` for `k` from `a + 1` to `b` by binary splitting.
+
+    Args:
+        a (int): The start of the range.
+        b (int): The end of the range.
+
+    Returns:
+        tuple: `(P, Q)` as `num` values with the sum equal to `P / Q` and `Q = b! / a!`.
+    """
+    if b - a == 1:
+        return num(1), num(b)
+
+    m = (a + b) // 2
+    return _e_merge(_e_range(a, m), _e_range(m, b))
+
+
+def _e_merge(left: tuple, right: tuple) -> tuple:
+    """
+    Combines the binary splitting results of two adjacent ranges of the series of e.
+
+    Args:
+        left (tuple): `(P, Q)` of the lower range.
+        right (tuple): `(P, Q)` of the upper range.
+
+    Returns:
+        tuple: `(P, Q)` of both ranges together.
+    """
+    p1, q1 = left
+    p2, q2 = right
+    return p1 * q2 + p2, q1 * q2
+
+
+def _split(series, merge, terms: int, workers: int) -> tuple:
+    """
+    Evaluates a binary splitting tree, with the lower levels spread over worker processes.
+
+    The terms are cut into one range per worker, every worker evaluates the subtree of
+    its range and the results are merged pairwise along the top of the tree.
+
+    Args:
+        series: The function evaluating a range `(a, b)` of terms.
+        merge: The function combining the results of two adjacent ranges.
+        terms (int): The number of terms.
+        workers (int): The number of worker processes, 1 to stay in this process.
+
+    Returns:
+        tuple: The result for all terms.
+    """
+    if workers <= 1 or terms < 2 * workers:
+        return series(0, terms)
+
+    bounds = [terms * i // workers for i in range(workers + 1)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(series, bounds[:-1], bounds[1:]))
+
+    while len(results) > 1:
+        merged = [merge(results[i], results[i + 1]) for i in range(0, len(results) - 1, 2)]
+        if len(results) % 2:
+            merged.append(results[-1])
+        results = merged
+    return results[0]
+
+
+def pi(digits: int, workers: int | None = 1) -> num:
+    """
+    Computes pi with the Chudnovsky series and binary splitting.
+
+    `pi = 426880 * sqrt(10005) * Q / T` for the binary splitting sums `Q` and `T`
+    over all terms.
+
+    Args:
+        digits (int): The number of digits after the decimal point.
+        workers (int): The number of worker processes for the splitting tree, `None` for all CPU cores.
+
+    Returns:
+        num: `floor(pi * 10**digits)`.
+    """
+    precision = digits + GUARD_DIGITS
+    terms = int(precision / _CHUDNOVSKY_DIGITS_PER_TERM) + 2
+    _, q, t = _split(_chudnovsky_range, _chudnovsky_merge, terms, workers or os.cpu_count() or 1)
+
+    root = isqrt(num(10005).scale10(2 * precision))[0]
+    return (q * 426880 * root // t).shift_right10(GUARD_DIGITS)
+
+
+def e(digits: int, workers: int | None = 1) -> num:
+    """
+    Computes Euler's number from the series `sum(1 / k!)` with binary splitting.
+
+    Args:
+        digits (int): The number of digits after the decimal point.
+        workers (int): The number of worker processes for the splitting tree, `None` for all CPU cores.
+
+    Returns:
+        num: `floor(e * 10**digits)`.
+    """
+    precision = digits + GUARD_DIGITS
+
+    # Enough terms for N! to exceed 10**precision
+    terms = 2
+    while math.lgamma(terms + 1) / math.log(10) < precision:
+        terms *= 2
+
+    p, q = _split(_e_range, _e_merge, terms, workers or os.cpu_count() or 1)
+    scale = num(1).scale10(precision)
+    return (scale + p.scale10(precision) // q).shift_right10(GUARD_DIGITS)
+
+
+def stream_digits(value: num, decimals: int):
+    """
+    Streams the decimal expansion of a scaled constant without building one giant string.
+
+    The integer part comes first, then the decimal point and the fractional digits
+    in pieces of about `STREAM_CHUNK_DIGITS` digits from `num.iter_digits`.
+
+    Args:
+        value (num): The constant times `10**decimals`, as returned by `pi` or `e`.
+        decimals (int): The number of digits after the decimal point.
+
+    Yields:
+        str: Consecutive pieces of the decimal expansion.
+    """
+    text_length = value.digits
+
+    # Pad with leading zeros so that the expansion has at least one integer digit
+    padding = max(decimals + 1 - text_length, 0)
+    position = padding + text_length  # Digits still to come
+    emitted_point = False
+
+    def emit(piece: str):
+        # Split the piece at the decimal point when it crosses it
+        nonlocal position, emitted_point
+        before = position - decimals
+        if not emitted_point and before <= len(piece):
+            head, tail = piece[:before], piece[before:]
+            position -= len(piece)
+            emitted_point = True
+            return head + "." + tail if decimals else head
+        position -= len(piece)
+        return piece
+
+    if padding:
+        yield emit("0" * padding)
+    for piece in value.iter_digits(STREAM_CHUNK_DIGITS):
+        yield emit(piece)
+
+
+def write_digits(value: num, decimals: int, file) -> None:
+    """
+    Writes the decimal expansion of a scaled constant to a file as it is produced.
+
+    Args:
+        value (num): The constant times `10**decimals`, as returned by `pi` or `e`.
+        decimals (int): The number of digits after the decimal point.
+        file: A path or a writable text file object.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "w") as handle:
+            write_digits(value, decimals, handle)
+        return
+
+    for piece in stream_digits(value, decimals):
+        file.write(piece)
@@ -0,0 +1,550 @@
+from math_lib import num, _HASH_MODULUS
+
+
+# Rounding modes, named like those of the `decimal` module
+ROUNDING_MODES = ("down", "up", "floor", "ceiling", "half_down", "half_up", "half_even")
+DEFAULT_ROUNDING = "half_even"
+
+# Significant digits of `/` when the operand scales do not ask for more, like the default context of `decimal`
+DIVISION_DIGITS = 28
+
+# Values with more digits are shown by coefficient and scale in `repr`
+_REPR_DIGITS = 40
+
+
+def _round_quotient(quotient: num, remainder: num, divisor: num, negative: bool, rounding: str) -> num:
+    """
+    Rounds a truncated quotient of magnitudes according to a rounding mode.
+
+    Args:
+        quotient (num): The truncated quotient of the magnitudes.
+        remainder (num): The remainder of the magnitudes.
+        divisor (num): The magnitude of the divisor.
+        negative (bool): Whether the exact quotient is negative.
+        rounding (str): One of `ROUNDING_MODES`.
+
+    Returns:
+        num: The rounded magnitude.
+    """
+    if not remainder or rounding == "down":
+        return quotient
+    if rounding == "up":
+        return quotient + 1
+    if rounding in ("floor", "ceiling"):
+        return quotient + 1 if negative == (rounding == "floor") else quotient
+
+    # Compare the remainder with half of the divisor, exact ties depend on the mode
+    order = (remainder + remainder)._compare(divisor)
+    if order == 0:
+        up = rounding == "half_up" or rounding == "half_even" and quotient.limbs[0] % 2 == 1
+    else:
+        up = order > 0
+    return quotient + 1 if up else quotient
+
+
+def _trailing_zeros(coefficient: num) -> int:
+    """
+    Counts the decimal zeros at the end of a non-zero coefficient, limb by limb.
+
+    Args:
+        coefficient (num): The coefficient.
+
+    Returns:
+        int: The number of trailing zero digits.
+    """
+    zeros = 0
+    for limb in coefficient.limbs:
+        if limb:
+            while limb % 10 == 0:
+                limb //= 10
+                zeros += 1
+            return zeros
+        zeros += coefficient.chunksize
+    return zeros
+
+
+class fixed():
+    __slots__ = ("coefficient", "scale", "rounding")
+
+    def __init__(self, value: "fixed | num | int | str", scale: int | None = None, rounding: str = DEFAULT_ROUNDING):
+        """
+        Stores a decimal number as an integer coefficient with a fixed number of fractional digits.
+
+        The value is `coefficient / 10**scale`. The coefficient is a `num`, so the
+        precision is only limited by memory. Results of arithmetic keep the larger scale
+        of their operands and are rounded with the rounding mode of the left operand.
+        Only `/` may use a larger scale, to keep `DIVISION_DIGITS` significant digits.
+
+        Args:
+            value (fixed | num | int | str): The value, strings may have a decimal point like "-12.345",
+                ".5" or "1.".
+            scale (int | None): The number of digits after the decimal point, by default that of `value`.
+            rounding (str): The rounding mode, one of `ROUNDING_MODES`.
+        """
+        if rounding not in ROUNDING_MODES:
+            raise ValueError(f"unknown rounding mode: {rounding!r}")
+        self.rounding = rounding
+
+        if isinstance(value, fixed):
+            coefficient, exact_scale = value.coefficient, value.scale
+        elif isinstance(value, str):
+            # The digits after the point become part of the coefficient
+            string = value.strip().replace("_", "")
+            whole, point, fraction = string.partition(".")
+            if fraction and not fraction.isdigit() or not (whole.lstrip("+-") or fraction):
+                raise ValueError(f"invalid literal for fixed(): {value!r}")
+            coefficient, exact_scale = num(whole + fraction), len(fraction)
+        else:
+            coefficient, exact_scale = (value if isinstance(value, num) else num(value)), 0
+
+        self.coefficient, self.scale = coefficient, exact_scale
+        if scale is not None:
+            self.coefficient, self.scale = self._rescaled(scale, rounding)
+
+
+    @classmethod
+    def _from_coefficient(cls, coefficient: num, scale: int, rounding: str) -> "fixed":
+        """
+        Creates a `fixed` directly from its coefficient without parsing anything.
+
+        Args:
+            coefficient (num): The value times `10**scale`.
+            scale (int): The number of digits after the decimal point.
+            rounding (str): The rounding mode.
+
+        Returns:
+            fixed: The new instance.
+        """
+        ret = object.__new__(cls)
+        ret.coefficient = coefficient
+        ret.scale = scale
+        ret.rounding = rounding
+        return ret
+
+
+    def _coerce(self, sec_num: "fixed | num | int") -> "fixed":
+        """
+        Converts an operand into a `fixed`, integers get scale zero.
+
+        Args:
+            sec_num (fixed | num | int): The operand.
+
+        Returns:
+            fixed: The operand as a `fixed`.
+        """
+        if isinstance(sec_num, fixed):
+            return sec_num
+        return fixed._from_coefficient(sec_num if isinstance(sec_num, num) else num(sec_num), 0, self.rounding)
+
+
+    def _rescaled(self, scale: int, rounding: str) -> tuple:
+        """
+        Computes the coefficient for another scale, rounding when digits are dropped.
+
+        Args:
+            scale (int): The new non-negative scale.
+            rounding (str): The rounding mode.
+
+        Returns:
+            tuple: The new coefficient and the new scale.
+        """
+        if scale < 0:
+            raise ValueError("scale must be a non-negative integer")
+        if scale >= self.scale:
+            return self.coefficient.scale10(scale - self.scale), scale
+
+        # Dropping decimal places is a division by a power of ten, done with limb shifts
+        drop = self.scale - scale
+        magnitude = abs(self.coefficient)
+        quotient = magnitude.shift_right10(drop)
+        remainder = magnitude - quotient.scale10(drop)
+        quotient = _round_quotient(quotient, remainder, num(1).scale10(drop), self.coefficient.negative, rounding)
+        return (-quotient if self.coefficient.negative else quotient), scale
+
+
+    def quantize(self, scale: int, rounding: str | None = None) -> "fixed":
+        """
+        Returns the value with a different number of digits after the decimal point.
+
+        Args:
+            scale (int): The new number of digits after the decimal point.
+            rounding (str | None): The rounding mode, by default that of `self`.
+
+        Returns:
+            fixed: The rounded value.
+        """
+        rounding = rounding or self.rounding
+        if rounding not in ROUNDING_MODES:
+            raise ValueError(f"unknown rounding mode: {rounding!r}")
+        return fixed._from_coefficient(*self._rescaled(scale, rounding), self.rounding)
+
+
+    def _aligned(self, sec_num: "fixed") -> tuple:
+        """
+        Brings the coefficients of two values to their common (larger) scale.
+
+        Args:
+            sec_num (fixed): The second value.
+
+        Returns:
+            tuple: Both coefficients and the common scale.
+        """
+        scale = max(self.scale, sec_num.scale)
+        return (self.coefficient.scale10(scale - self.scale), sec_num.coefficient.scale10(scale - sec_num.scale), scale)
+
+
+    def __add__(self, sec_num: "fixed | num | int") -> "fixed":
+        """
+        Adds two values exactly, the result has the larger scale.
+
+        Args:
+            sec_num (fixed | num | int): The value to add.
+
+        Returns:
+            fixed: The sum.
+        """
+        if not isinstance(sec_num, (fixed, num, int)):
+            return NotImplemented
+        a, b, scale = self._aligned(self._coerce(sec_num))
+        return fixed._from_coefficient(a + b, scale, self.rounding)
+
+
+    def __radd__(self, sec_num: "num | int") -> "fixed":
+        """
+        Handles addition with a `fixed` on the right side.
+
+        Args:
+            sec_num (num | int): The value to add.
+
+        Returns:
+            fixed: The sum.
+        """
+        return self + sec_num
+
+
+    def __sub__(self, sec_num: "fixed | num | int") -> "fixed":
+        """
+        Subtracts two values exactly, the result has the larger scale.
+
+        Args:
+            sec_num (fixed | num | int): The value to subtract.
+
+        Returns:
+            fixed: The difference.
+        """
+        if not isinstance(sec_num, (fixed, num, int)):
+            return NotImplemented
+        a, b, scale = self._aligned(self._coerce(sec_num))
+        return fixed._from_coefficient(a - b, scale, self.rounding)
+
+
+    def __rsub__(self, sec_num: "num | int") -> "fixed":
+        """
+        Handles subtraction from a number on the left side.
+
+        Args:
+            sec_num (num | int): The value to subtract from.
+
+        Returns:
+            fixed: The difference.
+        """
+        return -self + sec_num
+
+
+    def __mul__(self, sec_num: "fixed | num | int") -> "fixed":
+        """
+        Multiplies two values, the exact product is rounded to the larger scale.
+
+        Args:
+            sec_num (fixed | num | int): The value to multiply with.
+
+        Returns:
+            fixed: The product.
+        """
+        if not isinstance(sec_num, (fixed, num, int)):
+            return NotImplemented
+        sec_num = self._coerce(sec_num)
+        product = fixed._from_coefficient(self.coefficient * sec_num.coefficient, self.scale + sec_num.scale, self.rounding)
+        return product.quantize(max(self.scale, sec_num.scale))
+
+
+    def __rmul__(self, sec_num: "num | int") -> "fixed":
+        """
+        Handles multiplication with a `fixed` on the right side.
+
+        Args:
+            sec_num (num | int): The value to multiply with.
+
+        Returns:
+            fixed: The product.
+        """
+        return self * sec_num
+
+
+    def divide(self, sec_num: "fixed | num | int", scale: int | None = None, rounding: str | None = None) -> "fixed":
+        """
+        Divides two values to `scale` digits after the decimal point, correctly rounded.
+
+        The scaled dividend is divided by the coefficient of the divisor with the integer
+        division of `num`, which switches to Newton reciprocal division for long divisors.
+        The quotient then costs a constant number of multiplications instead of a quadratic
+        long division. The remainder decides the rounding exactly, also for ties.
+
+        Args:
+            sec_num (fixed | num | int): The divisor.
+            scale (int | None): The digits after the point of the quotient, by default the larger scale.
+            rounding (str | None): The rounding mode, by default that of `self`.
+
+        Returns:
+            fixed: The quotient.
+        """
+        sec_num = self._coerce(sec_num)
+        scale = max(self.scale, sec_num.scale) if scale is None else scale
+        return self._divided(sec_num, scale, rounding or self.rounding)[0]
+
+
+    def _divided(self, sec_num: "fixed", scale: int, rounding: str) -> tuple:
+        """
+        Divides two values to `scale` digits after the decimal point, see `divide`.
+
+        Args:
+            sec_num (fixed): The divisor.
+            scale (int): The digits after the point of the quotient.
+            rounding (str): The rounding mode.
+
+        Returns:
+            tuple: The rounded quotient and whether it is exact.
+        """
+        if not sec_num.coefficient:
+            raise ZeroDivisionError("Division by zero is not allowed.")
+        if scale < 0:
+            raise ValueError("scale must be a non-negative integer")
+        if rounding not in ROUNDING_MODES:
+            raise ValueError(f"unknown rounding mode: {rounding!r}")
+
+        # a / 10**s / (b / 10**t) * 10**scale = a * 10**(scale + t - s) / b, the power
+        # of ten goes to the divisor when it is negative so the division stays exact
+        shift = scale + sec_num.scale - self.scale
+        dividend = abs(self.coefficient).scale10(max(shift, 0))
+        divisor = abs(sec_num.coefficient).scale10(max(-shift, 0))
+        quotient, remainder = divmod(dividend, divisor)
+
+        negative = self.coefficient.negative != sec_num.coefficient.negative
+        exact = not remainder
+        quotient = _round_quotient(quotient, remainder, divisor, negative, rounding)
+        return fixed._from_coefficient(-quotient if negative else quotient, scale, self.rounding), exact
+
+
+    def __truediv__(self, sec_num: "fixed | num | int") -> "fixed":
+        """
+        Divides two values to at least `DIVISION_DIGITS` significant digits, like `Decimal`.
+
+        The quotient keeps at least the larger scale of both operands, so `fixed(1) / 3` gives
+        0.3333333333333333333333333333. Exact quotients drop the trailing zeros beyond that
+        scale, so `fixed(1) / 4` gives 0.25. Use `divide` for an explicit scale.
+
+        Args:
+            sec_num (fixed | num | int): The divisor.
+
+        Returns:
+            fixed: The rounded quotient.
+        """
+        if not isinstance(sec_num, (fixed, num, int)):
+            return NotImplemented
+        sec_num = self._coerce(sec_num)
+        base = max(self.scale, sec_num.scale)
+
+        # The quotient has at least `magnitude` digits before the point (or that many zeros after it when negative)
+        magnitude = (self.coefficient.digits - self.scale) - (sec_num.coefficient.digits - sec_num.scale)
+        quotient, exact = self._divided(sec_num, max(base, DIVISION_DIGITS - magnitude), self.rounding)
+        if not exact or quotient.scale == base:
+            return quotient
+        drop = min(_trailing_zeros(quotient.coefficient) if quotient.coefficient else quotient.scale, quotient.scale - base)
+        return quotient.quantize(quotient.scale - drop)
+
+
+    def __rtruediv__(self, sec_num: "num | int") -> "fixed":
+        """
+        Handles division of a number on the left side by a `fixed`.
+
+        Args:
+            sec_num (num | int): The dividend.
+
+        Returns:
+            fixed: The rounded quotient, see `__truediv__`.
+        """
+        if not isinstance(sec_num, (num, int)):
+            return NotImplemented
+        return self._coerce(sec_num) / self
+
+
+    def __neg__(self) -> "fixed":
+        """
+        Returns the negated value.
+
+        Returns:
+            fixed: The value with the opposite sign.
+        """
+        return fixed._from_coefficient(-self.coefficient, self.scale, self.rounding)
+
+
+    def __abs__(self) -> "fixed":
+        """
+        Returns the absolute value.
+
+        Returns:
+            fixed: The value without its sign.
+        """
+        return fixed._from_coefficient(abs(self.coefficient), self.scale, self.rounding)
+
+
+    def __bool__(self) -> bool:
+        """
+        Returns whether the value is non-zero.
+
+        Returns:
+            bool: False only for zero.
+        """
+        return bool(self.coefficient)
+
+
+    def __int__(self) -> int:
+        """
+        Converts the value into a Python integer, truncating towards zero.
+
+        Returns:
+            int: The integer part.
+        """
+        return int(self.quantize(0, "down").coefficient)
+
+
+    def _compare(self, sec_num: "fixed | num | int") -> int:
+        """
+        Compares two values exactly.
+
+        Args:
+            sec_num (fixed | num | int): The value to compare with.
+
+        Returns:
+            int: 1 if `self` is larger, -1 if it is smaller and 0 if both are equal.
+        """
+        a, b, _ = self._aligned(self._coerce(sec_num))
+        return a._compare(b)
+
+
+    def __eq__(self, sec_num: "fixed | num | int") -> bool:
+        """
+        Checks whether two values are equal, regardless of their scales.
+
+        Args:
+            sec_num (fixed | num | int): The value to compare with.
+
+        Returns:
+            bool: Whether the values are equal.
+        """
+        if not isinstance(sec_num, (fixed, num, int)):
+            return NotImplemented
+        return self._compare(sec_num) == 0
+
+
+    def __lt__(self, sec_num: "fixed | num | int") -> bool:
+        """
+        Checks whether this value is smaller than another one.
+
+        Args:
+            sec_num (fixed | num | int): The value to compare with.
+
+        Returns:
+            bool: Whether `self` is smaller.
+        """
+        if not isinstance(sec_num, (fixed, num, int)):
+            return NotImplemented
+        return self._compare(sec_num) < 0
+
+
+    def __le__(self, sec_num: "fixed | num | int") -> bool:
+        """
+        Checks whether this value is smaller than or equal to another one.
+
+        Args:
+            sec_num (fixed | num | int): The value to compare with.
+
+        Returns:
+            bool: Whether `self` is not larger.
+        """
+        if not isinstance(sec_num, (fixed, num, int)):
+            return NotImplemented
+        return self._compare(sec_num) <= 0
+
+
+    def __gt__(self, sec_num: "fixed | num | int") -> bool:
+        """
+        Checks whether this value is larger than another one.
+
+        Args:
+            sec_num (fixed | num | int): The value to compare with.
+
+        Returns:
+            bool: Whether `self` is larger.
+        """
+        if not isinstance(sec_num, (fixed, num, int)):
+            return NotImplemented
+        return self._compare(sec_num) > 0
+
+
+    def __ge__(self, sec_num: "fixed | num | int") -> bool:
+        """
+        Checks whether this value is larger than or equal to another one.
+
+        Args:
+            sec_num (fixed | num | int): The value to compare with.
+
+        Returns:
+            bool: Whether `self` is not smaller.
+        """
+        if not isinstance(sec_num, (fixed, num, int)):
+            return NotImplemented
+        return self._compare(sec_num) >= 0
+
+
+    def __hash__(self) -> int:
+        """
+        Returns the hash of the value, equal to the hash of the same `int`, `float` or `Decimal`.
+
+        Like for fractions, the hash of the coefficient is divided by `10**scale`
+        modulo the hash modulus of Python numbers.
+
+        Returns:
+            int: The hash value.
+        """
+        inverse = pow(10, -self.scale, _HASH_MODULUS)
+        value = hash(abs(self.coefficient)) * inverse % _HASH_MODULUS
+        if self.coefficient.negative:
+            value = -value
+        return -2 if value == -1 else value
+
+
+    def __str__(self) -> str:
+        """
+        Returns the value in positional notation with all `scale` fractional digits.
+
+        Returns:
+            str: The value, like "-12.340".
+        """
+        digits = str(abs(self.coefficient)).zfill(self.scale + 1)
+        sign = "-" if self.coefficient.negative else ""
+        if not self.scale:
+            return sign + digits
+        return f"{sign}{digits[:-self.scale]}.{digits[-self.scale:]}"
+
+
+    def __repr__(self) -> str:
+        """
+        Returns a short representation of the value, suitable for debugging.
+
+        Returns:
+            str: The representation, like `fixed('-12.340')` or by coefficient and scale for long values.
+        """
+        if self.coefficient.digits <= _REPR_DIGITS:
+            return f"fixed('{self}')"
+        return f"fixed({self.coefficient!r}, scale={self.scale})"
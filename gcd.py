@@ -0,0 +1,321 @@
+from math_lib import num, _carry, _divmod_limbs, _limbs_to_int
+
+
+# Operand length (in limbs) from which the GCD reduces with half-GCD matrices instead of Lehmer steps
+HGCD_THRESHOLD = 30000
+
+# The extended GCD tracks cofactors through every Lehmer step, so half-GCD pays off much earlier
+XGCD_HGCD_THRESHOLD = 4000
+
+# Operand length (in limbs) below which half-GCD matrices are collected from Lehmer steps
+HGCD_BASECASE_LIMBS = 1000
+
+# Number of leading limbs that every round of Lehmer's algorithm works on
+LEHMER_LIMBS = 10
+
+
+def _lincomb(x: int, a: list, y: int, b: list, base: int) -> list:
+    """
+    Computes `x * a + y * b` for small signed cofactors with a single carry pass.
+
+    Args:
+        x (int): The cofactor of `a`.
+        a (list): The first limb list.
+        y (int): The cofactor of `b`.
+        b (list): The second limb list.
+        base (int): The limb base.
+
+    Returns:
+        list: The limbs of the combination, which has to be non-negative.
+    """
+    coefficients = [x * limb for limb in a] + [0] * (len(b) - len(a))
+    for i, limb in enumerate(b):
+        coefficients[i] += y * limb
+    return _carry(coefficients, base)
+
+
+def _scale(value: num, factor: "num | int") -> num:
+    """
+    Multiplies a cofactor by a matrix entry, small integer entries take a single carry pass.
+
+    Args:
+        value (num): The cofactor.
+        factor (num | int): The matrix entry.
+
+    Returns:
+        num: The product.
+    """
+    if isinstance(factor, num):
+        return value * factor
+    limbs = _carry([limb * abs(factor) for limb in value.limbs], value.chunkbase)
+    return num._from_limbs(limbs, value.negative != (factor < 0), value.chunksize)
+
+
+def _transform(matrix: list, rows: list) -> list:
+    """
+    Multiplies a 2x2 matrix with the two rows of cofactors tracked next to a pair of numbers.
+
+    Args:
+        matrix (list): The matrix `[[p, q], [r, s]]`, with int or `num` entries.
+        rows (list): Two equally long lists of `num` cofactors.
+
+    Returns:
+        list: The rows `[p * u + q * v, r * u + s * v]` for the entries `u`, `v` of the rows.
+    """
+    (p, q), (r, s) = matrix
+    return [[_scale(u, p) + _scale(v, q) for u, v in zip(*rows)],
+            [_scale(u, r) + _scale(v, s) for u, v in zip(*rows)]]
+
+
+def _lehmer(a: list, b: list, base: int, stop: int, rows: list | None) -> tuple:
+    """
+    Runs Lehmer's algorithm until `b` has at most `stop` limbs or is zero.
+
+    Euclid's algorithm is simulated on the `LEHMER_LIMBS` leading limbs of both numbers
+    with small cofactors, as long as the quotients are guaranteed to agree
+    with those of the full numbers (Knuth's algorithm L). The collected cofactors
+    are then applied to the full numbers at once, which replaces many long
+    divisions by two linear combinations.
+
+    Args:
+        a (list): The limbs of the larger number.
+        b (list): The limbs of the smaller number.
+        base (int): The limb base.
+        stop (int): The length (in limbs) below which `b` is small enough.
+        rows (list | None): Cofactor rows transformed along with `(a, b)`, or `None`.
+
+    Returns:
+        tuple: The reduced pair `(a, b)` and the transformed rows.
+    """
+    while len(b) > stop and b != [0]:
+        # The leading limbs of both numbers, taken at the same position
+        top = max(len(a) - LEHMER_LIMBS, 0)
+        x, y = _limbs_to_int(a[top:], base), _limbs_to_int(b[top:], base)
+
+        A, B, C, D = 1, 0, 0, 1
+        while y + C and y + D:
+            q = (x + A) // (y + C)
+            if q != (x + B) // (y + D):
+                break
+            A, C = C, A - q * C
+            B, D = D, B - q * D
+            x, y = y, x - q * y
+
+        if B == 0:
+            # No quotient was certain, fall back to one full division step
+            q, r = _divmod_limbs(a, b, base)
+            a, b = b, r
+            if rows is not None:
+                q = num._from_limbs(q, False, rows[0][0].chunksize)
+                rows = _transform([[0, 1], [1, -q]], rows)
+        else:
+            a, b = _lincomb(A, a, B, b, base), _lincomb(C, a, D, b, base)
+            if rows is not None:
+                rows = _transform([[A, B], [C, D]], rows)
+
+    return a, b, rows
+
+
+def _identity(chunksize: int) -> list:
+    """
+    Returns the 2x2 identity matrix with `num` entries.
+
+    Args:
+        chunksize (int): Number of decimal digits per limb of the entries.
+
+    Returns:
+        list: The identity matrix.
+    """
+    return [[num(1, chunksize), num(0, chunksize)], [num(0, chunksize), num(1, chunksize)]]
+
+
+def _apply(matrix: list, a: num, b: num) -> tuple:
+    """
+    Applies a unimodular matrix to a pair of numbers and brings the result into order.
+
+    A matrix computed from the leading limbs may overshoot by a step, so negative
+    results are negated and the pair is swapped if needed. The matrix is adjusted
+    the same way, so `(a, b)` stays its product with the original pair.
+
+    Args:
+        matrix (list): The matrix, updated in place.
+        a (num): The first number.
+        b (num): The second number.
+
+    Returns:
+        tuple: The new pair, larger number first.
+    """
+    x = a * matrix[0][0] + b * matrix[0][1]
+    y = a * matrix[1][0] + b * matrix[1][1]
+    for row, value in ((0, x), (1, y)):
+        if value.negative:
+            matrix[row] = [-entry for entry in matrix[row]]
+    x, y = abs(x), abs(y)
+    if x < y:
+        matrix.reverse()
+        x, y = y, x
+    return x, y
+
+
+def _shift(value: num, k: int) -> num:
+    """
+    Drops the `k` least significant limbs of a non-negative number.
+
+    Args:
+        value (num): The number.
+        k (int): The number of limbs to drop.
+
+    Returns:
+        num: The number divided by `base**k`.
+    """
+    return num._from_limbs(value.limbs[k:] or [0], False, value.chunksize)
+
+
+def _hgcd(a: num, b: num) -> tuple:
+    """
+    Computes a half-GCD matrix, which reduces a pair to about half its length.
+
+    The matrix for the leading half of the limbs is computed recursively and applied
+    to the full numbers, which shortens them by about a quarter. One division step and
+    a second recursion on the leading limbs of the result finish the reduction. Every
+    matrix multiplication and application uses the fast multiplication of `num`, so
+    the reduction runs in `O(M(n) log n)` instead of quadratic time.
+
+    Args:
+        a (num): The larger non-negative number.
+        b (num): The smaller non-negative number.
+
+    Returns:
+        tuple: The matrix `M` and the reduced pair `(a', b') = M (a, b)`.
+    """
+    n = len(a.limbs)
+    stop = n // 2 + 1
+    if len(b.limbs) <= stop:
+        return _identity(a.chunksize), a, b
+
+    if n < HGCD_BASECASE_LIMBS:
+        x, y, matrix = _lehmer(list(a.limbs), list(b.limbs), a.chunkbase, stop, _identity(a.chunksize))
+        return matrix, num._from_limbs(x, False, a.chunksize), num._from_limbs(y, False, a.chunksize)
+
+    # Reduce with the matrix of the leading half
+    matrix = _hgcd(_shift(a, n // 2), _shift(b, n // 2))[0]
+    a, b = _apply(matrix, a, b)
+    if len(b.limbs) <= stop:
+        return matrix, a, b
+
+    # One division step, then the matrix of the leading limbs of the new pair
+    q, r = divmod(a, b)
+    matrix = _transform([[0, 1], [1, -q]], matrix)
+    a, b = b, r
+    if len(b.limbs) <= stop:
+        return matrix, a, b
+
+    k = 2 * stop - len(a.limbs)
+    if k <= 0:
+        return matrix, a, b
+    second = _hgcd(_shift(a, k), _shift(b, k))[0]
+    a, b = _apply(second, a, b)
+    return _transform(second, matrix), a, b
+
+
+def _reduce(a: num, b: num, rows: list | None, threshold: int) -> tuple:
+    """
+    Runs Euclid's algorithm to the end, with half-GCD steps while the numbers are long.
+
+    Args:
+        a (num): The larger non-negative number.
+        b (num): The smaller non-negative number.
+        rows (list | None): Cofactor rows transformed along with `(a, b)`, or `None`.
+        threshold (int): The length (in limbs) of `b` from which half-GCD steps are used.
+
+    Returns:
+        tuple: The GCD and the transformed rows.
+    """
+    while len(b.limbs) >= threshold:
+        matrix, a, b = _hgcd(a, b)
+        if rows is not None:
+            rows = _transform(matrix, rows)
+
+        # A division step guarantees progress even if the matrix did not reduce much
+        if b:
+            q, r = divmod(a, b)
+            if rows is not None:
+                rows = _transform([[0, 1], [1, -q]], rows)
+            a, b = b, r
+
+    x = _lehmer(list(a.limbs), list(b.limbs), a.chunkbase, 0, rows)
+    return num._from_limbs(x[0], False, a.chunksize), x[2]
+
+
+def gcd(a: "num | int", b: "num | int") -> num:
+    """
+    Computes the greatest common divisor of two numbers.
+
+    Args:
+        a (num | int): The first number.
+        b (num | int): The second number.
+
+    Returns:
+        num: The non-negative GCD, zero if both numbers are zero.
+    """
+    a = a if isinstance(a, num) else num(a)
+    a, b = abs(a), abs(a._coerce(b))
+    if a < b:
+        a, b = b, a
+    return _reduce(a, b, None, HGCD_THRESHOLD)[0]
+
+
+def xgcd(a: "num | int", b: "num | int") -> tuple:
+    """
+    Computes the greatest common divisor of two numbers together with Bezout cofactors.
+
+    Only the cofactor of `a` is tracked through the reduction, the cofactor of `b`
+    follows from one exact division at the end.
+
+    Args:
+        a (num | int): The first number.
+        b (num | int): The second number.
+
+    Returns:
+        tuple: `(g, s, t)` as `num` values with `g == s * a + t * b`.
+    """
+    a = a if isinstance(a, num) else num(a)
+    b = a._coerce(b)
+    if not b:
+        return abs(a), num(-1 if a.negative else 1, a.chunksize), num(0, a.chunksize)
+
+    # The reduction runs on the magnitudes with the cofactors of `|a|` in the rows
+    x, y = abs(a), abs(b)
+    swapped = x < y
+    if swapped:
+        x, y = y, x
+    one, zero = num(1, a.chunksize), num(0, a.chunksize)
+    rows = [[zero], [one]] if swapped else [[one], [zero]]
+    g, rows = _reduce(x, y, rows, XGCD_HGCD_THRESHOLD)
+
+    s = rows[0][0]
+    if a.negative:
+        s = -s
+    t = (g - s * a) // b
+    return g, s, t
+
+
+def modinv(a: "num | int", modulus: "num | int") -> num:
+    """
+    Computes the inverse of a number modulo `modulus`.
+
+    Args:
+        a (num | int): The number to invert.
+        modulus (num | int): The positive modulus.
+
+    Returns:
+        num: The inverse in the range `[0, modulus)`.
+    """
+    modulus = modulus if isinstance(modulus, num) else num(modulus)
+    if modulus.negative or not modulus:
+        raise ValueError("modinv() needs a positive modulus.")
+
+    g, s, _ = xgcd(modulus._coerce(a) % modulus, modulus)
+    if g != 1:
+        raise ValueError("base is not invertible for the given modulus")
+    return s % modulus
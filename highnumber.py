@@ -1,4 +1,29 @@
+import io
+import json
+import math
+import os
+import pickle
+import random
+import sys
+import tempfile
+import warnings
+
+import benchmark
+import constants
+import gcd as gcd_module
+import math_lib
 from math_lib import num
+from modular import ModContext
+from combinatorics import binomial, factorial
+from fixed import fixed
+from gcd import gcd, modinv, xgcd
+from lazy import evaluate, lazy
+from primes import is_prime, iter_primes, next_prime, primes_up_to, random_prime
+from roots import iroot, isqrt
+import numarray
+import parallel
+import profiling
+import storage
 
 def test_num_class() -> None:
     """
@@ -11,6 +36,29 @@ def test_num_class() -> None:
     b = num(-98765432109876543210)
     assert str(a) == "12345678901234567890", f"Init test failed: {a}"
     assert str(b) == "-98765432109876543210", f"Init test failed: {b}"
+    assert num("-98765432109876543210") == b, f"Init test failed: {num('-98765432109876543210')}"
+    assert str(num(10**25)) == "1" + "0" * 25, f"Init test failed: {num(10**25)}"
+    assert num(12345678901234567890, chunksize=4) == a, "Chunksize test failed"
+
+    # Integral floats convert exactly, fractions are rejected instead of truncated, also as operands
+    assert num(7.0) == 7 and num(-2.0**70) == -2**70 and num(7) + 2.0 == 9, "Float conversion test failed"
+    for convert in (lambda: num(2.5), lambda: num(7) + 2.5, lambda: num(7) * float("inf")):
+        try:
+            convert()
+            assert False, "Float rejection test failed"
+        except TypeError:
+            pass
+
+    # Test conversions of numbers beyond Python's decimal string limit
+    big = 7**20000 - 1
+    assert int(num(big)) == big, "Integer conversion test failed"
+    assert int(num(str(num(-big)))) == -big, "String conversion test failed"
+
+    # Lower the binary split so the subquadratic conversion path is exercised on the same number
+    expected = num(big).limbs
+    split_bits, math_lib.CONVERSION_SPLIT_BITS = math_lib.CONVERSION_SPLIT_BITS, 4096
+    assert num(big).limbs == expected and int(num(-big, chunksize=7)) == -big, "Binary split conversion test failed"
+    math_lib.CONVERSION_SPLIT_BITS = split_bits
 
     # Test addition
     c = a + b
@@ -26,6 +74,28 @@ def test_num_class() -> None:
     f = a - num(12345678901234567890)
     assert str(f) == "0", f"Subtraction test failed: {f}"
 
+    # Test in-place operators, which update the buffer but leave the operands alone
+    acc = num(-5)
+    for term in (a, b, 10**12, -3):
+        acc += term
+    acc -= num(1)
+    assert str(acc) == "-86419752208641975329", f"In-place test failed: {acc}"
+    assert str(a) == "12345678901234567890" and str(b) == "-98765432109876543210", "Operand mutation test failed"
+    acc *= -a
+    acc //= a
+    assert str(acc) == "86419752208641975329", f"In-place test failed: {acc}"
+
+    # Only unshared values grow their buffer in place, aliases keep their value
+    acc, limbs = num(10**30), None
+    for _ in range(3):
+        acc += 10**25
+        assert limbs is None or acc.limbs is limbs, "In-place buffer reuse test failed"
+        limbs = acc.limbs
+    alias = acc
+    acc += 1
+    acc *= 2
+    assert alias == 10**30 + 3 * 10**25 and acc == 2 * (10**30 + 3 * 10**25 + 1), f"In-place alias test failed: {alias}"
+
     # Test multiplication
     g = num(100000) * num(100000)
     assert str(g) == "10000000000", f"Multiplication test failed: {g}"
@@ -33,6 +103,25 @@ def test_num_class() -> None:
     h = num(-12345) * num(67890)
     assert str(h) == "-838102050", f"Multiplication test failed: {h}"
 
+    # Large operands go through Karatsuba and Toom-3, equal operands through squaring.
+    # The native engine is forced, the automatic backend would hand these products to Python integers
+    x, y = 3**3500, -7**2400
+    with math_lib.use_backend("native"):
+        assert str(num(x) * num(y)) == str(x * y), "Large multiplication test failed"
+        assert str(num(x) * num(x)) == str(x * x), "Squaring test failed"
+
+        # Lower the NTT crossover so the transform path is exercised on the same operands
+        ntt_threshold, math_lib.NTT_THRESHOLD = math_lib.NTT_THRESHOLD, 16
+        assert str(num(x) * num(y)) == str(x * y), "NTT multiplication test failed"
+        assert str(num(y) * num(y)) == str(y * y), "NTT squaring test failed"
+        math_lib.NTT_THRESHOLD = ntt_threshold
+
+    # Test sums and products of many values
+    values = [x, y, num(-12), 10**30, 5]
+    assert int(num.sum(values)) == x + y - 12 + 10**30 + 5, "Sum test failed"
+    assert int(num.prod(values)) == x * y * -12 * 10**30 * 5, "Product test failed"
+    assert num.sum([]) == 0 and num.prod([]) == 1, "Empty sum or product test failed"
+
     # Test division
     i = num(10000000000) / num(100000)
     assert str(i) == "100000", f"Division test failed: {i}"
@@ -40,6 +129,26 @@ def test_num_class() -> None:
     j = num(927743737372291) / num(97531)
     assert str(j) == "9512295961", f"Division test failed: {j}"
 
+    # Test floor division and remainder, including the Newton path for long divisors
+    q, r = divmod(num(-927743737372292), num(97531))
+    assert (str(q), str(r)) == ("-9512295962", "97530"), f"Divmod test failed: {q}, {r}"
+    with math_lib.use_backend("native"):
+        assert str(num(x) // num(y)) == str(x // y), "Floor division test failed"
+        assert str(num(x * x) % num(x - 1)) == str(x * x % (x - 1)), "Modulo test failed"
+
+    # Test exponentiation, with and without a modulus
+    assert str(num(-3) ** 5) == "-243", f"Power test failed: {num(-3) ** 5}"
+    assert num(3) ** 3500 == num(x), "Power test failed"
+    assert int(pow(num(x), 65537, num(y))) == pow(x, 65537, y), "Modular power test failed"
+
+    # Test decimal scaling and binary shifts, both round towards negative infinity like `int`
+    assert num(-x).scale10(23) == num(-x * 10**23) and num(-x).shift_right10(23) == num(-x // 10**23), "Decimal shift test failed"
+    assert num(x) << 1000 == num(x << 1000) and num(-x) >> 7 == num(-x >> 7) and num(-x) >> 5000 == num(-x >> 5000), "Shift test failed"
+    assert num(x) << num(1000) == num(x << 1000) and num(-x) >> num(700) == num(-x >> 700), "Shift by num test failed"
+
+    # Test bitwise operators on the two's complement values
+    assert (num(x) & -y, num(-x) | y, num(x) ^ y, 255 & num(-x)) == (num(x & -y), num(-x | y), num(x ^ y), num(255 & -x)), "Bitwise test failed"
+
     # Test rounding functions
     k = num(9)
     assert k.__ceil__() == "9", f"Ceil test failed: {k.__ceil__()}"
@@ -51,14 +160,449 @@ def test_num_class() -> None:
     assert l.__floor__() == "-9", f"Floor test failed: {l.__floor__()}"
     assert round(l) == "-9", f"Round test failed: {round(l)}"
 
+    # Rounding to significant digits reads only the top limbs, ties go to the even mantissa
+    m = num(-123456789012345678901)
+    assert (m.__ceil__(), m.__floor__(), round(m)) == ("-1234567890e11", "-1234567891e11", "-1234567890e11"), "Rounding test failed"
+    assert round(m, 0) == round(m) and round(num(7), 0) == "7", "Round to the default precision test failed"
+    assert round(num(125), 2) == "12e1" and round(num(135), 2) == "14e1" and round(num(99999), 3) == "100e3", "Tie test failed"
+
+    # Test formatting, the scientific types agree with float formatting of exact values
+    for spec in ("", ",", "_", ">25,", "=+25", "025,", ".3e", "#.0e", "E", ".4g", "#.8g", "^20.2e"):
+        assert format(num(-987654321), spec) == format(-987654321, spec), f"Format test failed: {spec}"
+    for spec in (".1e", ".4g", "#.8g", "^20.2e", ".0e"):
+        assert format(num(1250), spec) == format(1250.0, spec), f"Format test failed: {spec}"
+    assert f"{num(3) ** 3500:.5e}" == "8.40217e+1669" and f"{num(-7) ** 999:.3g}" == "-1.79e+844", "Large format test failed"
+    assert repr(num(-42)) == "num(-42)" and repr(num(10**30)) == "num(1.0000000000000000000e+30)", "Repr test failed"
+
     # Test comparisons
     assert a > b, f"Comparison test failed: {a} <= {b}"
     assert b < a, f"Comparison test failed: {b} >= {a}"
     assert a == num(12345678901234567890), f"Comparison test failed: {a} != 12345678901234567890"
     assert b != a, f"Comparison test failed: {b} == {a}"
+    assert num(-5) < -4.5 < num(-4) and num(7) == 7.0, "Float comparison test failed"
+    nan = float("nan")
+    assert not (num(5) == nan or num(5) < nan or num(5) <= nan or num(5) > nan or num(5) >= nan) and num(5) != nan, \
+        "NaN comparison test failed"
+    assert sorted([a, b, num(0), num(-1)]) == [b, num(-1), num(0), a], "Sorting test failed"
+
+    # Test hashing, equal numbers and integers share their hash
+    assert hash(a) == hash(12345678901234567890) and hash(b) == hash(-98765432109876543210), "Hash test failed"
+    key = num(5)
+    table = {key: "five"}
+    key += 1
+    assert table[num(5)] == "five" and num(6) not in table and list(table) == [5], "Hashed key test failed"
+    assert len({a, num(12345678901234567890), 12345678901234567890, b}) == 2, "Set test failed"
+
+    # Test streamed decimal output and digit extraction
+    big = num(-x)
+    assert "".join(big.iter_digits(7)) == str(big), "Digit stream test failed"
+    buffer = io.StringIO()
+    assert big.write_to(buffer, 100) == len(str(big)) and buffer.getvalue() == str(big), "Write test failed"
+    assert big.leading_digits(25) == str(x)[:25] and big.trailing_digits(25) == str(x)[-25:], "Digit extraction test failed"
+    assert num(10**20).trailing_digits(12) == "0" * 12 and num(5).leading_digits(3) == "5", "Short digit test failed"
+
+    print("All tests passed!")
+
+
+def test_mod_context() -> None:
+    """
+    Test function for `ModContext`. Validates Barrett and Montgomery reduction against Python integers.
+    """
+    print("Testing `ModContext`...")
+
+    x, y, m = 3**500, 7**400, 10**150 + 129
+    for method in ("barrett", "montgomery"):
+        ctx = ModContext(m, method)
+        a, b = ctx.reduce(x), ctx.reduce(y)
+        assert int(ctx.to_num(ctx.mul(a, b))) == x * y % m, f"{method} multiplication test failed"
+        assert int(ctx.to_num(ctx.sub(b, a))) == (y - x) % m, f"{method} subtraction test failed"
+        assert int(ctx.to_num(ctx.pow(a, 12345))) == pow(x, 12345, m), f"{method} power test failed"
+        assert int(ctx.to_num(ctx.inverse(a))) == pow(x, -1, m), f"{method} inverse test failed"
+
+    print("All tests passed!")
+
+
+def test_numarray() -> None:
+    """
+    Test function for `numarray`. Validates element-wise arithmetic against `num`, skipped without NumPy.
+    """
+    if numarray.np is None:
+        print("Skipping `numarray` tests, NumPy is not installed.")
+        return
+    print("Testing `numarray`...")
+
+    xs = [12345678901234567890, -98765432109876543210, 0, 3**100]
+    ys = [-12345678901234567890, 11111111111111111111, -5, 7**50]
+    a, b = numarray.numarray(xs), numarray.numarray(ys)
+    assert [int(v) for v in (a + b).to_list()] == [x + y for x, y in zip(xs, ys)], "numarray addition test failed"
+    assert [int(v) for v in (a - b).to_list()] == [x - y for x, y in zip(xs, ys)], "numarray subtraction test failed"
+    assert [int(v) for v in (a * b).to_list()] == [x * y for x, y in zip(xs, ys)], "numarray multiplication test failed"
+    assert [int(v) for v in (num(-7) * a).to_list()] == [-7 * x for x in xs], "numarray scalar test failed"
+    assert a[1] == num(xs[1]), f"numarray indexing test failed: {a[1]}"
+
+    print("All tests passed!")
+
+
+def test_combinatorics() -> None:
+    """
+    Test function for factorials and binomial coefficients. Validates them against the `math` module.
+    """
+    print("Testing combinatorics...")
+
+    for n in (0, 1, 2, 17, 1000, 4321):
+        assert int(factorial(n)) == math.factorial(n), f"Factorial test failed: {n}"
+        for k in (0, 1, n // 3, n, n + 1):
+            assert int(binomial(n, k)) == math.comb(n, k), f"Binomial test failed: {n}, {k}"
+
+    print("All tests passed!")
+
+
+def test_roots() -> None:
+    """
+    Test function for integer roots. Validates roots and remainders against Python integers.
+    """
+    print("Testing integer roots...")
+
+    x = 3**5000 + 12345
+    root, remainder = isqrt(num(x))
+    assert int(root) == math.isqrt(x) and int(remainder) == x - math.isqrt(x)**2, "Square root test failed"
+    assert isqrt(num(10**40)) == (num(10**20), num(0)), "Perfect square test failed"
+
+    for k in (3, 5, 17):
+        root, remainder = iroot(num(x), k)
+        assert int(root)**k + int(remainder) == x and int(root)**k <= x < (int(root) + 1)**k, f"Root test failed: {k}"
+    root, remainder = iroot(-x, 3)
+    assert int(root)**3 + int(remainder) == -x and int(root) == -int(iroot(x, 3)[0]), "Negative root test failed"
+
+    print("All tests passed!")
+
+
+def test_gcd() -> None:
+    """
+    Test function for GCD, extended GCD and modular inverses. Validates them against Python integers.
+    """
+    print("Testing GCD...")
+
+    x, y, z = 3**3000 + 1, -7**2000 - 4, 11**800
+    assert int(gcd(x * z, y * z)) == math.gcd(x * z, y * z), "GCD test failed"
+    g, s, t = xgcd(x * z, y * z)
+    assert int(g) == math.gcd(x * z, y * z) and int(s) * x * z + int(t) * y * z == int(g), "Extended GCD test failed"
+    assert gcd(0, 0) == 0 and xgcd(-5, 0) == (num(5), num(-1), num(0)), "Zero GCD test failed"
+    assert int(modinv(x, 10**500 + 961)) == pow(x, -1, 10**500 + 961), "Modular inverse test failed"
+
+    # Force the half-GCD path on the same operands
+    thresholds = gcd_module.HGCD_THRESHOLD, gcd_module.XGCD_HGCD_THRESHOLD, gcd_module.HGCD_BASECASE_LIMBS
+    gcd_module.HGCD_THRESHOLD = gcd_module.XGCD_HGCD_THRESHOLD = gcd_module.HGCD_BASECASE_LIMBS = 20
+    assert int(gcd(x * z, y * z)) == math.gcd(x * z, y * z), "Half-GCD test failed"
+    g, s, t = xgcd(x * z, y * z)
+    assert int(s) * x * z + int(t) * y * z == int(g), "Half-GCD cofactor test failed"
+    gcd_module.HGCD_THRESHOLD, gcd_module.XGCD_HGCD_THRESHOLD, gcd_module.HGCD_BASECASE_LIMBS = thresholds
+
+    print("All tests passed!")
+
+
+def test_primes() -> None:
+    """
+    Test function for the sieve and primality testing. Validates them against trial division.
+    """
+    print("Testing primes...")
+
+    small = [n for n in range(2, 3000) if all(n % d for d in range(2, math.isqrt(n) + 1))]
+    assert primes_up_to(2999) == small, "Sieve test failed"
+    assert list(iter_primes(1000, 2000)) == [p for p in small if 1000 <= p < 2000], "Segmented sieve test failed"
+    assert [n for n in range(3000) if is_prime(n)] == small, "Small primality test failed"
+
+    # Carmichael numbers, strong pseudoprimes to several bases and a square of a prime
+    for n in (561, 3215031751, 3825123056546413051, 318665857834031151167461, (10**30 + 57)**2):
+        assert not is_prime(n), f"Pseudoprime test failed: {n}"
+    assert is_prime(2**127 - 1) and is_prime(num(10**30 + 57)), "Large primality test failed"
+    assert next_prime(10**30) == 10**30 + 57, "Next prime test failed"
+
+    prime = random_prime(25, random.Random(1))
+    assert prime.digits == 25 and is_prime(prime), f"Random prime test failed: {prime}"
+
+    print("All tests passed!")
+
+
+def test_fixed() -> None:
+    """
+    Test function for fixed-point values. Validates arithmetic and rounding against exact results.
+    """
+    print("Testing fixed-point values...")
+
+    a, b = fixed("-12.345"), fixed("0.5")
+    assert str(a + b) == "-11.845" and str(a - 1) == "-13.345" and str(a * b) == "-6.172", "Arithmetic test failed"
+    assert str(fixed(1) / fixed("3.000")) == "0.3333333333333333333333333333" and str(fixed(2).divide(3, 5, "down")) == "0.66666", \
+        "Division test failed"
+    assert str(fixed(1) / 4) == "0.25" and str(fixed("1.000") / 4) == "0.250" and str(2 / fixed(3)) == "0.6666666666666666666666666667", \
+        "Division precision test failed"
+    assert str(fixed(".5")) == "0.5" and str(fixed("-.25")) == "-0.25" and str(fixed("1.")) == "1", "Parsing test failed"
+    assert fixed("1.50") == fixed("1.5") and fixed("2.00") == 2 and hash(fixed("1.50")) == hash(1.5) and fixed(-1) < b, "Comparison test failed"
+
+    # Every rounding mode on a tie, a value above the tie and a negative tie
+    expected = {"down": ("2", "2", "-2"), "up": ("3", "3", "-3"), "floor": ("2", "2", "-3"), "ceiling": ("3", "3", "-2"),
+                "half_down": ("2", "3", "-2"), "half_up": ("3", "3", "-3"), "half_even": ("2", "3", "-2")}
+    for mode, results in expected.items():
+        values = (fixed("2.5"), fixed("2.51"), fixed("-2.5"))
+        assert tuple(str(value.quantize(0, mode)) for value in values) == results, f"Rounding test failed: {mode}"
+
+    # A long quotient, checked against integer division
+    x, y = 7**3000, 3**2000 + 1
+    assert fixed(x).divide(y, 500, "down").coefficient == num(x * 10**500 // y), "Long division test failed"
+
+    print("All tests passed!")
+
+
+def test_lazy() -> None:
+    """
+    Test function for lazy expressions. Validates evaluated formulas against eager `num` arithmetic.
+    """
+    print("Testing lazy expressions...")
+
+    values = [num(3**2000), num(-7**900), num(11**1500), num(5**1000)]
+    a, b, c, d = lazy(*values)
+    x, y, z, w = values
+    assert (a * b + a * c - d).evaluate() == x * y + x * z - w, "Factoring test failed"
+    assert (3 * a - a * 3 + b).evaluate() == y and (a - a).evaluate() == 0, "Coefficient test failed"
+
+    # Shared subexpressions across several expressions are evaluated once
+    shared = a * b + c
+    first, second = evaluate(shared * d + shared, (shared ** 2) // (d % 1000 + 1))
+    assert first == (x * y + z) * w + x * y + z and second == (x * y + z) ** 2 // (w % 1000 + 1), "Shared expression test failed"
+
+    print("All tests passed!")
+
+
+def test_storage() -> None:
+    """
+    Test function for binary serialization. Validates round trips through bytes, files and memory maps.
+    """
+    print("Testing storage...")
+
+    x = num(-3**4000)
+    assert num.from_bytes(x.to_bytes()) == x and num(0).to_bytes() != num(1).to_bytes(), "Bytes test failed"
+    assert pickle.loads(pickle.dumps(x)) == x, "Pickle test failed"
+
+    # A shared buffer serves read-only operations and is copied before in-place updates
+    data = bytearray(x.to_bytes())
+    y = num.from_bytes(data, copy=False)
+    assert y == x and y * 3 == x * 3 and hash(y) == hash(x), "Shared buffer test failed"
+    y += 1
+    assert y == x + 1 and num.from_bytes(data) == x, "Copy on write test failed"
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "x.hnum")
+        storage.save(x, path)
+        assert storage.load(path) == x, "File test failed"
+        mapped = storage.open_mapped(path)
+        assert mapped == x and int(mapped // 7) == -3**4000 // 7, "Memory map test failed"
+        del mapped
+
+    try:
+        num.from_bytes(x.to_bytes()[:-8])
+        assert False, "Truncated data test failed"
+    except ValueError:
+        pass
+
+    print("All tests passed!")
+
+
+def test_constants() -> None:
+    """
+    Test function for the constants engine. Validates pi and e against their known expansions.
+    """
+    print("Testing constants...")
+
+    pi = "3.14159265358979323846264338327950288419716939937510582097494459230781640628620899862803482534211706"
+    e = "2.71828182845904523536028747135266249775724709369995957496696762772407663035354759457138217852516642"
+    assert "".join(constants.stream_digits(constants.pi(98), 98)) == pi, "Pi test failed"
+    assert "".join(constants.stream_digits(constants.e(98, workers=2), 98)) == e, "E test failed"
+
+    # Streamed and written digits agree with the plain string
+    value = constants.pi(3000, workers=2)
+    buffer = io.StringIO()
+    constants.write_digits(value, 3000, buffer)
+    assert buffer.getvalue() == "3." + str(value)[1:] and buffer.getvalue().startswith(pi), "Digit stream test failed"
+
+    print("All tests passed!")
+
+
+def test_parallel() -> None:
+    """
+    Test function for parallel multiplication. Validates products computed by worker processes.
+    """
+    print("Testing parallel multiplication...")
+
+    x, y = 3**3500, -7**2400
+    with parallel.parallel(workers=2, threshold=50):
+        assert str(num(x) * num(y)) == str(x * y), "Parallel multiplication test failed"
+        assert str(num(x) * num(x)) == str(x * x), "Parallel squaring test failed"
+        assert str(num(x) * num(7**900)) == str(x * 7**900), "Parallel unbalanced multiplication test failed"
+        assert str(num(x) // num(y)) == str(x // y), "Parallel division test failed"
+    assert math_lib._PARALLEL is None, "Parallel shutdown test failed"
+
+    print("All tests passed!")
+
+
+def test_backends() -> None:
+    """
+    Test function for the arithmetic backends. Validates that every backend gives identical results.
+    """
+    print("Testing backends...")
+
+    default = math_lib.get_backend()
+    rng = random.Random(25)
+    operands = [(rng.getrandbits(bits), rng.getrandbits(other)) for bits, other in
+                ((40, 30), (700, 650), (3000, 400), (9000, 9000), (70000, 69000))]
+    for name in math_lib.available_backends() + ["auto"]:
+        with math_lib.use_backend(name):
+            assert math_lib.get_backend() == name, "Backend selection test failed"
+            for x, y in operands:
+                a, b = num(x), num(-y)
+                assert int(a * b) == -x * y and int(a * a) == x * x, f"{name} multiplication test failed"
+                assert int(a // b) == x // -y and int(a % b) == x % -y, f"{name} division test failed"
+                assert int(num(x, chunksize=3) * num(y, chunksize=3)) == x * y, f"{name} chunksize test failed"
+
+    # Very long products and divisions stay native unless gmpy2 takes them
+    with math_lib.use_backend("auto"):
+        selector = math_lib._BACKEND
+        assert selector.select(20000, 20000) in (None, selector.gmpy2), "Backend product selection test failed"
+        assert selector.select_division(20000, 40000) is not None, "Backend division selection test failed"
+        limit = math_lib.INT_BACKEND_MAX_DIV_LIMBS
+        assert selector.select_division(limit, 2 * limit) is not None and \
+            selector.select_division(limit + 1, 2 * limit) in (None, selector.gmpy2), "Backend division cap test failed"
+
+    # GMP gives the same limbs as Python integers
+    if math_lib.gmpy2 is not None:
+        gmp, python = math_lib.Gmpy2Backend(), math_lib.IntBackend()
+        for x, y in operands:
+            for base in (10**10, 10**3):
+                a, b = num(x, chunksize=len(str(base)) - 1).limbs, num(y | 1, chunksize=len(str(base)) - 1).limbs
+                assert list(gmp.multiply(a, b, base)) == list(python.multiply(a, b, base)), "gmpy2 multiplication test failed"
+                assert list(gmp.multiply(a, a, base)) == list(python.multiply(a, a, base)), "gmpy2 squaring test failed"
+                assert [list(part) for part in gmp.divmod(a, b, base)] == [list(part) for part in python.divmod(a, b, base)], \
+                    "gmpy2 division test failed"
+
+    # The previous backend comes back after the block, unknown backends are rejected
+    assert math_lib.get_backend() == default, "Backend restore test failed"
+    for name in ("fast", "gmpy2"):
+        if name not in math_lib.available_backends():
+            try:
+                math_lib.set_backend(name)
+                assert False, "Backend error test failed"
+            except (ValueError, ImportError):
+                pass
+    assert math_lib.get_backend() == default, "Backend error test failed"
+
+    # The environment variable only warns about unknown backends and falls back to auto
+    previous = os.environ.get(math_lib.BACKEND_VARIABLE)
+    os.environ[math_lib.BACKEND_VARIABLE] = "Native"
+    try:
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            math_lib._backend_from_environment()
+        assert math_lib.get_backend() == "auto" and caught and caught[0].category is RuntimeWarning, \
+            "Backend environment test failed"
+    finally:
+        if previous is None:
+            del os.environ[math_lib.BACKEND_VARIABLE]
+        else:
+            os.environ[math_lib.BACKEND_VARIABLE] = previous
+        math_lib.set_backend(default)
+
+    print("All tests passed!")
+
+
+def test_profiling() -> None:
+    """
+    Test function for the profiling hooks. Validates operation counts, limb products and the export.
+    """
+    print("Testing profiling...")
+
+    original = num.__mul__
+    a, b = num(10**45 + 7), num(10**25 + 3)
+    # The native engine, so that the schoolbook limb products are counted
+    with math_lib.use_backend("native"), profiling.profile() as profiler:
+        assert profiling.active() is profiler and num.__mul__ is not original, "Profiler install test failed"
+        product = a * b
+        a * 3
+        num(-5) + 10**30
+
+    # Schoolbook limb products of a 5 by 3 limb product and a 5 by 1 limb product
+    stats = profiler.as_dict()
+    assert product == (10**45 + 7) * (10**25 + 3), "Profiled product test failed"
+    assert stats["operations"]["__mul__"]["count"] == 2 and stats["operations"]["__mul__"]["sizes"] == {8: 2}, \
+        "Profiler operation test failed"
+    assert stats["multiplication"]["count"] == 2 and stats["multiplication"]["limb_products"] == 15 + 5, \
+        "Profiler limb product test failed"
+
+    # Conversions inside an operation belong to it, the values they create are still counted
+    assert stats["operations"]["__init__"]["count"] == 1 and stats["operations"]["__add__"]["allocations"] == 2, \
+        "Profiler nesting test failed"
+    assert json.loads(profiler.to_json())["operations"]["__mul__"]["sizes"] == {"8": 2}, "Profiler JSON test failed"
+
+    # Disabled profiling restores the original methods
+    assert num.__mul__ is original and profiling.active() is None and math_lib._PROFILER is None, \
+        "Profiler shutdown test failed"
+
+    print("All tests passed!")
+
+
+def test_benchmark() -> None:
+    """
+    Test function for the benchmark suite. Validates a tiny sweep, its JSON round trip and the regression check.
+    """
+    print("Testing the benchmark suite...")
+
+    results = benchmark.run(sizes=(10, 30), repeat=1, min_time=0.001)
+    assert [(r["operation"], r["digits"]) for r in results["results"]] == \
+        [(operation, size) for operation in benchmark.OPERATIONS for size in (10, 30)], "Benchmark sweep test failed"
+    assert {"TOOM3_THRESHOLD", "TOOM3_SQR_THRESHOLD"} <= set(results["environment"]["thresholds"]), \
+        "Benchmark environment test failed"
+    assert all(r["num"]["seconds"] > 0 and r["int"]["peak_bytes"] >= 0 for r in results["results"]), \
+        "Benchmark measurement test failed"
+
+    # Results survive the JSON round trip and a run never regresses against itself
+    buffer = io.StringIO()
+    benchmark.save(results, buffer)
+    buffer.seek(0)
+    loaded = benchmark.load(buffer)
+    assert loaded == results and benchmark.compare(loaded, results) == [], "Benchmark JSON test failed"
+
+    slower = benchmark.load(io.StringIO(buffer.getvalue()))
+    slower["results"][0]["ratio"] *= 2
+    changes = benchmark.compare(results, slower)
+    assert len(changes) == 1 and abs(changes[0]["change"] - 1) < 1e-9, "Benchmark regression test failed"
+
+    # Measurements without a ratio are reported as well
+    stderr, sys.stderr = sys.stderr, io.StringIO()
+    try:
+        benchmark._report(dict(results["results"][0], ratio=None))
+        assert "ratio n/a" in sys.stderr.getvalue(), "Benchmark report test failed"
+    finally:
+        sys.stderr = stderr
+
+    # A single call slower than the time limit skips the larger sizes
+    skipped = benchmark.run(sizes=(10, 20), operations=["add"], repeat=1, min_time=0.001, time_limit=0)["skipped"]
+    assert skipped == [{"operation": "add", "digits": 20}], "Benchmark time limit test failed"
 
     print("All tests passed!")
 
 
-# Run the test
-test_num_class()
+# Run the tests, guarded so that worker processes can import this module
+if __name__ == "__main__":
+    test_num_class()
+    test_mod_context()
+    test_numarray()
+    test_combinatorics()
+    test_roots()
+    test_gcd()
+    test_primes()
+    test_fixed()
+    test_lazy()
+    test_storage()
+    test_constants()
+    test_parallel()
+    test_backends()
+    test_profiling()
+    test_benchmark()
@@ -0,0 +1,512 @@
+from collections import Counter
+
+from math_lib import num, _carry, _cmp_limbs, _mul_coefficients, _sub_limbs
+
+
+# Operators that build sums of products, everything else is evaluated as an opaque factor
+_LINEAR_OPS = ("add", "sub", "neg", "mul")
+
+
+class expr():
+    __slots__ = ("op", "args")
+
+    def __init__(self, op: str, args: tuple):
+        """
+        A node of a lazy expression graph, built by the operators of wrapped numbers.
+
+        Nothing is computed until `evaluate` is called, which sees the whole graph
+        at once (see `evaluate`). Leaves hold a `num`, every other node an operator
+        and its operand nodes.
+
+        Args:
+            op (str): "leaf", "add", "sub", "neg", "mul", "pow", "floordiv" or "mod".
+            args (tuple): The `num` of a leaf, the operand nodes and for "pow" the exponent.
+        """
+        self.op = op
+        self.args = args
+
+
+    @staticmethod
+    def _wrap(value: "expr | num | int") -> "expr":
+        """
+        Turns an operand into an expression node, numbers become leaves.
+
+        Args:
+            value (expr | num | int): The operand.
+
+        Returns:
+            expr: The node.
+        """
+        if isinstance(value, expr):
+            return value
+        return expr("leaf", (value if isinstance(value, num) else num(value),))
+
+
+    def _binary(self, op: str, sec_expr: "expr | num | int", reflected: bool = False) -> "expr":
+        """
+        Builds the node of a binary operator.
+
+        Args:
+            op (str): The operator.
+            sec_expr (expr | num | int): The other operand.
+            reflected (bool): Whether the other operand is on the left side.
+
+        Returns:
+            expr: The new node.
+        """
+        if not isinstance(sec_expr, (expr, num, int)):
+            return NotImplemented
+        sec_expr = expr._wrap(sec_expr)
+        return expr(op, (sec_expr, self) if reflected else (self, sec_expr))
+
+
+    def __add__(self, sec_expr: "expr | num | int") -> "expr":
+        """
+        Builds the sum of two expressions.
+
+        Args:
+            sec_expr (expr | num | int): The expression to add.
+
+        Returns:
+            expr: The sum node.
+        """
+        return self._binary("add", sec_expr)
+
+
+    def __radd__(self, sec_expr: "num | int") -> "expr":
+        """
+        Builds the sum with an expression on the right side.
+
+        Args:
+            sec_expr (num | int): The number to add.
+
+        Returns:
+            expr: The sum node.
+        """
+        return self._binary("add", sec_expr, True)
+
+
+    def __sub__(self, sec_expr: "expr | num | int") -> "expr":
+        """
+        Builds the difference of two expressions.
+
+        Args:
+            sec_expr (expr | num | int): The expression to subtract.
+
+        Returns:
+            expr: The difference node.
+        """
+        return self._binary("sub", sec_expr)
+
+
+    def __rsub__(self, sec_expr: "num | int") -> "expr":
+        """
+        Builds the difference with an expression on the right side.
+
+        Args:
+            sec_expr (num | int): The number to subtract from.
+
+        Returns:
+            expr: The difference node.
+        """
+        return self._binary("sub", sec_expr, True)
+
+
+    def __mul__(self, sec_expr: "expr | num | int") -> "expr":
+        """
+        Builds the product of two expressions.
+
+        Args:
+            sec_expr (expr | num | int): The expression to multiply with.
+
+        Returns:
+            expr: The product node.
+        """
+        return self._binary("mul", sec_expr)
+
+
+    def __rmul__(self, sec_expr: "num | int") -> "expr":
+        """
+        Builds the product with an expression on the right side.
+
+        Args:
+            sec_expr (num | int): The number to multiply with.
+
+        Returns:
+            expr: The product node.
+        """
+        return self._binary("mul", sec_expr, True)
+
+
+    def __floordiv__(self, sec_expr: "expr | num | int") -> "expr":
+        """
+        Builds the floor division of two expressions.
+
+        Args:
+            sec_expr (expr | num | int): The divisor.
+
+        Returns:
+            expr: The quotient node.
+        """
+        return self._binary("floordiv", sec_expr)
+
+
+    def __rfloordiv__(self, sec_expr: "num | int") -> "expr":
+        """
+        Builds the floor division with an expression as divisor.
+
+        Args:
+            sec_expr (num | int): The dividend.
+
+        Returns:
+            expr: The quotient node.
+        """
+        return self._binary("floordiv", sec_expr, True)
+
+
+    def __mod__(self, sec_expr: "expr | num | int") -> "expr":
+        """
+        Builds the remainder of the floor division of two expressions.
+
+        Args:
+            sec_expr (expr | num | int): The divisor.
+
+        Returns:
+            expr: The remainder node.
+        """
+        return self._binary("mod", sec_expr)
+
+
+    def __rmod__(self, sec_expr: "num | int") -> "expr":
+        """
+        Builds the remainder with an expression as divisor.
+
+        Args:
+            sec_expr (num | int): The dividend.
+
+        Returns:
+            expr: The remainder node.
+        """
+        return self._binary("mod", sec_expr, True)
+
+
+    def __pow__(self, exponent: int) -> "expr":
+        """
+        Builds the power of an expression.
+
+        Args:
+            exponent (int): The non-negative exponent.
+
+        Returns:
+            expr: The power node.
+        """
+        if not isinstance(exponent, int):
+            return NotImplemented
+        if exponent < 0:
+            raise ValueError("num only supports non-negative exponents.")
+        return expr("pow", (self, exponent))
+
+
+    def __neg__(self) -> "expr":
+        """
+        Builds the negation of an expression.
+
+        Returns:
+            expr: The negation node.
+        """
+        return expr("neg", (self,))
+
+
+    def __pos__(self) -> "expr":
+        """
+        Returns the expression itself.
+
+        Returns:
+            expr: `self`.
+        """
+        return self
+
+
+    def evaluate(self) -> num:
+        """
+        Evaluates the expression, see `evaluate`.
+
+        Returns:
+            num: The value of the expression.
+        """
+        return evaluate(self)[0]
+
+
+    def __repr__(self) -> str:
+        """
+        Returns a short description of the node, suitable for debugging.
+
+        Returns:
+            str: The operator of the node.
+        """
+        return f"expr({self.op})"
+
+
+def lazy(*values: "num | int"):
+    """
+    Wraps numbers into leaves of a lazy expression graph.
+
+    Operators on the returned nodes build the graph instead of computing anything,
+    so whole formulas can be optimized before they are evaluated.
+
+    Args:
+        values (num | int): The numbers to wrap.
+
+    Returns:
+        expr | tuple: The leaf for a single value, otherwise a tuple of leaves.
+    """
+    leaves = tuple(expr._wrap(value) for value in values)
+    return leaves[0] if len(leaves) == 1 else leaves
+
+
+class _Evaluator():
+    def __init__(self):
+        """
+        Evaluates expression graphs with a shared cache of subexpressions.
+
+        Every node is turned into a sum of products with integer coefficients, keyed
+        by its structure: leaves by the identity of their `num`, sums by their terms
+        and the remaining operators by their operands. Identical subexpressions map to
+        the same key and are evaluated once, also across several root expressions.
+        """
+        self.forms = {}  # Sum of products of every visited node, by node identity
+        self.atoms = {}  # Node of every atom key
+        self.values = {}  # Value of every evaluated atom or sum, by key
+        self.chunksize = None
+
+
+    def _form(self, node: expr) -> dict:
+        """
+        Turns a node into a sum of products of atoms.
+
+        Args:
+            node (expr): The node.
+
+        Returns:
+            dict: The integer coefficient of every product, a sorted tuple of atom keys.
+        """
+        form = self.forms.get(id(node))
+        if form is not None:
+            return form[1]
+
+        op, args = node.op, node.args
+        if op in ("add", "sub"):
+            form = Counter(self._form(args[0]))
+            other = self._form(args[1])
+            if op == "add":
+                form.update(other)
+            else:
+                form.subtract(other)
+        elif op == "neg":
+            form = {factors: -coefficient for factors, coefficient in self._form(args[0]).items()}
+        elif op == "mul":
+            (left, a), (right, b) = self._monomial(args[0]), self._monomial(args[1])
+            # Keys of different kinds do not compare, the hash gives products a canonical order
+            form = {tuple(sorted(left + right, key=hash)): a * b}
+        elif op == "leaf" and len(args[0].limbs) == 1:
+            # Single limb numbers merge into the integer coefficients
+            form = {(): int(args[0])}
+        else:
+            form = {(self._atom(node),): 1}
+
+        # Cancelled terms disappear, the node is kept alive so its identity stays unique
+        form = {factors: coefficient for factors, coefficient in form.items() if coefficient}
+        self.forms[id(node)] = (node, form)
+        return form
+
+
+    def _monomial(self, node: expr) -> tuple:
+        """
+        Returns a node as a single product, sums with several terms become one atom.
+
+        Args:
+            node (expr): The node.
+
+        Returns:
+            tuple: The atom keys of the product and its coefficient.
+        """
+        form = self._form(node)
+        if len(form) == 1:
+            return next(iter(form.items()))
+        if not form:
+            return (), 0
+        return (self._atom(node),), 1
+
+
+    def _atom(self, node: expr) -> tuple:
+        """
+        Registers a node that is evaluated as a whole and returns its key.
+
+        Args:
+            node (expr): The node.
+
+        Returns:
+            tuple: The structural key of the node.
+        """
+        op, args = node.op, node.args
+        if op == "leaf":
+            # The result takes the chunksize of the first leaf
+            self.chunksize = self.chunksize or args[0].chunksize
+            key = ("leaf", id(args[0]))
+        elif op in _LINEAR_OPS:
+            key = ("sum", frozenset(self._form(node).items()))
+        elif op == "pow":
+            key = ("pow", self._key(args[0]), args[1])
+        else:
+            key = (op, self._key(args[0]), self._key(args[1]))
+        self.atoms.setdefault(key, node)
+        return key
+
+
+    def _key(self, node: expr) -> tuple:
+        """
+        Returns the structural key of any node.
+
+        Args:
+            node (expr): The node.
+
+        Returns:
+            tuple: The key.
+        """
+        if node.op in _LINEAR_OPS:
+            return ("sum", frozenset(self._form(node).items()))
+        return self._atom(node)
+
+
+    def _value(self, key: tuple) -> num:
+        """
+        Evaluates an atom once per key.
+
+        Args:
+            key (tuple): The atom key.
+
+        Returns:
+            num: The value of the atom.
+        """
+        value = self.values.get(key)
+        if value is not None:
+            return value
+        if key[0] == "sum":
+            return self._sum(dict(key[1]))
+
+        node = self.atoms[key]
+        op, args = node.op, node.args
+        if op == "leaf":
+            value = args[0]
+            if value.chunksize != self.chunksize:
+                value = num(str(value), self.chunksize)
+        elif op == "pow":
+            value = self._value(key[1]) ** args[1]
+        elif op == "floordiv":
+            value = self._value(key[1]) // self._value(key[2])
+        else:
+            value = self._value(key[1]) % self._value(key[2])
+        self.values[key] = value
+        return value
+
+
+    def _sum(self, form: dict) -> num:
+        """
+        Evaluates a sum of products, factoring out shared atoms first.
+
+        The atom that occurs in most products is factored out as long as it occurs in
+        at least two of them, so `a*b + a*c` becomes `a*(b + c)` and costs one
+        multiplication less. The remaining products go through one fused kernel.
+
+        Args:
+            form (dict): The coefficient of every product of atoms.
+
+        Returns:
+            num: The value of the sum.
+        """
+        key = ("sum", frozenset(form.items()))
+        if key in self.values:
+            return self.values[key]
+
+        counts = Counter(atom for factors in form for atom in set(factors))
+        atom, count = max(counts.items(), key=lambda item: item[1], default=(None, 0))
+        products = []
+        if count >= 2:
+            inner = {}
+            for factors, coefficient in list(form.items()):
+                if atom in factors:
+                    rest = list(factors)
+                    rest.remove(atom)
+                    inner[tuple(rest)] = coefficient
+                    del form[factors]
+            products.append((1, [self._value(atom), self._sum(inner)]))
+        products.extend((coefficient, [self._value(factor) for factor in factors]) for factors, coefficient in form.items())
+
+        value = _fused_sum(products, self.chunksize or 10)
+        self.values[key] = value
+        return value
+
+
+def _fused_sum(products: list, chunksize: int) -> num:
+    """
+    Computes a sum of products with integer coefficients in a single carry pass.
+
+    The last multiplication of every product stays unreduced (see `_mul_coefficients`)
+    and its coefficients are accumulated column by column, together with all plain
+    terms. Positive and negative terms are accumulated separately and carried once.
+
+    Args:
+        products (list): Pairs of an integer coefficient and the list of `num` factors.
+        chunksize (int): The chunksize of all factors and of the result.
+
+    Returns:
+        num: The sum.
+    """
+    base = 10**chunksize
+    accumulators = ([], [])
+    for coefficient, factors in products:
+        if not coefficient or not all(factors):
+            continue
+        negative = (coefficient < 0) != (sum(factor.negative for factor in factors) % 2 == 1)
+        if not factors:
+            columns = [abs(coefficient)]
+            coefficient = 1
+        elif len(factors) == 1:
+            columns = factors[0].limbs
+        else:
+            head = factors[0]
+            for factor in factors[1:-1]:
+                head = head * factor
+            columns = _mul_coefficients(head.limbs, factors[-1].limbs, base)
+
+        scale = abs(coefficient)
+        if scale != 1:
+            columns = [scale * column for column in columns]
+        accumulator = accumulators[negative]
+        if len(accumulator) < len(columns):
+            accumulator.extend([0] * (len(columns) - len(accumulator)))
+        accumulator[:len(columns)] = map(int.__add__, accumulator, columns)
+
+    positive, negative = (_carry(accumulator, base) for accumulator in accumulators)
+    if _cmp_limbs(positive, negative) >= 0:
+        return num._from_limbs(_sub_limbs(positive, negative, base), False, chunksize)
+    return num._from_limbs(_sub_limbs(negative, positive, base), True, chunksize)
+
+
+def evaluate(*expressions: "expr | num | int") -> list:
+    """
+    Evaluates lazy expressions with shared subexpressions computed only once.
+
+    Every expression is rewritten into a sum of products. Repeated subexpressions are
+    found by their structure, shared factors are pulled out of sums and every sum is
+    accumulated by one fused multiply-add pass that carries only at the end.
+
+    Args:
+        expressions (expr | num | int): The expressions, evaluated with one shared cache.
+
+    Returns:
+        list: The value of every expression as a `num`.
+    """
+    evaluator = _Evaluator()
+    forms = [evaluator._form(expr._wrap(expression)) for expression in expressions]
+    return [evaluator._sum(dict(form)) for form in forms]
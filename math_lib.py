@@ -1,85 +1,1704 @@
+import math
+import os
+import re
+import struct
+import sys
+import warnings
+from array import array
+from contextlib import contextmanager
+from functools import lru_cache
+
+try:
+    import gmpy2
+except ImportError:  # gmpy2 is optional, only the gmpy2 backend needs it
+    gmpy2 = None
+
+
+# Operand lengths (in limbs) at which the multiplication algorithms take over
+KARATSUBA_THRESHOLD = 32
+TOOM3_THRESHOLD = 100
+
+# Squaring saves half of the basecase products, so it switches over later
+KARATSUBA_SQR_THRESHOLD = 48
+TOOM3_SQR_THRESHOLD = 150
+
+# Operand length (in limbs) above which products are computed with number-theoretic transforms
+NTT_THRESHOLD = 2000
+
+# NTT primes of the form c * 2**40 + 1 with one of their primitive roots
+_NTT_PRIMES = (
+    (4611546380450660353, 5),
+    (4611524390218104833, 3),
+    (4611480409752993793, 10),
+    (4611467215613460481, 13),
+)
+_NTT_MAX_LOG2 = 40
+
+# Divisor length (in limbs) above which division uses a Newton reciprocal instead of Knuth's algorithm D
+NEWTON_DIV_THRESHOLD = 100
+
+# Hashes of numbers are reduced modulo the same prime as the hashes of Python integers
+_HASH_MODULUS = sys.hash_info.modulus
+
+# Size (in bits) above which conversions between Python integers and limbs divide and conquer
+CONVERSION_THRESHOLD_BITS = 2048
+
+# Size (in bits) above which Python integers are split in binary for the conversion to limbs. Below,
+# dividing by a power of the base is quadratic but runs at C speed and stays faster
+CONVERSION_SPLIT_BITS = 1 << 22
+
+# Multiplier that spreads large products over worker processes, installed by `parallel.enable`
+_PARALLEL = None
+
+# Collector of multiplication statistics, installed by `profiling.enable`
+_PROFILER = None
+
+# Chooses the backend of long products and divisions, `None` for the native limb engine (see `set_backend`)
+_BACKEND = None
+
+# Operand lengths (in limbs) between which the automatic backend hands products to Python integers.
+# Below, the conversions cost more than they save, above, the native NTT is faster
+INT_BACKEND_MIN_LIMBS = 2
+INT_BACKEND_MAX_LIMBS = 12000
+
+# Divisor length (in limbs) up to which the automatic backend hands divisions to Python integers.
+# Their quadratic division is 1.8 times faster than the native Newton division at 100000 limbs and
+# 1.5 times at 160000 limbs (dividends twice as long), the gap closes at about 450000 limbs
+INT_BACKEND_MAX_DIV_LIMBS = 400000
+
+# Operand length (in limbs) from which the automatic backend prefers gmpy2 when it is installed
+GMPY2_BACKEND_MIN_LIMBS = 64
+
+# Environment variable that forces a backend at import time. Unknown or unavailable backends
+# only cause a warning there and leave the automatic selection in place
+BACKEND_VARIABLE = "HIGHNUMBER_BACKEND"
+
+# Binary format of a `num`: magic, format version, sign flag, chunksize, padding and limb count,
+# followed by the limbs as little-endian 64 bit integers. The header keeps the limbs 8 byte aligned
+_FORMAT_MAGIC = b"HNUM"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sBBBxQ")
+
+# Number of decimal digits in every piece of streamed decimal output
+DIGIT_CHUNK_SIZE = 1 << 16
+
+# Format specifications understood by `num.__format__`: [[fill]align][sign][#][0][width][grouping][.precision][type]
+_FORMAT_SPEC = re.compile(r"(?:(?P<fill>.)?(?P<align>[<>=^]))?(?P<sign>[-+ ])?(?P<alt>#)?(?P<zero>0)?"
+                          r"(?P<width>\d+)?(?P<grouping>[,_])?(?:\.(?P<precision>\d+))?(?P<type>[deEgGn]?)", re.DOTALL)
+
+# Binary shifts up to this many bits multiply or divide every limb in a single pass,
+# longer shifts use the fast multiplication and division with the power of two
+SMALL_SHIFT_BITS = 512
+
+# Numbers with more digits are shown in scientific notation by `repr`
+_REPR_DIGITS = 20
+
+
+def _normalize(limbs: list) -> list:
+    """
+    Strips the most significant zero limbs from a little-endian limb list.
+
+    Args:
+        limbs (list): The limbs to normalize, least significant first.
+
+    Returns:
+        list: The same list without leading zero limbs (zero is kept as `[0]`).
+    """
+    while len(limbs) > 1 and limbs[-1] == 0:
+        limbs.pop()
+    return limbs
+
+
+def _cmp_limbs(a, b) -> int:
+    """
+    Compares the magnitudes of two normalized little-endian limb sequences.
+
+    Args:
+        a: The first limb sequence.
+        b: The second limb sequence.
+
+    Returns:
+        int: 1 if `a` is larger, -1 if `b` is larger and 0 if both are equal.
+    """
+    # More limbs always means a larger magnitude for normalized limbs
+    if len(a) != len(b):
+        return 1 if len(a) > len(b) else -1
+
+    # Compare limb by limb, starting at the most significant one
+    for i in range(len(a) - 1, -1, -1):
+        if a[i] != b[i]:
+            return 1 if a[i] > b[i] else -1
+    return 0
+
+
+def _add_limbs(a, b, base: int) -> list:
+    """
+    Adds the magnitudes of two little-endian limb sequences.
+
+    Args:
+        a: The first limb sequence.
+        b: The second limb sequence.
+        base (int): The limb base.
+
+    Returns:
+        list: The limbs of the sum, least significant first.
+    """
+    # Let `a` be the longer operand so `b` can simply run out
+    if len(a) < len(b):
+        a, b = b, a
+
+    result = [0] * (len(a) + 1)
+    carry = 0
+    for i in range(len(b)):
+        carry, result[i] = divmod(a[i] + b[i] + carry, base)
+    for i in range(len(b), len(a)):
+        carry, result[i] = divmod(a[i] + carry, base)
+    result[len(a)] = carry
+
+    return _normalize(result)
+
+
+def _sub_limbs(a, b, base: int) -> list:
+    """
+    Subtracts the magnitude of `b` from the magnitude of `a`.
+
+    Args:
+        a: The minuend limbs, whose magnitude must not be smaller than `b`.
+        b: The subtrahend limbs.
+        base (int): The limb base.
+
+    Returns:
+        list: The limbs of the difference, least significant first.
+    """
+    result = [0] * len(a)
+    borrow = 0
+    for i in range(len(a)):
+        value = a[i] - borrow - (b[i] if i < len(b) else 0)
+
+        # A negative limb borrows one unit from the next limb
+        if value < 0:
+            value += base
+            borrow = 1
+        else:
+            borrow = 0
+        result[i] = value
+
+    return _normalize(result)
+
+
+def _poly_add(a: list, b: list) -> list:
+    """
+    Adds two coefficient lists element-wise without carrying.
+
+    Args:
+        a (list): The first coefficient list.
+        b (list): The second coefficient list.
+
+    Returns:
+        list: The element-wise sum, as long as the longer input.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    result = a[:]
+    for i, y in enumerate(b):
+        result[i] += y
+    return result
+
+
+def _poly_sub(a: list, b: list) -> list:
+    """
+    Subtracts two coefficient lists element-wise without borrowing.
+
+    Args:
+        a (list): The minuend coefficients.
+        b (list): The subtrahend coefficients.
+
+    Returns:
+        list: The element-wise difference, coefficients may become negative.
+    """
+    result = a + [0] * (len(b) - len(a))
+    for i, y in enumerate(b):
+        result[i] -= y
+    return result
+
+
+def _poly_add_into(result: list, a: list, offset: int) -> None:
+    """
+    Adds a coefficient list into `result`, shifted by `offset` positions.
+
+    Args:
+        result (list): The accumulator, which must be long enough.
+        a (list): The coefficients to add.
+        offset (int): The position of the first coefficient of `a` in `result`.
+    """
+    for i, x in enumerate(a):
+        result[offset + i] += x
+
+
+def _convolve_basecase(a: list, b: list) -> list:
+    """
+    Multiplies two coefficient lists with the schoolbook method.
+
+    Args:
+        a (list): The first coefficient list.
+        b (list): The second coefficient list.
+
+    Returns:
+        list: The product coefficients, unreduced.
+    """
+    if _PROFILER is not None:
+        _PROFILER.limb_products += len(a) * len(b)
+
+    result = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        if x == 0:
+            continue
+        for j, y in enumerate(b):
+            result[i + j] += x * y
+    return result
+
+
+def _square_basecase(a: list) -> list:
+    """
+    Squares a coefficient list with the schoolbook method.
+
+    Every cross product `a[i] * a[j]` appears twice in a square, so it is only
+    computed once and doubled.
+
+    Args:
+        a (list): The coefficient list.
+
+    Returns:
+        list: The squared coefficients, unreduced.
+    """
+    n = len(a)
+    if _PROFILER is not None:
+        _PROFILER.limb_products += n * (n + 1) // 2
+
+    result = [0] * (2 * n - 1)
+    for i in range(n):
+        x = a[i]
+        if x == 0:
+            continue
+        result[2 * i] += x * x
+        x2 = x + x
+        for j in range(i + 1, n):
+            result[i + j] += x2 * a[j]
+    return result
+
+
+def _karatsuba(a: list, b: list | None) -> list:
+    """
+    Multiplies two coefficient lists of similar length with Karatsuba's method.
+
+    The operands are split in halves and three half-size products replace the four
+    of the schoolbook method.
+
+    Args:
+        a (list): The first coefficient list.
+        b (list | None): The second coefficient list, or `None` to square `a`.
+
+    Returns:
+        list: The product coefficients, unreduced.
+    """
+    size = len(a) + (len(a) if b is None else len(b)) - 1
+    half = (max(len(a), len(b) if b is not None else 0) + 1) // 2
+    a0, a1 = a[:half], a[half:]
+
+    if b is None:
+        # Squaring only ever needs squares of the pieces
+        z0 = _square(a0)
+        z2 = _square(a1)
+        z1 = _square(_poly_add(a0, a1))
+    else:
+        b0, b1 = b[:half], b[half:]
+        z0 = _convolve(a0, b0)
+        z2 = _convolve(a1, b1)
+        z1 = _convolve(_poly_add(a0, a1), _poly_add(b0, b1))
+    z1 = _poly_sub(_poly_sub(z1, z0), z2)
+
+    # Recombine z0 + z1 * x^half + z2 * x^(2 * half)
+    result = [0] * (4 * half)
+    _poly_add_into(result, z0, 0)
+    _poly_add_into(result, z1, half)
+    _poly_add_into(result, z2, 2 * half)
+    del result[size:]
+    return result
+
+
+def _toom3(a: list, b: list | None) -> list:
+    """
+    Multiplies two coefficient lists of similar length with the Toom-Cook 3-way method.
+
+    The operands are split in thirds, evaluated at the points 0, 1, -1, -2 and
+    infinity, multiplied pointwise and interpolated with Bodrato's sequence, so
+    five third-size products replace the nine of the schoolbook method.
+
+    Args:
+        a (list): The first coefficient list.
+        b (list | None): The second coefficient list, or `None` to square `a`.
+
+    Returns:
+        list: The product coefficients, unreduced.
+    """
+    size = len(a) + (len(a) if b is None else len(b)) - 1
+    k = (max(len(a), len(b) if b is not None else 0) + 2) // 3
+
+    def evaluate(x: list) -> tuple:
+        # Evaluate the polynomial x0 + x1 * t + x2 * t^2 at 0, 1, -1, -2 and infinity
+        x0, x1, x2 = x[:k], x[k:2 * k], x[2 * k:]
+        t = _poly_add(x0, x2)
+        p1 = _poly_add(t, x1)
+        pm1 = _poly_sub(t, x1)
+        pm2 = _poly_sub([2 * c for c in _poly_add(pm1, x2)], x0)
+        return x0, p1, pm1, pm2, x2
+
+    if b is None:
+        r0, r1, rm1, rm2, rinf = (_square(p) for p in evaluate(a))
+    else:
+        r0, r1, rm1, rm2, rinf = (_convolve(p, q) for p, q in zip(evaluate(a), evaluate(b)))
+
+    # Interpolate the coefficients of the product (all divisions are exact)
+    r3 = [c // 3 for c in _poly_sub(rm2, r1)]
+    r1 = [c // 2 for c in _poly_sub(r1, rm1)]
+    r2 = _poly_sub(rm1, r0)
+    r3 = _poly_add([c // 2 for c in _poly_sub(r2, r3)], [2 * c for c in rinf])
+    r2 = _poly_sub(_poly_add(r2, r1), rinf)
+    r1 = _poly_sub(r1, r3)
+
+    # Recombine r0 + r1 * x^k + r2 * x^2k + r3 * x^3k + rinf * x^4k
+    result = [0] * (max(len(r0), len(r1) + k, len(r2) + 2 * k, len(r3) + 3 * k, len(rinf) + 4 * k, size))
+    for i, r in enumerate((r0, r1, r2, r3, rinf)):
+        _poly_add_into(result, r, i * k)
+    del result[size:]
+    return result
+
+
+def _convolve(a: list, b: list) -> list:
+    """
+    Multiplies two coefficient lists, dispatching on their length.
+
+    Short operands use the schoolbook method, longer ones Karatsuba and the
+    longest ones Toom-Cook 3-way. Very unbalanced operands are cut into blocks of
+    the shorter length so the recursive algorithms always see similar sizes.
+
+    Args:
+        a (list): The first coefficient list.
+        b (list): The second coefficient list.
+
+    Returns:
+        list: The product coefficients, unreduced.
+    """
+    if not a or not b:
+        return []
+
+    # Let `b` be the shorter operand
+    if len(a) < len(b):
+        a, b = b, a
+
+    if len(b) < KARATSUBA_THRESHOLD:
+        return _convolve_basecase(a, b)
+
+    # Multiply unbalanced operands block by block
+    if 2 * len(b) <= len(a):
+        result = [0] * (len(a) + len(b) - 1)
+        for start in range(0, len(a), len(b)):
+            _poly_add_into(result, _convolve(a[start:start + len(b)], b), start)
+        return result
+
+    if len(b) < TOOM3_THRESHOLD:
+        return _karatsuba(a, b)
+    return _toom3(a, b)
+
+
+def _square(a: list) -> list:
+    """
+    Squares a coefficient list, dispatching on its length.
+
+    Args:
+        a (list): The coefficient list.
+
+    Returns:
+        list: The squared coefficients, unreduced.
+    """
+    if not a:
+        return []
+    if len(a) < KARATSUBA_SQR_THRESHOLD:
+        return _square_basecase(a)
+    if len(a) < TOOM3_SQR_THRESHOLD:
+        return _karatsuba(a, None)
+    return _toom3(a, None)
+
+
+def _ntt_forward(a: list, prime: int, root: int) -> None:
+    """
+    Transforms a coefficient list in place with a decimation-in-frequency NTT.
+
+    The output is left in bit-reversed order, which `_ntt_inverse` expects as input,
+    so no reordering pass is needed between the two transforms.
+
+    Args:
+        a (list): The coefficients, whose length must be a power of two.
+        prime (int): The NTT prime.
+        root (int): A primitive root of `prime`.
+    """
+    n = len(a)
+    length = n
+    while length >= 2:
+        half = length // 2
+        w = pow(root, (prime - 1) // length, prime)
+        twiddles = [1] * half
+        for j in range(1, half):
+            twiddles[j] = twiddles[j - 1] * w % prime
+
+        if half < n // length:
+            # Few butterflies per block: process one butterfly position across all blocks
+            for j in range(half):
+                lo, hi, t = a[j::length], a[j + half::length], twiddles[j]
+                a[j::length] = [(x + y) % prime for x, y in zip(lo, hi)]
+                a[j + half::length] = [(x - y) * t % prime for x, y in zip(lo, hi)]
+        else:
+            # Few blocks: process one whole block at a time
+            for i in range(0, n, length):
+                lo, hi = a[i:i + half], a[i + half:i + length]
+                a[i:i + half] = [(x + y) % prime for x, y in zip(lo, hi)]
+                a[i + half:i + length] = [(x - y) * t % prime for x, y, t in zip(lo, hi, twiddles)]
+        length = half
+
+
+def _ntt_inverse(a: list, prime: int, root: int) -> None:
+    """
+    Inverts `_ntt_forward` in place with a decimation-in-time NTT.
+
+    Args:
+        a (list): The transformed values in bit-reversed order.
+        prime (int): The NTT prime.
+        root (int): The primitive root used for the forward transform.
+    """
+    n = len(a)
+    length = 2
+    while length <= n:
+        half = length // 2
+        w = pow(root, prime - 1 - (prime - 1) // length, prime)
+        twiddles = [1] * half
+        for j in range(1, half):
+            twiddles[j] = twiddles[j - 1] * w % prime
+
+        if half < n // length:
+            for j in range(half):
+                lo, t = a[j::length], twiddles[j]
+                hi = [y * t % prime for y in a[j + half::length]]
+                a[j::length] = [(x + y) % prime for x, y in zip(lo, hi)]
+                a[j + half::length] = [(x - y) % prime for x, y in zip(lo, hi)]
+        else:
+            for i in range(0, n, length):
+                lo = a[i:i + half]
+                hi = [y * t % prime for y, t in zip(a[i + half:i + length], twiddles)]
+                a[i:i + half] = [(x + y) % prime for x, y in zip(lo, hi)]
+                a[i + half:i + length] = [(x - y) % prime for x, y in zip(lo, hi)]
+        length *= 2
+
+    # Undo the scaling by the transform length
+    n_inv = pow(n, prime - 2, prime)
+    a[:] = [x * n_inv % prime for x in a]
+
+
+def _convolve_ntt(a: list, b: list | None, base: int) -> list:
+    """
+    Multiplies two limb lists with number-theoretic transforms.
+
+    The product is computed modulo as many NTT primes as are needed to exceed the
+    largest possible product coefficient and then recombined exactly with the
+    Chinese remainder theorem.
+
+    Args:
+        a (list): The first limb list, every limb below `base`.
+        b (list | None): The second limb list, or `None` to square `a`.
+        base (int): The limb base, used to bound the product coefficients.
+
+    Returns:
+        list: The product coefficients, unreduced.
+    """
+    if _PROFILER is not None:
+        _PROFILER.ntt_products += 1
+
+    if b is None:
+        size = 2 * len(a) - 1
+        bound = len(a) * (base - 1) ** 2
+    else:
+        size = len(a) + len(b) - 1
+        bound = min(len(a), len(b)) * (base - 1) ** 2
+
+    # The transform length is the next power of two that holds the whole product
+    n = 1 << (size - 1).bit_length()
+    if n > 1 << _NTT_MAX_LOG2:
+        raise OverflowError("operands are too large for the NTT primes.")
+
+    # Pick enough primes that the CRT modulus exceeds every product coefficient
+    primes = []
+    modulus = 1
+    for prime, root in _NTT_PRIMES:
+        primes.append((prime, root))
+        modulus *= prime
+        if modulus > bound:
+            break
+
+    residues = []
+    for prime, root in primes:
+        fa = a + [0] * (n - len(a))
+        _ntt_forward(fa, prime, root)
+        if b is None:
+            fa = [x * x % prime for x in fa]
+        else:
+            fb = b + [0] * (n - len(b))
+            _ntt_forward(fb, prime, root)
+            fa = [x * y % prime for x, y in zip(fa, fb)]
+        _ntt_inverse(fa, prime, root)
+        residues.append(fa[:size])
+
+    if len(residues) == 1:
+        return residues[0]
+
+    # Recombine the residues with precomputed CRT weights
+    weights = []
+    for prime, _ in primes:
+        partial = modulus // prime
+        weights.append(partial * pow(partial, -1, prime))
+    return [sum(r * w for r, w in zip(column, weights)) % modulus for column in zip(*residues)]
+
+
+def _carry(coefficients: list, base: int) -> list:
+    """
+    Reduces unreduced product coefficients to limbs in a single carry pass.
+
+    Args:
+        coefficients (list): The product coefficients, least significant first.
+        base (int): The limb base.
+
+    Returns:
+        list: The normalized limbs, least significant first.
+    """
+    limbs = [0] * len(coefficients)
+    carry = 0
+    for i, c in enumerate(coefficients):
+        carry, limbs[i] = divmod(c + carry, base)
+
+    # The top coefficient may carry over into additional limbs
+    while carry:
+        carry, limb = divmod(carry, base)
+        limbs.append(limb)
+
+    return _normalize(limbs or [0])
+
+
+def _mul_coefficients(a, b, base: int) -> list:
+    """
+    Multiplies the magnitudes of two limb sequences without carrying the result.
+
+    With `parallel.enable` active, very long operands are split over worker processes,
+    and operands chosen by the backend (see `set_backend`) are handed to it. Both
+    return carried limbs. Everything else runs in `_native_coefficients`.
+
+    Args:
+        a: The first limb sequence.
+        b: The second limb sequence.
+        base (int): The limb base.
+
+    Returns:
+        list: The product coefficients, least significant first, possibly unreduced.
+    """
+    if _PROFILER is not None:
+        _PROFILER.record_multiplication(len(a), len(b))
+
+    if _PARALLEL is not None and min(len(a), len(b)) >= _PARALLEL.threshold:
+        return _PARALLEL.multiply(a, b, base)
+
+    if _BACKEND is not None and min(len(a), len(b)) >= _BACKEND.threshold:
+        backend = _BACKEND.select(min(len(a), len(b)), max(len(a), len(b)))
+        if backend is not None:
+            return backend.multiply(a, b, base)
+
+    return _native_coefficients(a, b, base)
+
+
+def _native_coefficients(a, b, base: int) -> list:
+    """
+    Multiplies the magnitudes of two limb sequences with the native limb engine, without carrying.
+
+    Identical operands take the squaring path and operands of at least `NTT_THRESHOLD`
+    limbs use number-theoretic transforms.
+
+    Args:
+        a: The first limb sequence.
+        b: The second limb sequence.
+        base (int): The limb base.
+
+    Returns:
+        list: The product coefficients, least significant first, unreduced.
+    """
+    if a is b or a == b:
+        if len(a) >= NTT_THRESHOLD:
+            return _convolve_ntt(list(a), None, base)
+        return _square(list(a))
+
+    # Number-theoretic transforms only pay off once both operands are long
+    if min(len(a), len(b)) >= NTT_THRESHOLD:
+        return _convolve_ntt(list(a), list(b), base)
+    return _convolve(list(a), list(b))
+
+
+def _mul_limbs(a, b, base: int) -> list:
+    """
+    Multiplies the magnitudes of two limb sequences.
+
+    The limbs are multiplied as polynomial coefficients (see `_mul_coefficients`)
+    and carried only once at the end.
+
+    Args:
+        a: The first limb sequence.
+        b: The second limb sequence.
+        base (int): The limb base.
+
+    Returns:
+        list: The limbs of the product, least significant first.
+    """
+    return _carry(_mul_coefficients(a, b, base), base)
+
+
+def _copy_limbs(limbs) -> array:
+    """
+    Copies a limb buffer into a new writable array with a single memory copy.
+
+    Args:
+        limbs: The limbs, an `array('Q')` or a read-only memoryview of one.
+
+    Returns:
+        array: The copied limbs.
+    """
+    copy = array("Q")
+    copy.frombytes(memoryview(limbs).cast("B"))
+    return copy
+
+
+def _product_tree(factors: list, base: int) -> list:
+    """
+    Multiplies many limb lists along a balanced binary tree.
+
+    Neighbouring factors are multiplied level by level, so both operands of every
+    multiplication have similar lengths and the large products reach the fast algorithms.
+
+    Args:
+        factors (list): The limb lists of the factors.
+        base (int): The limb base.
+
+    Returns:
+        list: The limbs of the product, `[1]` for no factors.
+    """
+    if not factors:
+        return [1]
+
+    while len(factors) > 1:
+        paired = [_mul_limbs(factors[i], factors[i + 1], base) for i in range(0, len(factors) - 1, 2)]
+        if len(factors) % 2:
+            paired.append(factors[-1])
+        factors = paired
+
+    return factors[0]
+
+
+def _iadd_limbs(acc: array, b, base: int) -> None:
+    """
+    Adds the magnitude of `b` to the limbs in `acc`, growing `acc` in place.
+
+    Args:
+        acc (array): The limbs to update, least significant first.
+        b: The limbs to add, which may be `acc` itself.
+        base (int): The limb base.
+    """
+    n, m = len(acc), len(b)
+    carry = 0
+    for i in range(min(n, m)):
+        value = acc[i] + b[i] + carry
+        if value >= base:
+            acc[i] = value - base
+            carry = 1
+        else:
+            acc[i] = value
+            carry = 0
+
+    # Take over the limbs of a longer `b` and run the carry up
+    if m > n:
+        acc.extend(b[n:])
+    i = min(n, m)
+    while carry and i < len(acc):
+        if acc[i] == base - 1:
+            acc[i] = 0
+            i += 1
+        else:
+            acc[i] += 1
+            carry = 0
+    if carry:
+        acc.append(1)
+
+
+def _isub_limbs(acc: array, b, base: int) -> bool:
+    """
+    Replaces the limbs in `acc` with the magnitude of their difference to `b`, in place.
+
+    Args:
+        acc (array): The limbs to update, least significant first.
+        b: The limbs to subtract, which may be `acc` itself.
+        base (int): The limb base.
+
+    Returns:
+        bool: True if `b` was larger, so the difference changed its sign.
+    """
+    flipped = _cmp_limbs(acc, b) < 0
+    if flipped:
+        # Compute b - acc in the buffer of `acc`
+        acc.extend([0] * (len(b) - len(acc)))
+        minuend = b
+    else:
+        minuend = acc
+
+    borrow = 0
+    for i in range(len(b)):
+        value = minuend[i] - (acc[i] if flipped else b[i]) - borrow
+        if value < 0:
+            acc[i] = value + base
+            borrow = 1
+        else:
+            acc[i] = value
+            borrow = 0
+
+    # Run the borrow up through the remaining limbs of `acc`
+    i = len(b)
+    while borrow:
+        if acc[i] == 0:
+            acc[i] = base - 1
+            i += 1
+        else:
+            acc[i] -= 1
+            borrow = 0
+
+    # Drop the most significant zero limbs
+    while len(acc) > 1 and acc[-1] == 0:
+        acc.pop()
+    return flipped
+
+
+def _mul_small(a, d: int, base: int) -> list:
+    """
+    Multiplies a limb sequence by a single small integer.
+
+    Args:
+        a: The limb sequence.
+        d (int): The factor, smaller than `base`.
+        base (int): The limb base.
+
+    Returns:
+        list: The limbs of the product, least significant first.
+    """
+    result = [0] * (len(a) + 1)
+    carry = 0
+    for i, x in enumerate(a):
+        carry, result[i] = divmod(x * d + carry, base)
+    result[len(a)] = carry
+    return _normalize(result)
+
+
+def _divmod_small(a, d: int, base: int) -> tuple:
+    """
+    Divides a limb sequence by a single limb in one pass.
+
+    Args:
+        a: The dividend limbs.
+        d (int): The non-zero divisor, smaller than `base`.
+        base (int): The limb base.
+
+    Returns:
+        tuple: The quotient limbs and the integer remainder.
+    """
+    quotient = [0] * len(a)
+    remainder = 0
+    for i in range(len(a) - 1, -1, -1):
+        quotient[i], remainder = divmod(remainder * base + a[i], d)
+    return _normalize(quotient), remainder
+
+
+def _divmod_knuth(a, b, base: int) -> tuple:
+    """
+    Divides two limb sequences with Knuth's algorithm D.
+
+    Both operands are scaled so the top limb of the divisor is at least half the
+    base, which keeps every estimated quotient limb at most two units too large.
+
+    Args:
+        a: The dividend limbs, at least as long as `b`.
+        b: The divisor limbs, at least two of them.
+        base (int): The limb base.
+
+    Returns:
+        tuple: The quotient limbs and the remainder limbs.
+    """
+    n = len(b)
+    m = len(a) - n
+
+    # Normalize the operands so the quotient estimates are tight
+    d = base // (b[-1] + 1)
+    u = _mul_small(a, d, base) if d > 1 else list(a)
+    u += [0] * (len(a) + 1 - len(u))
+    v = _mul_small(b, d, base) if d > 1 else list(b)
+    v_top, v_next = v[-1], v[-2]
+
+    quotient = [0] * (m + 1)
+    for j in range(m, -1, -1):
+        # Estimate the quotient limb from the top two limbs of the remainder
+        q_hat, r_hat = divmod(u[j + n] * base + u[j + n - 1], v_top)
+        while q_hat >= base or q_hat * v_next > r_hat * base + u[j + n - 2]:
+            q_hat -= 1
+            r_hat += v_top
+            if r_hat >= base:
+                break
+
+        # Multiply and subtract, the carry becomes negative on a borrow
+        carry = 0
+        for i in range(n):
+            carry, u[i + j] = divmod(u[i + j] - q_hat * v[i] + carry, base)
+        top = u[j + n] + carry
+
+        # The estimate was one too large, add the divisor back once
+        if top < 0:
+            q_hat -= 1
+            carry = 0
+            for i in range(n):
+                carry, u[i + j] = divmod(u[i + j] + v[i] + carry, base)
+            top += carry
+        u[j + n] = top
+        quotient[j] = q_hat
+
+    # Undo the normalization on the remainder
+    remainder = _normalize(u[:n])
+    if d > 1:
+        remainder = _divmod_small(remainder, d, base)[0]
+    return _normalize(quotient), remainder
+
+
+def _shift_down(a: list, k: int) -> list:
+    """
+    Drops the `k` least significant limbs, dividing by `base**k`.
+
+    Args:
+        a (list): The limbs.
+        k (int): The number of limbs to drop.
+
+    Returns:
+        list: The remaining limbs, `[0]` if nothing is left.
+    """
+    return a[k:] or [0]
+
+
+def _reciprocal(b: list, base: int) -> list:
+    """
+    Computes `floor(base**(2n) / b)` for an `n`-limb divisor with Newton iteration.
+
+    The reciprocal of the top half of the divisor (plus two guard limbs) is computed
+    recursively and refined by one Newton step, which doubles the number of
+    correct limbs, so the total cost is a small multiple of one multiplication.
+
+    Args:
+        b (list): The divisor limbs.
+        base (int): The limb base.
+
+    Returns:
+        list: The limbs of the reciprocal.
+    """
+    n = len(b)
+    h = (n + 1) // 2 + 2
+    power = [0] * (2 * n) + [1]
+    if n == 1:
+        return _divmod_small(power, b[0], base)[0]
+    if n <= NEWTON_DIV_THRESHOLD or h >= n:
+        return _divmod_knuth(power, b, base)[0]
+
+    # Start from the reciprocal of the leading limbs, scaled to full length
+    x = [0] * (n - h) + _reciprocal(b[n - h:], base)
+
+    # One Newton step: x += x * (base**(2n) - b * x) / base**(2n)
+    bx = _mul_limbs(b, x, base)
+    if _cmp_limbs(bx, power) <= 0:
+        delta = _shift_down(_mul_limbs(x, _sub_limbs(power, bx, base), base), 2 * n)
+        x = _add_limbs(x, delta, base)
+    else:
+        delta = _shift_down(_mul_limbs(x, _sub_limbs(bx, power, base), base), 2 * n)
+        x = _sub_limbs(x, delta, base)
+
+    # Fix the last few units so the result is exactly the floor
+    bx = _mul_limbs(b, x, base)
+    while _cmp_limbs(bx, power) > 0:
+        x = _sub_limbs(x, [1], base)
+        bx = _sub_limbs(bx, b, base)
+    remainder = _sub_limbs(power, bx, base)
+    while _cmp_limbs(remainder, b) >= 0:
+        x = _add_limbs(x, [1], base)
+        remainder = _sub_limbs(remainder, b, base)
+    return x
+
+
+def _divmod_newton(a, b, base: int) -> tuple:
+    """
+    Divides two limb sequences using a Newton reciprocal of the divisor.
+
+    The dividend is consumed in blocks of `len(b)` limbs. Every block costs two
+    multiplications with the precomputed reciprocal, so the division runs in the
+    time of `len(a) / len(b)` multiplications instead of quadratic time.
+
+    Args:
+        a: The dividend limbs.
+        b: The divisor limbs.
+        base (int): The limb base.
+
+    Returns:
+        tuple: The quotient limbs and the remainder limbs.
+    """
+    b = list(b)
+    n = len(b)
+    reciprocal = _reciprocal(b, base)
+
+    def divide_block(t: list) -> tuple:
+        # Divide a value below b * base**n. Only the leading limbs of `t` take part in
+        # the estimate, which is then at most a few units too small
+        q = _shift_down(_mul_limbs(_shift_down(t, n - 1), reciprocal, base), n + 1)
+        r = _sub_limbs(t, _mul_limbs(q, b, base), base)
+        while _cmp_limbs(r, b) >= 0:
+            q = _add_limbs(q, [1], base)
+            r = _sub_limbs(r, b, base)
+        return q, r
+
+    # Walk the dividend blocks from the most significant one down
+    blocks = (len(a) + n - 1) // n
+    quotient = [0] * (blocks * n)
+    remainder = [0]
+    for i in range(blocks - 1, -1, -1):
+        block = list(a[i * n:(i + 1) * n])
+        t = _normalize(block + [0] * (n - len(block)) + remainder) if remainder != [0] else _normalize(block)
+        q, remainder = divide_block(t)
+        quotient[i * n:i * n + len(q)] = q
+    return _normalize(quotient), remainder
+
+
+def _divmod_limbs(a, b, base: int) -> tuple:
+    """
+    Divides the magnitudes of two limb sequences, dispatching on their length.
+
+    Single-limb divisors use a linear pass, short divisors or quotients Knuth's
+    algorithm D and everything else Newton reciprocal division.
+
+    Args:
+        a: The dividend limbs.
+        b: The non-zero divisor limbs.
+        base (int): The limb base.
+
+    Returns:
+        tuple: The quotient limbs and the remainder limbs.
+    """
+    if _cmp_limbs(a, b) < 0:
+        return [0], list(a)
+
+    if _BACKEND is not None and len(b) >= _BACKEND.threshold:
+        backend = _BACKEND.select_division(len(b), len(a))
+        if backend is not None:
+            return backend.divmod(a, b, base)
+
+    if len(b) == 1:
+        quotient, remainder = _divmod_small(a, b[0], base)
+        return quotient, [remainder]
+    if len(b) <= NEWTON_DIV_THRESHOLD or len(a) - len(b) <= NEWTON_DIV_THRESHOLD:
+        return _divmod_knuth(a, b, base)
+    return _divmod_newton(a, b, base)
+
+
+@lru_cache(maxsize=None)
+def _int_base_power(base: int, exponent: int) -> int:
+    """
+    Returns `base**exponent` as a Python integer, cached for the conversion tree.
+
+    Args:
+        base (int): The limb base.
+        exponent (int): The exponent, a power of two in practice.
+
+    Returns:
+        int: The power of the base.
+    """
+    if exponent == 1:
+        return base
+    half = _int_base_power(base, exponent // 2)
+    return half * half if exponent % 2 == 0 else half * half * base
+
+
+def _limbs_to_int(limbs, base: int) -> int:
+    """
+    Converts a little-endian limb sequence into a Python integer.
+
+    Long sequences are split in two halves whose values are combined with a cached
+    power of the base, so the conversion runs in the time of a few large
+    multiplications instead of quadratic time.
+
+    Args:
+        limbs: The limb sequence.
+        base (int): The limb base.
+
+    Returns:
+        int: The magnitude represented by the limbs.
+    """
+    if len(limbs) * base.bit_length() <= CONVERSION_THRESHOLD_BITS:
+        value = 0
+        for i in range(len(limbs) - 1, -1, -1):
+            value = value * base + limbs[i]
+        return value
+
+    # Split at the largest power of two below the length so the powers repeat
+    half = 1 << ((len(limbs) - 1).bit_length() - 1)
+    return _limbs_to_int(limbs[half:], base) * _int_base_power(base, half) + _limbs_to_int(limbs[:half], base)
+
+
+@lru_cache(maxsize=None)
+def _power_of_two_limbs(bits: int, base: int) -> tuple:
+    """
+    Returns the limbs of `2**bits`, cached for the binary conversion tree.
+
+    Args:
+        bits (int): The exponent, a power of two.
+        base (int): The limb base.
+
+    Returns:
+        tuple: The limbs of the power, least significant first.
+    """
+    if bits <= CONVERSION_THRESHOLD_BITS:
+        return tuple(_int_to_limbs(1 << bits, base))
+    half = list(_power_of_two_limbs(bits // 2, base))
+    return tuple(_carry(_native_coefficients(half, half, base), base))
+
+
+def _int_to_limbs(value: int, base: int) -> list:
+    """
+    Converts a non-negative Python integer into little-endian limbs.
+
+    Values above `CONVERSION_SPLIT_BITS` are split in binary, with a shift and a mask,
+    into a high and a low part. The parts are converted recursively and recombined
+    with one native multiplication by the cached limbs of a power of two, so the
+    conversion costs a few large multiplications. Smaller values are split by a
+    cached power of the base, which is quadratic but runs at C speed. Both avoid
+    the decimal conversion of Python integers and its digit limit.
+
+    Args:
+        value (int): The non-negative integer.
+        base (int): The limb base.
+
+    Returns:
+        list: The limbs of the value, least significant first.
+    """
+    if value.bit_length() <= CONVERSION_THRESHOLD_BITS:
+        limbs = []
+        while value:
+            value, limb = divmod(value, base)
+            limbs.append(limb)
+        return limbs or [0]
+
+    # Split at the largest power of two below the bit length so the powers repeat. The
+    # recombination stays in the native engine, a backend would convert back through here
+    if value.bit_length() > CONVERSION_SPLIT_BITS:
+        bits = 1 << (value.bit_length() - 1).bit_length() - 1
+        high = _int_to_limbs(value >> bits, base)
+        low = _int_to_limbs(value & ((1 << bits) - 1), base)
+        power = list(_power_of_two_limbs(bits, base))
+        return _add_limbs(_carry(_native_coefficients(high, power, base), base), low, base)
+
+    # Estimate the number of limbs and split at the largest power of two below it
+    half = 1 << (value.bit_length() // base.bit_length()).bit_length()
+    while _int_base_power(base, half) > value:
+        half //= 2
+    high, low = divmod(value, _int_base_power(base, half))
+
+    # The low part always fills exactly `half` limbs
+    limbs = _int_to_limbs(low, base)
+    limbs += [0] * (half - len(limbs))
+    return limbs + _int_to_limbs(high, base)
+
+
+class Backend():
+    """
+    Interface of an arithmetic backend that long products and divisions are handed to.
+
+    Backends work on the magnitudes of little-endian limb sequences in base `10**k`
+    and must return exactly the limbs of the native engine.
+    """
+    name = None
+
+
+    def multiply(self, a, b, base: int) -> list:
+        """
+        Multiplies the magnitudes of two limb sequences.
+
+        Args:
+            a: The first limb sequence.
+            b: The second limb sequence, `a` itself for squares.
+            base (int): The limb base.
+
+        Returns:
+            list: The limbs of the product, least significant first.
+        """
+        raise NotImplementedError
+
+
+    def divmod(self, a, b, base: int) -> tuple:
+        """
+        Divides the magnitudes of two limb sequences.
+
+        Args:
+            a: The dividend limbs.
+            b: The non-zero divisor limbs.
+            base (int): The limb base.
+
+        Returns:
+            tuple: The quotient limbs and the remainder limbs.
+        """
+        raise NotImplementedError
+
+
+class IntBackend(Backend):
+    """
+    Computes with CPython integers, converting the limbs with `_limbs_to_int` and `_int_to_limbs`.
+    """
+    name = "int"
+
+
+    def multiply(self, a, b, base: int) -> list:
+        """
+        Multiplies two limb sequences as Python integers, see `Backend.multiply`.
+        """
+        x = _limbs_to_int(a, base)
+        return _int_to_limbs(x * (x if a is b else _limbs_to_int(b, base)), base)
+
+
+    def divmod(self, a, b, base: int) -> tuple:
+        """
+        Divides two limb sequences as Python integers, see `Backend.divmod`.
+        """
+        quotient, remainder = divmod(_limbs_to_int(a, base), _limbs_to_int(b, base))
+        return _int_to_limbs(quotient, base), _int_to_limbs(remainder, base)
+
+
+class Gmpy2Backend(Backend):
+    """
+    Computes with GMP through gmpy2. The limbs are converted through decimal strings,
+    which GMP parses and prints in subquadratic time.
+    """
+    name = "gmpy2"
+
+
+    def __init__(self):
+        """
+        Checks that gmpy2 is installed.
+        """
+        if gmpy2 is None:
+            raise ImportError("the gmpy2 backend needs gmpy2, install it with `pip install gmpy2`.")
+
+
+    @staticmethod
+    def _to_mpz(limbs, base: int) -> "gmpy2.mpz":
+        """
+        Converts limbs in base `10**k` into a GMP integer.
+
+        Args:
+            limbs: The limb sequence.
+            base (int): The limb base.
+
+        Returns:
+            gmpy2.mpz: The magnitude represented by the limbs.
+        """
+        width = len(str(base)) - 1
+        parts = [str(limbs[-1])]
+        parts.extend([f"{limbs[i]:0{width}d}" for i in range(len(limbs) - 2, -1, -1)])
+        return gmpy2.mpz("".join(parts))
+
+
+    @staticmethod
+    def _to_limbs(value: "gmpy2.mpz", base: int) -> list:
+        """
+        Converts a non-negative GMP integer into limbs in base `10**k`.
+
+        Args:
+            value (gmpy2.mpz): The non-negative integer.
+            base (int): The limb base.
+
+        Returns:
+            list: The limbs of the value, least significant first.
+        """
+        width = len(str(base)) - 1
+        text = value.digits(10)
+        return [int(text[max(end - width, 0):end]) for end in range(len(text), 0, -width)]
+
+
+    def multiply(self, a, b, base: int) -> list:
+        """
+        Multiplies two limb sequences with GMP, see `Backend.multiply`.
+        """
+        x = self._to_mpz(a, base)
+        return self._to_limbs(x * (x if a is b else self._to_mpz(b, base)), base)
+
+
+    def divmod(self, a, b, base: int) -> tuple:
+        """
+        Divides two limb sequences with GMP, see `Backend.divmod`.
+        """
+        quotient, remainder = gmpy2.f_divmod(self._to_mpz(a, base), self._to_mpz(b, base))
+        return self._to_limbs(quotient, base), self._to_limbs(remainder, base)
+
+
+# Backends by name, `native` is the limb engine itself
+_BACKEND_CLASSES = {"int": IntBackend, "gmpy2": Gmpy2Backend}
+
+
+class _BackendSelector():
+    def __init__(self, name: str):
+        """
+        Chooses the backend of every product and division that reaches `threshold` limbs.
+
+        Args:
+            name (str): `"auto"` to choose by operand size, or the name of a backend used for every operand size.
+        """
+        self.name = name
+        if name == "auto":
+            self.forced = None
+            self.int = IntBackend()
+            self.gmpy2 = Gmpy2Backend() if gmpy2 is not None else None
+            self.threshold = min(INT_BACKEND_MIN_LIMBS, GMPY2_BACKEND_MIN_LIMBS) if self.gmpy2 else INT_BACKEND_MIN_LIMBS
+        else:
+            self.forced = _BACKEND_CLASSES[name]()
+            self.threshold = 1
+
+
+    def select(self, short: int, long: int) -> Backend | None:
+        """
+        Chooses the backend of a product of operands of the given lengths.
+
+        Args:
+            short (int): The length of the shorter operand in limbs.
+            long (int): The length of the longer operand in limbs.
+
+        Returns:
+            Backend | None: The backend, or `None` to stay in the native limb engine.
+        """
+        if self.forced is not None:
+            return self.forced
+        if self.gmpy2 is not None and short >= GMPY2_BACKEND_MIN_LIMBS:
+            return self.gmpy2
+        if INT_BACKEND_MIN_LIMBS <= short and long <= INT_BACKEND_MAX_LIMBS:
+            return self.int
+        return None
+
+
+    def select_division(self, divisor: int, dividend: int) -> Backend | None:
+        """
+        Chooses the backend of a division of operands of the given lengths.
+
+        Args:
+            divisor (int): The length of the divisor in limbs.
+            dividend (int): The length of the dividend in limbs.
+
+        Returns:
+            Backend | None: The backend, or `None` to stay in the native limb engine.
+        """
+        if self.forced is not None:
+            return self.forced
+        if self.gmpy2 is not None and divisor >= GMPY2_BACKEND_MIN_LIMBS:
+            return self.gmpy2
+        if INT_BACKEND_MIN_LIMBS <= divisor <= INT_BACKEND_MAX_DIV_LIMBS:
+            return self.int
+        return None
+
+
+def available_backends() -> list:
+    """
+    Lists the backends that can be used in this environment.
+
+    Returns:
+        list: The backend names, `native` and `int` always and `gmpy2` when it is installed.
+    """
+    return ["native", "int"] + (["gmpy2"] if gmpy2 is not None else [])
+
+
+def set_backend(name: str = "auto") -> None:
+    """
+    Selects the arithmetic backend of all long products and divisions.
+
+    `auto` (the default, unless the `HIGHNUMBER_BACKEND` environment variable says
+    otherwise) picks the fastest backend by operand size: the native limb engine for
+    short operands and very long products and divisions, Python integers for everything else and
+    gmpy2 from `GMPY2_BACKEND_MIN_LIMBS` limbs on when it is installed. Any other name forces that
+    backend for every operand size. All backends give identical results.
+
+    Args:
+        name (str): `auto`, `native`, `int` or `gmpy2`.
+    """
+    global _BACKEND
+    if name == "native":
+        _BACKEND = None
+    elif name == "auto" or name in _BACKEND_CLASSES:
+        _BACKEND = _BackendSelector(name)
+    else:
+        raise ValueError(f"unknown backend: {name!r}, expected 'auto' or one of {', '.join(available_backends())}.")
+
+
+def get_backend() -> str:
+    """
+    Returns the name of the selected backend.
+
+    Returns:
+        str: `auto`, `native`, `int` or `gmpy2`.
+    """
+    return "native" if _BACKEND is None else _BACKEND.name
+
+
+@contextmanager
+def use_backend(name: str):
+    """
+    Selects a backend for the duration of a `with` block.
+
+    Args:
+        name (str): `auto`, `native`, `int` or `gmpy2`.
+    """
+    global _BACKEND
+    previous = _BACKEND
+    set_backend(name)
+    try:
+        yield
+    finally:
+        _BACKEND = previous
+
+
+def _backend_from_environment() -> None:
+    """
+    Selects the backend named by the `HIGHNUMBER_BACKEND` environment variable, `auto` when unset.
+
+    Unlike `set_backend`, an unknown or unavailable backend does not fail, so a typo in the
+    environment never makes the library unimportable. It is reported as a `RuntimeWarning`
+    and the automatic selection is used instead.
+    """
+    name = os.environ.get(BACKEND_VARIABLE, "auto")
+    try:
+        set_backend(name)
+    except (ValueError, ImportError) as error:
+        warnings.warn(f"ignoring {BACKEND_VARIABLE}={name!r}: {error} Using 'auto' instead.", RuntimeWarning)
+        set_backend("auto")
+
+
+_backend_from_environment()
+
+
+def _window_size(bits: int) -> int:
+    """
+    Chooses the sliding window width for an exponent of the given bit length.
+
+    Args:
+        bits (int): The bit length of the exponent.
+
+    Returns:
+        int: The window width, wider windows trade precomputed powers for fewer multiplications.
+    """
+    for window, limit in enumerate((24, 80, 240, 672, 1792), start=1):
+        if bits <= limit:
+            return window
+    return 6
+
+
+def _sliding_window_pow(base, exponent: int, one, multiply):
+    """
+    Raises `base` to a non-negative power with left-to-right sliding-window exponentiation.
+
+    The exponent is scanned from its most significant bit. Zero bits only square
+    the result, and every window of set bits costs a single multiplication by one
+    of the precomputed odd powers.
+
+    Args:
+        base: The value to raise, in whatever form `multiply` works on.
+        exponent (int): The non-negative exponent.
+        one: The neutral element for `multiply`.
+        multiply: A function multiplying two values, squares pass the same object twice.
+
+    Returns:
+        The power, in the same form as `base`.
+    """
+    # Precompute the odd powers x, x^3, ..., x^(2^window - 1)
+    window = _window_size(exponent.bit_length())
+    odd_powers = [base]
+    if window > 1:
+        square = multiply(base, base)
+        for _ in range((1 << (window - 1)) - 1):
+            odd_powers.append(multiply(odd_powers[-1], square))
+
+    result = one
+    i = exponent.bit_length() - 1
+    while i >= 0:
+        # Zero bits only square the result
+        if not (exponent >> i) & 1:
+            result = multiply(result, result)
+            i -= 1
+            continue
+
+        # Take the longest window ending in a set bit
+        low = max(i - window + 1, 0)
+        while not (exponent >> low) & 1:
+            low += 1
+        for _ in range(i - low + 1):
+            result = multiply(result, result)
+        bits = (exponent >> low) & ((1 << (i - low + 1)) - 1)
+        result = multiply(result, odd_powers[bits >> 1])
+        i = low - 1
+
+    return result
+
+
+def _integral(value: "int | float") -> int:
+    """
+    Converts an integer operand to a Python integer, accepting integral floats only.
+
+    Args:
+        value (int | float): The operand.
+
+    Returns:
+        int: The integer value.
+    """
+    if isinstance(value, float) and not value.is_integer():
+        raise TypeError(f"num needs an integral value, got {value!r}")
+    return int(value)
+
+
+def _exclusive_refcount() -> int | None:
+    """
+    Measures the reference count that an object sees inside its own in-place operator
+    when a single name refers to it.
+
+    Returns:
+        int | None: The reference count, `None` on interpreters without reference counts.
+    """
+    if not hasattr(sys, "getrefcount"):
+        return None
+
+    class Probe():
+        def __iadd__(self, other):
+            self.count = sys.getrefcount(self)
+            return self
+
+    probe = Probe()
+    probe += 0
+    return probe.count
+
+
+# Reference count of a `num` inside `__iadd__` and `__isub__` when nothing but the updated name
+# refers to it. Numbers with more references (aliases, dict keys, set members) are never changed in place
+_EXCLUSIVE_REFCOUNT = _exclusive_refcount()
+
+
+def _group(digits: str, separator: str) -> str:
+    """
+    Inserts a thousands separator into a string of digits.
+
+    Args:
+        digits (str): The digits.
+        separator (str): The separator, "," or "_".
+
+    Returns:
+        str: The digits in groups of three, counted from the right.
+    """
+    head = len(digits) % 3 or 3
+    return separator.join([digits[:head]] + [digits[i:i + 3] for i in range(head, len(digits), 3)])
 
 
 class num():
-    def __init__(self, num: int | str, chunksize: int = 10):
+    __slots__ = ("limbs", "negative", "chunksize", "chunkbase", "_hash")
+
+    def __init__(self, num: int | float | str, chunksize: int = 10):
         """
         Initializes a `num` object by dividing a large number into manageable segments.
-        
+
+        The segments (limbs) are stored as machine integers in base `10**chunksize`,
+        least significant limb first, in a compact `array('Q')`.
+
         Args:
-            num (int | str): The number to be represented, can be a positive or negative integer or string.
+            num (int | float | str): The number to be represented, can be a positive or negative integer or string.
+                                     Floats must be integral, fractions raise a `TypeError` instead of being truncated.
+            chunksize (int): Number of decimal digits per limb, between 1 and 19.
         """
-        self.segments = []  # List to store segments of the number as strings
+        # Every limb has to fit into an unsigned 64 bit machine integer
+        if not 1 <= chunksize <= 19:
+            raise ValueError("chunksize must be between 1 and 19.")
+
         self.chunksize = chunksize  # Maximum number of digits in each segment
         self.chunkbase = 10**self.chunksize  # The basic chunkbase
-        
-        self.digits = 0  # Total number of digits in the number
-        self.negative = num < 0  # Track if the number is negative
-        
-        # Convert to string and calculate the absolute value to work with digits
-        string = str(abs(num))
-        self.digits = len(string)  # Count total digits
-        
-        # Handle leading segment (may have fewer digits than chunksize)
-        self.segments.append(string[:len(string) % self.chunksize])
-        
-        # Split the number into chunks of `chunksize`
-        for i in range(len(string) // self.chunksize):
-            start_index = (len(string) % self.chunksize) + i * self.chunksize
-            end_index = start_index + self.chunksize
-            self.segments.append(string[start_index:end_index])
-        
-        # Remove empty leading segment if the number of digits is exactly divisible by chunksize
-        if self.segments[0] == '':
-            self.segments.pop(0)
-        
-        
-    def add(self, sec_num: "num") -> "num":
+        self._hash = None  # Cached hash, reset whenever the value changes in place
+
+        # Strings are split into chunks of digits, integers are converted in binary
+        if isinstance(num, str):
+            string = num.strip().replace("_", "")
+            self.negative = string.startswith("-")  # Track if the number is negative
+            if string.startswith(("+", "-")):
+                string = string[1:]
+            if not (string.isascii() and string.isdigit()):
+                raise ValueError(f"invalid literal for num(): {num!r}")
+
+            # Split the digits into chunks of `chunksize`, starting at the least significant end
+            limbs = [int(string[max(end - self.chunksize, 0):end]) for end in range(len(string), 0, -self.chunksize)]
+        else:
+            num = _integral(num)
+            self.negative = num < 0  # Track if the number is negative
+            limbs = _int_to_limbs(abs(num), self.chunkbase)
+
+        self.limbs = array("Q", _normalize(limbs))
+
+        # Zero is never negative
+        if not self:
+            self.negative = False
+
+
+    @classmethod
+    def _from_limbs(cls, limbs, negative: bool, chunksize: int = 10) -> "num":
         """
-        Adds the current `num` object with another `num` object (`sec_num`).
+        Creates a `num` directly from little-endian limbs without parsing anything.
 
         Args:
-            sec_num (num): The second number to add.
+            limbs: The normalized limbs, least significant first. Arrays and memoryviews
+                   (see `from_bytes`) are taken over without copying.
+            negative (bool): Whether the number is negative.
+            chunksize (int): Number of decimal digits per limb.
 
         Returns:
-            num: A new `num` instance representing the sum of the two numbers.
+            num: The new `num` instance.
         """
+        ret = object.__new__(cls)
+        ret.chunksize = chunksize
+        ret.chunkbase = 10**chunksize
+        ret._hash = None
+        ret.limbs = limbs if isinstance(limbs, (array, memoryview)) else array("Q", limbs)
+        ret.negative = negative and not (len(ret.limbs) == 1 and ret.limbs[0] == 0)
+        return ret
 
-        # Create the return variable (a new num instance to store the result)
-        ret = num(0)
-        ret.negative = self.negative  # Assume the result has the same sign as `self` initially
 
-        # Carry-over variable to handle sums exceeding the chunk size
-        over = 0
-        ret.segments = []  # Initialize the result's segments list
+    def to_bytes(self) -> bytes:
+        """
+        Serializes the number into the versioned binary format.
 
-        # Pad the shorter number with leading zeros to align segment lengths
-        max_segments = max(len(self.segments), len(sec_num.segments))
-        self.segments = ["0"] * (max_segments - len(self.segments)) + self.segments
-        sec_num.segments = ["0"] * (max_segments - len(sec_num.segments)) + sec_num.segments
+        The header holds the format version, the sign, the chunksize and the limb count,
+        the limbs follow as raw little-endian 64 bit integers. Every limb takes 8 bytes for
+        up to 19 digits, and neither direction needs a decimal conversion.
 
-        # Loop over the segments in reverse (from least significant to most significant)
-        for x, y in zip(reversed(self.segments), reversed(sec_num.segments)):
-            # Calculate the sum of corresponding segments plus any carry-over
-            sol = str(int(x) + int(y) + over)
+        Returns:
+            bytes: The header followed by the limbs.
+        """
+        header = _HEADER.pack(_FORMAT_MAGIC, FORMAT_VERSION, self.negative, self.chunksize, len(self.limbs))
+        limbs = self.limbs
+        if sys.byteorder != "little":
+            limbs = _copy_limbs(limbs)
+            limbs.byteswap()
+        return header + bytes(limbs)
 
-            # If the result exceeds the chunk size, split it into a segment and carry-over
-            if len(sol) > self.chunksize:
-                ret.segments.insert(0, sol[-self.chunksize:])  # Keep the last `chunksize` digits
-                over = int(sol[:-self.chunksize])  # Carry-over is the remaining leading digits
-            else:
-                # If no overflow, add the whole sum as a segment and reset carry-over
-                ret.segments.insert(0, sol)
-                over = 0
 
-        # If there is any remaining carry-over after the loop, prepend it as a new segment
-        if over > 0:
-            ret.segments.insert(0, str(over))
+    @classmethod
+    def from_bytes(cls, data, copy: bool = True) -> "num":
+        """
+        Reads a number written by `to_bytes`.
 
-        # Clean up leading zeros in the most significant segment
-        ret.segments[0] = ret.segments[0].lstrip("0") or "0"
+        With `copy=False` the limbs stay in `data` and are accessed through a memoryview,
+        so a number can be opened straight from an `mmap` without reading it. Read-only
+        operations work on the buffer directly, in-place operators copy it on first use.
+        The limbs of a shared buffer are trusted, only the header is validated.
 
-        # Return the resulting `num` object
-        return ret
+        Args:
+            data: A bytes-like object (bytes, bytearray, memoryview or mmap).
+            copy (bool): Whether to copy the limbs into a new array.
+
+        Returns:
+            num: The number.
+        """
+        view = memoryview(data).cast("B")
+        if len(view) < _HEADER.size:
+            raise ValueError("data is too short for a num header")
+        magic, version, negative, chunksize, count = _HEADER.unpack_from(view)
+        if magic != _FORMAT_MAGIC:
+            raise ValueError("data does not hold a serialized num")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"unsupported num format version {version}")
+        if negative > 1 or not 1 <= chunksize <= 19 or count < 1:
+            raise ValueError("corrupt num header")
+        if len(view) != _HEADER.size + 8 * count:
+            raise ValueError(f"expected {count} limbs after the num header")
+
+        limbs = view[_HEADER.size:].cast("Q")
+        if copy or sys.byteorder != "little":
+            limbs = _copy_limbs(limbs)
+            if sys.byteorder != "little":
+                limbs.byteswap()
+            if max(limbs) >= 10**chunksize:
+                raise ValueError("corrupt num limbs")
+        if count > 1 and limbs[-1] == 0:
+            raise ValueError("corrupt num limbs")
+        return cls._from_limbs(limbs, bool(negative), chunksize)
+
+
+    def __reduce__(self) -> tuple:
+        """
+        Pickles the number in the binary format, which also covers memory-mapped numbers.
+
+        Returns:
+            tuple: The reconstructor and its arguments.
+        """
+        return num.from_bytes, (self.to_bytes(),)
+
+
+    def _coerce(self, sec_num: "num | int | float") -> "num":
+        """
+        Converts an operand into a `num` with the same chunksize as this number.
+
+        Args:
+            sec_num (num | int | float): The operand to convert.
+
+        Returns:
+            num: A `num` instance that shares the limb base of `self`.
+        """
+        if isinstance(sec_num, num):
+            if sec_num.chunksize == self.chunksize:
+                return sec_num
+            # Different limb bases have to be re-split from the decimal digits
+            return num(str(sec_num), self.chunksize)
+        return num(_integral(sec_num), self.chunksize)
+
+
+    @property
+    def digits(self) -> int:
+        """
+        Returns the total number of decimal digits of the number.
+
+        Returns:
+            int: The number of digits, without the sign.
+        """
+        return (len(self.limbs) - 1) * self.chunksize + len(str(self.limbs[-1]))
+
+
+    def add(self, sec_num: "num") -> "num":
+        """
+        Adds the current `num` object with another `num` object (`sec_num`).
+
+        Args:
+            sec_num (num): The second number to add.
+
+        Returns:
+            num: A new `num` instance representing the sum of the two numbers.
+        """
+        # Add the magnitudes into a copy of `self`, the result has the same sign as `self`
+        limbs = _copy_limbs(self.limbs)
+        _iadd_limbs(limbs, sec_num.limbs, self.chunkbase)
+        return num._from_limbs(limbs, self.negative, self.chunksize)
 
 
     def sub(self, sec_num: "num") -> "num":
@@ -92,77 +1711,119 @@ class num():
         Returns:
             num: A new `num` instance representing the result of the subtraction.
         """
+        # Subtract the magnitudes in a copy of `self`, the sign flips if `sec_num` was larger
+        limbs = _copy_limbs(self.limbs)
+        flipped = _isub_limbs(limbs, sec_num.limbs, self.chunkbase)
+        return num._from_limbs(limbs, self.negative != flipped, self.chunksize)
 
-        # Determine which number is larger for subtraction (taking sign into account)
-        is_self_larger = self.segments > sec_num.segments if self.segments != sec_num.segments else not self.negative
 
-        # Set the larger and smaller number
-        larger, smaller = (self, sec_num) if is_self_larger else (sec_num, self)
-        result_negative = self.negative if is_self_larger else not self.negative
+    @staticmethod
+    def sum(values, chunksize: int | None = None) -> "num":
+        """
+        Adds many numbers with a single carry pass.
 
-        # Pad the smaller number's segments with zeros to match the larger number's length
-        diff = len(larger.segments) - len(smaller.segments)
-        smaller_segments = ["0"] * diff + smaller.segments
+        The limbs of the positive and of the negative terms are added column by column
+        without carrying, each column sum is carried once and the two totals are subtracted.
 
-        # Prepare for the result calculation
-        result_segments = []  # This will hold the segments of the result
-        borrow = 0  # Variable to track borrow during subtraction
+        Args:
+            values: An iterable of `num`, int or float values.
+            chunksize (int | None): The chunksize of the result, by default that of the first `num`.
 
-        # Loop through each segment from least significant to most significant
-        for x, y in zip(reversed(larger.segments), reversed(smaller_segments)):
-            # Apply the borrow from the previous iteration
-            x_val = int(x) - borrow
-            y_val = int(y)
+        Returns:
+            num: The sum of all values, zero for no values.
+        """
+        values = list(values)
+        if chunksize is None:
+            chunksize = next((value.chunksize for value in values if isinstance(value, num)), 10)
+        template = num(0, chunksize)
+
+        # Unreduced column sums of the positive and the negative terms
+        columns = ([], [])
+        for value in values:
+            value = template._coerce(value)
+            column = columns[value.negative]
+            if len(column) < len(value.limbs):
+                column.extend([0] * (len(value.limbs) - len(column)))
+            column[:len(value.limbs)] = map(int.__add__, column, value.limbs)
+
+        positive = _carry(columns[False], template.chunkbase)
+        negative = _carry(columns[True], template.chunkbase)
+        if _cmp_limbs(positive, negative) >= 0:
+            return num._from_limbs(_sub_limbs(positive, negative, template.chunkbase), False, chunksize)
+        return num._from_limbs(_sub_limbs(negative, positive, template.chunkbase), True, chunksize)
+
+
+    def _operand(self, sec_num: "num | int | float") -> tuple:
+        """
+        Returns the limbs and the sign of an operand of an addition or subtraction.
 
-            # If the current segment of larger is smaller than the smaller segment, borrow
-            if x_val < y_val:
-                borrow = 1
-                x_val += self.chunkbase  # Borrow means we need to add the base to the current segment value
-            else:
-                borrow = 0
+        Integers below the limb base are used as a single limb without creating a `num`.
 
-            # Subtract the smaller segment from the larger segment and add to result
-            result_segments.append(str(x_val - y_val))
+        Args:
+            sec_num (num | int | float): The operand.
 
-        # Reverse the result segments to get them in correct order
-        result_segments.reverse()
+        Returns:
+            tuple: The limbs and whether the operand is negative.
+        """
+        if isinstance(sec_num, int) and -self.chunkbase < sec_num < self.chunkbase:
+            return (abs(sec_num),), sec_num < 0
+        sec_num = self._coerce(sec_num)
+        return sec_num.limbs, sec_num.negative
 
-        # Remove leading zeros from the result
-        while len(result_segments) > 1 and result_segments[0] == "0":
-            result_segments.pop(0)
 
-        # Create a new `num` object for the result
-        ret = num(0)
-        ret.segments = result_segments
-        ret.negative = result_negative  # Set the sign of the result
-        return ret
+    def _accumulate(self, limbs: array, sec_num: "num | int | float", subtract: bool) -> bool:
+        """
+        Adds or subtracts an operand into `limbs`, which hold the magnitude of `self`.
+
+        Args:
+            limbs (array): The buffer to update in place, either `self.limbs` or a copy.
+            sec_num (num | int | float): The operand.
+            subtract (bool): Whether to subtract the operand instead of adding it.
+
+        Returns:
+            bool: Whether the result is negative.
+        """
+        other, other_negative = self._operand(sec_num)
+
+        # Same signs add the magnitudes, different signs subtract them
+        if self.negative == (other_negative != subtract):
+            _iadd_limbs(limbs, other, self.chunkbase)
+            return self.negative
+        flipped = _isub_limbs(limbs, other, self.chunkbase)
+        return self.negative != flipped and (len(limbs) > 1 or limbs[0] != 0)
+
+
+    def _writable(self) -> array:
+        """
+        Returns the limb buffer for an in-place update, copying a shared buffer first.
+
+        Returns:
+            array: The own limbs of `self`.
+        """
+        if not isinstance(self.limbs, array):
+            self.limbs = _copy_limbs(self.limbs)
+        return self.limbs
 
 
     def __add__(self, sec_num: "num | int | float") -> "num":
         """
         Adds the current `num` object with another `num` object, or an integer or float.
 
+        The operands are left untouched, the sum is built in a single new limb buffer.
+
         Args:
             sec_num (num | int | float): The number to add.
 
         Returns:
             num: A new `num` instance representing the sum of the two numbers.
         """
-        # If sec_num is not a num instance, convert it to a num instance
-        if not isinstance(sec_num, num):
-            sec_num = num(int(sec_num))  # Convert sec_num to a `num` instance
-
-        # Case 1: Both numbers have the same sign (either both positive or both negative)
-        if self.negative == sec_num.negative:
-            return self.add(sec_num)  # Perform addition using the add method
-
-        # Case 2: self is negative, and sec_num is positive
-        elif self.negative:
-            return sec_num.sub(self)  # Subtract self from sec_num (reverse subtraction)
+        # Leave unknown operand types to their own reflected operator
+        if not isinstance(sec_num, (num, int, float)):
+            return NotImplemented
 
-        # Case 3: self is positive, and sec_num is negative
-        else:
-            return self.sub(sec_num)  # Subtract sec_num from self
+        limbs = _copy_limbs(self.limbs)
+        negative = self._accumulate(limbs, sec_num, False)
+        return num._from_limbs(limbs, negative, self.chunksize)
 
 
     def __radd__(self, sec_num: "num | int | float") -> "num":
@@ -181,20 +1842,73 @@ class num():
         return self + sec_num  # Simply call __add__ to handle the addition
 
 
+    def __iadd__(self, sec_num: "num | int | float") -> "num":
+        """
+        Adds another number to this one, growing the existing limb buffer when possible.
+
+        The buffer is only reused while nothing but the updated name refers to this `num`.
+        Shared numbers (other names, dict keys, set members) are left untouched and a new
+        `num` is returned, so `num` keeps the value semantics of `int`.
+
+        Args:
+            sec_num (num | int | float): The number to add.
+
+        Returns:
+            num: `self` holding the sum, or a new `num` for shared numbers.
+        """
+        if not isinstance(sec_num, (num, int, float)):
+            return NotImplemented
+        if _EXCLUSIVE_REFCOUNT is None or sys.getrefcount(self) > _EXCLUSIVE_REFCOUNT:
+            return self + sec_num
+
+        self.negative = self._accumulate(self._writable(), sec_num, False)
+        self._hash = None
+        return self
+
+
     def __sub__(self, sec_num: "num | int | float") -> "num":
         """
         Subtracts another `num` object (or integer or float) from the current `num` object.
 
+        The operands are left untouched, the difference is built in a single new limb buffer.
+
         Args:
             sec_num (num | int | float): The number to subtract.
 
         Returns:
             num: A new `num` instance representing the result of the subtraction.
         """
-        # Subtract sec_num from self by adding the negative of sec_num
-        return self + (-sec_num)  # Use the __add__ method by negating sec_num
-    
-    
+        # Leave unknown operand types to their own reflected operator
+        if not isinstance(sec_num, (num, int, float)):
+            return NotImplemented
+
+        limbs = _copy_limbs(self.limbs)
+        negative = self._accumulate(limbs, sec_num, True)
+        return num._from_limbs(limbs, negative, self.chunksize)
+
+
+    def __isub__(self, sec_num: "num | int | float") -> "num":
+        """
+        Subtracts another number from this one, reusing the existing limb buffer when possible.
+
+        Like `__iadd__`, shared numbers are left untouched and a new `num` is returned.
+
+        Args:
+            sec_num (num | int | float): The number to subtract.
+
+        Returns:
+            num: `self` holding the difference, or a new `num` for shared numbers.
+        """
+        if not isinstance(sec_num, (num, int, float)):
+            return NotImplemented
+        if _EXCLUSIVE_REFCOUNT is None or sys.getrefcount(self) > _EXCLUSIVE_REFCOUNT:
+            return self - sec_num
+
+        self.negative = self._accumulate(self._writable(), sec_num, True)
+        self._hash = None
+        return self
+
+
     def __mul__(self, sec_num: "num | int | float") -> "num":
         """
         Multiplies the current `num` object with another `num` object, or an integer or float.
@@ -205,224 +1919,479 @@ class num():
         Returns:
             num: A new `num` instance representing the product of the two numbers.
         """
+        # Leave unknown operand types to their own reflected operator
+        if not isinstance(sec_num, (num, int, float)):
+            return NotImplemented
+
         # Convert sec_num to a num instance if it is not already a num
-        if not isinstance(sec_num, num):
-            sec_num = num(int(sec_num))  # Convert sec_num to a `num` instance
-
-        # Prepare the result storage. The result will have at most len(self.segments) + len(sec_num.segments) segments
-        result_segments = [0] * (len(self.segments) + len(sec_num.segments))
-
-        # Multiply each segment of `self` with each segment of `sec_num`
-        for i, x in enumerate(reversed(self.segments)):
-            for j, y in enumerate(reversed(sec_num.segments)):
-                product = int(x) * int(y) + result_segments[i + j]  # Multiply and add any existing value
-                result_segments[i + j] = product % self.chunkbase  # Current segment value (modulo base)
-                result_segments[i + j + 1] += product // self.chunkbase  # Carry to next segment (integer division)
-
-        # Remove leading zeros from the result
-        while len(result_segments) > 1 and result_segments[-1] == 0:
-            result_segments.pop()
-
-        # Reverse the result segments and convert them to strings
-        result_segments = list(map(str, reversed(result_segments)))
-
-        # Add leading zeros to each segment to ensure they match the chunk size (self.chunksize)
-        for i, el in enumerate(result_segments):
-            # Pad each segment to match the chunksize by adding leading zeros
-            for _ in range(self.chunksize - len(el)):
-                result_segments[i] = "0" + result_segments[i]
-
-        # Remove leading zeros from the final result
-        result_segments[0] = result_segments[0].lstrip("0") or "0"
-
-        # Determine the sign of the result
-        result_negative = self.negative != sec_num.negative  # Result is negative if signs differ
-
-        # Create a new `num` instance for the result
-        ret = num(0)
-        ret.segments = result_segments
-        ret.negative = result_negative  # Set the correct sign for the result
-        return ret
-    
+        sec_num = self._coerce(sec_num)
+
+        # Multiply the magnitudes, the algorithm is chosen by the operand length
+        limbs = _mul_limbs(self.limbs, sec_num.limbs, self.chunkbase)
+
+        # Result is negative if signs differ
+        return num._from_limbs(limbs, self.negative != sec_num.negative, self.chunksize)
+
+
+    @staticmethod
+    def prod(values, chunksize: int | None = None) -> "num":
+        """
+        Multiplies many numbers along a balanced product tree.
+
+        Folding the values from left to right multiplies an ever growing product by
+        small factors, the tree keeps both operands of every multiplication balanced.
+
+        Args:
+            values: An iterable of `num`, int or float values.
+            chunksize (int | None): The chunksize of the result, by default that of the first `num`.
+
+        Returns:
+            num: The product of all values, one for no values.
+        """
+        values = list(values)
+        if chunksize is None:
+            chunksize = next((value.chunksize for value in values if isinstance(value, num)), 10)
+        template = num(0, chunksize)
+
+        factors, negative = [], False
+        for value in values:
+            value = template._coerce(value)
+            if not value:
+                return num(0, chunksize)
+            factors.append(list(value.limbs))
+            negative ^= value.negative
+
+        return num._from_limbs(_product_tree(factors, template.chunkbase), negative, chunksize)
+
 
     def __truediv__(self, sec_num: "num | int | float") -> "num":
         """
-        Performs true division of the current `num` instance by another `num`, int, or float, 
-        using chunk-based arithmetic and ensuring the divisor is also segmented properly.
+        Performs true division of the current `num` instance by another `num`, int, or float.
+
+        The quotient is truncated towards zero, use `//` for floor division and
+        `fixed.fixed` for quotients with fractional digits.
 
         Args:
-        - sec_num (num | int | float): The divisor, which can be another `num` object, 
+        - sec_num (num | int | float): The divisor, which can be another `num` object,
                                     or an integer/float that will be converted to `num`.
 
         Returns:
         - num: The result of the division as a new `num` instance.
         """
         # Convert non-num inputs into a `num` object.
-        if not isinstance(sec_num, num):
-            sec_num = num(sec_num)
+        sec_num = self._coerce(sec_num)
 
         # Handle division by zero.
-        if sec_num == 0:
+        if not sec_num:
             raise ZeroDivisionError("Division by zero is not allowed.")
 
-        # Create a result `num` object and initialize its attributes.
-        result = num(0)
-        result.negative = self.negative != sec_num.negative  # Set the sign of the result.
+        # Divide the magnitudes and set the sign of the result.
+        quotient, _ = _divmod_limbs(self.limbs, sec_num.limbs, self.chunkbase)
+        return num._from_limbs(quotient, self.negative != sec_num.negative, self.chunksize)
 
-        # Result storage (in chunks).
-        chunk_result = []
-        remainder = 0
 
-        # Process the dividend chunk by chunk.
-        for chunk in self.segments:
-            # Bring down the next chunk, combining with any remainder from the previous step.
-            current_value = remainder * (10 ** self.chunksize) + int(chunk)
+    def __divmod__(self, sec_num: "num | int | float") -> tuple:
+        """
+        Computes the floored quotient and the remainder in a single division.
+
+        Like for Python integers, the quotient is rounded towards negative infinity and
+        the remainder takes the sign of the divisor.
+
+        Args:
+            sec_num (num | int | float): The divisor.
 
-            # Perform integer division for this chunk.
-            chunk_quotient = current_value // int("".join(sec_num.segments))
-            remainder = current_value % int("".join(sec_num.segments))
+        Returns:
+            tuple: The quotient and the remainder as `num` instances.
+        """
+        sec_num = self._coerce(sec_num)
 
-            # Convert the quotient back to a chunk, ensuring it respects chunk size.
-            chunk_result.append(f"{chunk_quotient:0{self.chunksize}d}")
+        # Handle division by zero
+        if not sec_num:
+            raise ZeroDivisionError("Division by zero is not allowed.")
 
-        # Clean up leading zeros from the result.
-        if int(chunk_result[0]) == 0:
-            chunk_result.remove(chunk_result[0])
-        chunk_result[0] = chunk_result[0].lstrip("0") or "0"
+        quotient, remainder = _divmod_limbs(self.limbs, sec_num.limbs, self.chunkbase)
+        negative = self.negative != sec_num.negative
 
-        # Assign the final result.
-        result.segments = chunk_result
+        # Floor a negative quotient with a remainder and move the remainder to the divisor's sign
+        if negative and remainder != [0]:
+            quotient = _add_limbs(quotient, [1], self.chunkbase)
+            remainder = _sub_limbs(sec_num.limbs, remainder, self.chunkbase)
 
-        return result
+        return (num._from_limbs(quotient, negative, self.chunksize),
+                num._from_limbs(remainder, sec_num.negative, self.chunksize))
 
-    def __round__(self, ndigits: int = 0) -> str:
+
+    def __floordiv__(self, sec_num: "num | int | float") -> "num":
         """
-        Round the number to the nearest integer or specified number of digits.
+        Performs floor division of the current `num` instance by another number.
+
+        Args:
+            sec_num (num | int | float): The divisor.
+
+        Returns:
+            num: The quotient, rounded towards negative infinity.
+        """
+        return divmod(self, sec_num)[0]
+
+
+    def __mod__(self, sec_num: "num | int | float") -> "num":
+        """
+        Computes the remainder of the floor division by another number.
+
+        Args:
+            sec_num (num | int | float): The divisor.
 
-        Parameters:
-        - ndigits: Number of digits to round to (default is 0, rounding to the nearest integer).
-        
         Returns:
-        - A string representation of the rounded number, possibly in scientific notation.
+            num: The remainder, with the sign of the divisor.
         """
-        rep = ""
+        return divmod(self, sec_num)[1]
 
-        # Handle negative numbers
-        if self.negative:
-            rep = "-"
 
-        # The first segment is the integer part
-        rep += self.segments[0]
+    def __pow__(self, exponent: "num | int", modulus: "num | int | None" = None) -> "num":
+        """
+        Raises the number to a non-negative integer power, optionally modulo `modulus`.
 
-        # If there's more than one segment, we need to check rounding
-        if len(self.segments) > 1:
-            # Check the first digit of the second segment to decide rounding
-            if int(self.segments[1][0]) >= 5:
-                # Round up the first segment if the first digit of the next segment is >= 5
-                rep = str(int(rep) + 1)
+        The exponent is scanned with a sliding window (see `_sliding_window_pow`), so
+        only one multiplication by a precomputed odd power is needed per window and all
+        other steps take the fast squaring path. With a modulus every intermediate
+        result is reduced, so the values never grow beyond the modulus.
 
-        # If we have multiple segments, add scientific notation
-        if len(self.segments) > 1:
-            rep += "e"
+        Args:
+            exponent (num | int): The non-negative exponent.
+            modulus (num | int | None): The optional modulus, like the third argument of `pow`.
 
-            # Calculate the exponent as the number of digits in the other segments
-            exponent = (len(self.segments) - 1) * self.chunksize
-            rep += str(exponent)
+        Returns:
+            num: The power, with the sign of the modulus if one is given.
+        """
+        exponent = int(exponent)
+        if exponent < 0:
+            raise ValueError("num only supports non-negative exponents.")
+
+        if modulus is not None:
+            modulus = self._coerce(modulus)
+            if not modulus:
+                raise ValueError("pow() 3rd argument cannot be 0.")
+            reduce = lambda value: value % modulus
+        else:
+            reduce = lambda value: value
 
-        return rep
+        one = reduce(num(1, self.chunksize))
+        return _sliding_window_pow(reduce(self), exponent, one, lambda x, y: reduce(x * y))
 
 
-    def __ceil__(self) -> str:
+    def _nonzero_below(self, k: int) -> bool:
         """
-        Return the smallest integer greater than or equal to the number.
+        Checks whether any digit after the `k` most significant digits is non-zero.
 
-        Always rounds up the first segment of the number.
+        The limbs are scanned from the top down and the scan stops at the first
+        non-zero limb, which for all but exact values is right at the start.
+
+        Args:
+            k (int): The number of leading digits to skip.
 
         Returns:
-        - A string representation of the number rounded up, possibly in scientific notation.
+            bool: Whether the remaining digits are not all zero.
         """
-        rep = ""
+        rest = self.digits - k
+        if rest <= 0:
+            return False
+        index, partial = divmod(rest, self.chunksize)
+        if partial and self.limbs[index] % 10**partial:
+            return True
+        return any(self.limbs[i] for i in range(index - 1, -1, -1))
 
-        # Handle negative numbers
-        if self.negative:
-            rep = "-"
 
-        # The first segment is the integer part
-        rep += self.segments[0]
+    def _significand(self, precision: int, mode: str) -> tuple:
+        """
+        Rounds the magnitude to `precision` significant digits, reading only the top limbs.
 
-        # Always round up if there's more than one segment
-        if len(self.segments) > 1:
-            # Increment the integer part to round up
-            rep = str(int(rep) + 1)
+        Args:
+            precision (int): The number of significant digits, at least 1.
+            mode (str): "down" (towards zero), "up" (away from zero) or "half_even".
 
-        # If we have multiple segments, add scientific notation
-        if len(self.segments) > 1:
-            rep += "e"
+        Returns:
+            tuple: The mantissa digits and the exponent of the rounded magnitude `mantissa * 10**exponent`.
+                   The mantissa has `precision` digits, or all digits of shorter numbers.
+        """
+        digits = self.digits
+        if digits <= precision:
+            return self.leading_digits(digits), 0
+
+        leading = self.leading_digits(precision + 1)
+        mantissa, next_digit = leading[:-1], leading[-1]
+        if mode == "up":
+            round_up = next_digit != "0" or self._nonzero_below(precision + 1)
+        elif mode == "half_even":
+            # A five with nothing behind it is a tie, which rounds to the even mantissa
+            round_up = next_digit > "5" or next_digit == "5" and (
+                int(mantissa[-1]) % 2 == 1 or self._nonzero_below(precision + 1))
+        else:
+            round_up = False
+
+        exponent = digits - precision
+        if round_up:
+            # Increment the digit string, rounding up 99...9 carries into a new digit
+            stripped = mantissa.rstrip("9")
+            if stripped:
+                mantissa = stripped[:-1] + str(int(stripped[-1]) + 1) + "0" * (precision - len(stripped))
+            else:
+                mantissa, exponent = "1" + "0" * (precision - 1), exponent + 1
+        return mantissa, exponent
+
+
+    def _summary(self, precision: int, mode: str) -> str:
+        """
+        Writes the number rounded to `precision` significant digits as `<mantissa>e<exponent>`.
+
+        Args:
+            precision (int): The number of significant digits.
+            mode (str): The rounding of the magnitude, see `_significand`.
+
+        Returns:
+            str: The integer mantissa with the sign, followed by the exponent unless it is zero.
+        """
+        mantissa, exponent = self._significand(precision, mode)
+        rep = f"{'-' if self.negative else ''}{mantissa}"
+        return f"{rep}e{exponent}" if exponent else rep
+
+
+    def __round__(self, ndigits: int | None = None) -> str:
+        """
+        Rounds the number to a number of significant digits, half to even.
 
-            # Calculate the exponent as the number of digits in the other segments
-            exponent = (len(self.segments) - 1) * self.chunksize
-            rep += str(exponent)
+        Only the top limbs are read, so this is a cheap summary of numbers of any size.
 
-        return rep
+        Args:
+            ndigits (int | None): The number of significant digits, `chunksize` for `None` or 0 (the old default).
+
+        Returns:
+            str: The rounded number as `<mantissa>e<exponent>`, numbers that fit are written in full.
+        """
+        if ndigits is not None and ndigits < 0:
+            raise ValueError("round() needs a non-negative number of significant digits")
+        return self._summary(ndigits or self.chunksize, "half_even")
+
+
+    def __ceil__(self) -> str:
+        """
+        Rounds the number up to `chunksize` significant digits.
+
+        Returns:
+            str: The smallest `<mantissa>e<exponent>` with that many digits that is not below the number.
+        """
+        return self._summary(self.chunksize, "down" if self.negative else "up")
 
 
     def __floor__(self) -> str:
         """
-        Return the largest integer less than or equal to the number.
+        Rounds the number down to `chunksize` significant digits.
 
-        In this case, it simply returns the integer part as is, without rounding up.
+        Returns:
+            str: The largest `<mantissa>e<exponent>` with that many digits that is not above the number.
+        """
+        return self._summary(self.chunksize, "up" if self.negative else "down")
+
+
+    def scale10(self, k: int) -> "num":
+        """
+        Multiplies the number by `10**k` in linear time.
+
+        Whole limbs are shifted in as zeros, the remaining `k % chunksize` digits cost one
+        pass multiplying every limb by a small power of ten.
+
+        Args:
+            k (int): The non-negative number of decimal places.
 
         Returns:
-        - A string representation of the number rounded down (or truncated), possibly in scientific notation.
+            num: The scaled number.
         """
-        rep = ""
+        if k < 0:
+            raise ValueError("scale10() needs a non-negative shift")
+        if not self:
+            return num(0, self.chunksize)
+
+        whole, digits = divmod(k, self.chunksize)
+        limbs = array("Q", bytes(8 * whole))
+        limbs.extend(_mul_small(self.limbs, 10**digits, self.chunkbase) if digits else self.limbs)
+        return num._from_limbs(limbs, self.negative, self.chunksize)
 
-        # Handle negative numbers
-        if self.negative:
-            rep = "-"
 
-        # The first segment is the integer part
-        rep += self.segments[0]
+    def shift_right10(self, k: int) -> "num":
+        """
+        Floor-divides the number by `10**k` in linear time.
 
-        # If we have multiple segments, add scientific notation
-        if len(self.segments) > 1:
-            rep += "e"
+        Whole limbs are dropped, the remaining `k % chunksize` digits cost one pass dividing
+        every limb by a small power of ten. Like `>>` the result is rounded towards negative
+        infinity, which truncates non-negative numbers.
 
-            # Calculate the exponent as the number of digits in the other segments
-            exponent = (len(self.segments) - 1) * self.chunksize
-            rep += str(exponent)
+        Args:
+            k (int): The non-negative number of decimal places.
 
-        return rep
-    
-    
-    def __and__(self, sec_num: "num | int | float") -> bool:
+        Returns:
+            num: The shifted number.
         """
-        Perform a logical AND operation between two `num` objects.
+        if k < 0:
+            raise ValueError("shift_right10() needs a non-negative shift")
+
+        whole, digits = divmod(k, self.chunksize)
+        limbs = self.limbs[whole:] or [0]
+        remainder = 0
+        if digits:
+            limbs, remainder = _divmod_small(limbs, 10**digits, self.chunkbase)
 
-        The result is True if both numbers are non-zero (truthy); False otherwise.
+        # Negative numbers round away from zero whenever a non-zero digit was dropped
+        if self.negative and (remainder or any(self.limbs[i] for i in range(min(whole, len(self.limbs))))):
+            limbs = _add_limbs(limbs, [1], self.chunkbase)
+        return num._from_limbs(list(limbs), self.negative, self.chunksize)
 
-        Parameters:
-        - sec_num: The second number to compare with.
+
+    def __lshift__(self, bits: "num | int") -> "num":
+        """
+        Shifts the number left by `bits` binary places, like `int`.
+
+        The limbs are decimal, so this multiplies by `2**bits`: in a single linear pass
+        up to `SMALL_SHIFT_BITS` bits and with the fast multiplication beyond.
+
+        Args:
+            bits (num | int): The non-negative shift count.
 
         Returns:
-        - True if both numbers are non-zero, False otherwise.
+            num: The number times `2**bits`.
         """
-        return bool(self) and bool(sec_num)
+        if not isinstance(bits, (num, int)):
+            return NotImplemented
+        bits = int(bits)
+        if bits < 0:
+            raise ValueError("negative shift count")
+        if bits <= SMALL_SHIFT_BITS:
+            limbs = _carry([limb << bits for limb in self.limbs], self.chunkbase)
+        else:
+            limbs = _mul_limbs(self.limbs, _int_to_limbs(1 << bits, self.chunkbase), self.chunkbase)
+        return num._from_limbs(limbs, self.negative, self.chunksize)
 
 
-    def __or__(self, sec_num: "num | int | float") -> bool:
+    def __rshift__(self, bits: "num | int") -> "num":
         """
-        Perform a logical OR operation between two `num` objects.
+        Shifts the number right by `bits` binary places, like `int`.
 
-        The result is True if at least one number is non-zero (truthy); False if both are zero.
+        This floor-divides by `2**bits`: in a single linear pass up to `SMALL_SHIFT_BITS`
+        bits and with the fast division beyond.
 
-        Parameters:
-        - sec_num: The second number to compare with.
+        Args:
+            bits (num | int): The non-negative shift count.
+
+        Returns:
+            num: The number divided by `2**bits`, rounded towards negative infinity.
+        """
+        if not isinstance(bits, (num, int)):
+            return NotImplemented
+        bits = int(bits)
+        if bits < 0:
+            raise ValueError("negative shift count")
+        if bits > SMALL_SHIFT_BITS:
+            return divmod(self, num(1 << bits, self.chunksize))[0]
+
+        limbs, remainder = _divmod_small(self.limbs, 1 << bits, self.chunkbase)
+        if self.negative and remainder:
+            limbs = _add_limbs(limbs, [1], self.chunkbase)
+        return num._from_limbs(limbs, self.negative, self.chunksize)
+
+
+    def _bitwise(self, sec_num: "num | int", operation) -> "num":
+        """
+        Applies a bitwise operation to the two's complement values of two numbers.
+
+        Bits only exist in binary, so both operands are converted to Python integers with
+        the divide and conquer conversion and the result is converted back.
+
+        Args:
+            sec_num (num | int): The second operand.
+            operation: The bitwise operation on two Python integers.
+
+        Returns:
+            num: The result, with the chunksize of `self`.
+        """
+        if not isinstance(sec_num, (num, int)):
+            return NotImplemented
+        return num(operation(int(self), int(sec_num)), self.chunksize)
+
+
+    def __and__(self, sec_num: "num | int") -> "num":
+        """
+        Computes the bitwise AND of two numbers, like `int`.
+
+        Args:
+            sec_num (num | int): The second operand.
+
+        Returns:
+            num: The bitwise AND.
+        """
+        return self._bitwise(sec_num, int.__and__)
+
+
+    def __rand__(self, sec_num: "num | int") -> "num":
+        """
+        Handles the bitwise AND with a `num` on the right side (e.g., `255 & num_instance`).
+
+        Args:
+            sec_num (num | int): The first operand.
+
+        Returns:
+            num: The bitwise AND.
+        """
+        return self._bitwise(sec_num, int.__and__)
+
+
+    def __or__(self, sec_num: "num | int") -> "num":
+        """
+        Computes the bitwise OR of two numbers, like `int`.
+
+        Args:
+            sec_num (num | int): The second operand.
+
+        Returns:
+            num: The bitwise OR.
+        """
+        return self._bitwise(sec_num, int.__or__)
+
+
+    def __ror__(self, sec_num: "num | int") -> "num":
+        """
+        Handles the bitwise OR with a `num` on the right side.
+
+        Args:
+            sec_num (num | int): The first operand.
+
+        Returns:
+            num: The bitwise OR.
+        """
+        return self._bitwise(sec_num, int.__or__)
+
+
+    def __xor__(self, sec_num: "num | int") -> "num":
+        """
+        Computes the bitwise exclusive OR of two numbers, like `int`.
+
+        Args:
+            sec_num (num | int): The second operand.
+
+        Returns:
+            num: The bitwise XOR.
+        """
+        return self._bitwise(sec_num, int.__xor__)
+
+
+    def __rxor__(self, sec_num: "num | int") -> "num":
+        """
+        Handles the bitwise exclusive OR with a `num` on the right side.
+
+        Args:
+            sec_num (num | int): The first operand.
 
         Returns:
-        - True if at least one number is non-zero, False if both are zero.
+            num: The bitwise XOR.
         """
-        return bool(self) or bool(sec_num)
+        return self._bitwise(sec_num, int.__xor__)
 
 
     def __bool__(self) -> bool:
@@ -434,7 +2403,7 @@ class num():
         Returns:
         - True if the number is non-zero, False if the number is zero.
         """
-        return self.__ne__(0)
+        return len(self.limbs) > 1 or self.limbs[0] != 0
 
 
     def __neg__(self) -> "num":
@@ -446,11 +2415,8 @@ class num():
         Returns:
         - A new `num` object that is the negation of the current number.
         """
-        ret = num(0)  # Create a new num instance for the result
-        ret.segments = self.segments  # Copy the segments of the original number
-        ret.negative = not self.negative  # Flip the negative flag
-        
-        return ret
+        # Copy the limbs of the original number and flip the negative flag
+        return num._from_limbs(_copy_limbs(self.limbs), not self.negative, self.chunksize)
 
 
     def __pos__(self) -> "num":
@@ -462,11 +2428,8 @@ class num():
         Returns:
         - A new `num` object that is the positive version of the current number.
         """
-        ret = num(0)  # Create a new num instance for the result
-        ret.segments = self.segments  # Copy the segments of the original number
-        ret.negative = self.negative  # Maintain the same negative flag
-        
-        return ret
+        # Copy the limbs of the original number and maintain the same negative flag
+        return num._from_limbs(_copy_limbs(self.limbs), self.negative, self.chunksize)
 
 
     def __abs__(self) -> "num":
@@ -478,13 +2441,71 @@ class num():
         Returns:
         - A new `num` object that represents the absolute value of the current number.
         """
-        ret = num(0)  # Create a new num instance for the result
-        ret.segments = self.segments  # Copy the segments of the original number
-        ret.negative = False  # Set negative flag to False to represent the absolute value
-        
-        return ret
-    
-    
+        # Copy the limbs of the original number and clear the negative flag
+        return num._from_limbs(_copy_limbs(self.limbs), False, self.chunksize)
+
+
+    def _compare(self, sec_num: "num | int | float") -> "int | float":
+        """
+        Compares this number with another one in a single pass.
+
+        The signs and the limb counts decide most comparisons without looking at any
+        limb, only numbers of equal sign and length are compared limb by limb,
+        starting at the most significant one.
+
+        Args:
+            sec_num (num | int | float): The number to compare with.
+
+        Returns:
+            int | float: 1 if `self` is larger, -1 if it is smaller and 0 if both are equal.
+            NaN is unordered, comparing with it returns `math.nan`, so that every comparison
+            of the result with 0 is false, as for Python integers.
+        """
+        if isinstance(sec_num, float):
+            if math.isnan(sec_num):
+                return math.nan
+
+            # Every number lies between the infinities
+            if math.isinf(sec_num):
+                return -1 if sec_num > 0 else 1
+
+            # Compare against the integer part, a fractional part breaks ties
+            whole = int(sec_num)
+            order = self._compare(whole)
+            return order if order or sec_num == whole else (1 if sec_num < whole else -1)
+
+        other, other_negative = self._operand(sec_num)
+
+        # Different signs decide right away
+        if self.negative != other_negative:
+            return -1 if self.negative else 1
+
+        # A larger magnitude is smaller for negative numbers
+        order = _cmp_limbs(self.limbs, other)
+        return -order if self.negative else order
+
+
+    def __hash__(self) -> int:
+        """
+        Returns the hash of the number, equal to the hash of the same Python integer.
+
+        The hash is reduced limb by limb modulo the hash modulus of Python integers
+        and cached. Numbers used as dict keys or set members are shared, so the in-place
+        operators never change them and the cached hash stays valid.
+
+        Returns:
+            int: The hash value.
+        """
+        if self._hash is None:
+            value = 0
+            for i in range(len(self.limbs) - 1, -1, -1):
+                value = (value * self.chunkbase + self.limbs[i]) % _HASH_MODULUS
+            if self.negative:
+                value = -value
+            self._hash = -2 if value == -1 else value
+        return self._hash
+
+
     def __eq__(self, sec_num: "num | int | float") -> bool:
         """
         Check if the current number is equal to another `num`, `int`, or `float`.
@@ -495,168 +2516,317 @@ class num():
         Returns:
         - True if the numbers are equal, otherwise False.
         """
-        # If sec_num is another num object
-        if isinstance(sec_num, num):
-            return (self.segments == sec_num.segments) and (self.negative == sec_num.negative)
-        
-        # If sec_num is an int or float, convert it to a string and compare
-        elif isinstance(sec_num, int) or isinstance(sec_num, float):
-            # Check if the sign of sec_num matches with self.negative
-            if not ((sec_num < 0) == self.negative):
-                return False
-            
-            # Convert sec_num to string and compare it with self (as a string)
-            sec_num_str = str(sec_num)
-            return str(self) == sec_num_str
-        
         # If sec_num is not a supported type
-        else:
+        if not isinstance(sec_num, (num, int, float)):
             return NotImplemented
 
+        # Equal numbers share their sign and limb count, the limbs are compared at C speed
+        if isinstance(sec_num, num) and sec_num.chunksize == self.chunksize:
+            return (self.negative == sec_num.negative and len(self.limbs) == len(sec_num.limbs)
+                    and self.limbs == sec_num.limbs)
+        return self._compare(sec_num) == 0
+
 
-    def __gt__(self, sec_num: "num") -> bool:
+    def __gt__(self, sec_num: "num | int | float") -> bool:
         """
         Check if the current number is greater than another `num`.
 
         Parameters:
-        - sec_num: The second number to compare with, which must be a `num` object.
+        - sec_num: The second number to compare with, a `num`, `int` or `float`.
 
         Returns:
         - True if the current number is greater than `sec_num`, otherwise False.
         """
-        # If sec_num is another num object
-        if isinstance(sec_num, num):
-            # Check if the numbers are equal
-            if self.__eq__(sec_num):
-                return False
-            
-            # If the signs differ, the positive number is greater
-            if self.negative != sec_num.negative:
-                return sec_num.negative
-            
-            # Compare the number of digits (length of the segments)
-            if self.digits > sec_num.digits:
-                return True
-            elif sec_num.digits > self.digits:
-                return False
-            
-            # Compare each segment from the most significant
-            for seg1, seg2 in zip(self.segments, sec_num.segments):
-                for char1, char2 in zip(seg1, seg2):
-                    # Compare each character and return the result
-                    if char1 != char2:
-                        return char1 > char2
-
-        # If sec_num is not a num object, convert it to a num and compare
-        sec_num = int(sec_num)  # Convert sec_num to an integer for comparison
-        return self.__gt__(num(sec_num))
-
-
-    def __ne__(self, sec_num: "num") -> bool:
+        if not isinstance(sec_num, (num, int, float)):
+            return NotImplemented
+        return self._compare(sec_num) > 0
+
+
+    def __ne__(self, sec_num: "num | int | float") -> bool:
         """
         Check if the current number is not equal to another `num`.
 
         Parameters:
-        - sec_num: The second number to compare with, which must be a `num` object.
+        - sec_num: The second number to compare with, a `num`, `int` or `float`.
 
         Returns:
         - True if the numbers are not equal, otherwise False.
         """
-        return not self.__eq__(sec_num)
+        equal = self.__eq__(sec_num)
+        return equal if equal is NotImplemented else not equal
 
 
-    def __lt__(self, sec_num: "num") -> bool:
+    def __lt__(self, sec_num: "num | int | float") -> bool:
         """
         Check if the current number is less than another `num`.
 
         Parameters:
-        - sec_num: The second number to compare with, which must be a `num` object.
+        - sec_num: The second number to compare with, a `num`, `int` or `float`.
 
         Returns:
         - True if the current number is less than `sec_num`, otherwise False.
         """
-        return not self.__eq__(sec_num) and not self.__gt__(sec_num)
+        if not isinstance(sec_num, (num, int, float)):
+            return NotImplemented
+        return self._compare(sec_num) < 0
 
 
-    def __ge__(self, sec_num: "num") -> bool:
+    def __ge__(self, sec_num: "num | int | float") -> bool:
         """
         Check if the current number is greater than or equal to another `num`.
 
         Parameters:
-        - sec_num: The second number to compare with, which must be a `num` object.
+        - sec_num: The second number to compare with, a `num`, `int` or `float`.
 
         Returns:
         - True if the current number is greater than or equal to `sec_num`, otherwise False.
         """
-        return self.__eq__(sec_num) or self.__gt__(sec_num)
+        if not isinstance(sec_num, (num, int, float)):
+            return NotImplemented
+        return self._compare(sec_num) >= 0
 
 
-    def __le__(self, sec_num: "num") -> bool:
+    def __le__(self, sec_num: "num | int | float") -> bool:
         """
         Check if the current number is less than or equal to another `num`.
 
         Parameters:
-        - sec_num: The second number to compare with, which must be a `num` object.
+        - sec_num: The second number to compare with, a `num`, `int` or `float`.
 
         Returns:
         - True if the current number is less than or equal to `sec_num`, otherwise False.
         """
-        return self.__eq__(sec_num) or self.__lt__(sec_num)
-    
-    
+        if not isinstance(sec_num, (num, int, float)):
+            return NotImplemented
+        return self._compare(sec_num) <= 0
+
+
     def __str__(self) -> str:
         """
         Returns a human-readable string representation of the number.
 
         If the number is negative, a minus sign is prefixed.
-        The segments are concatenated to form the full number.
+        The segments are zero-padded and joined in a single pass to form the full number.
 
         Returns:
         - A string representation of the number.
         """
-        rep = ""  # Initialize an empty string for the result.
-        
-        # If the number is negative, add a minus sign.
-        if self.negative:
-            rep = "-"
-        
-        # Append each segment to the result string.
-        for i in range(len(self.segments)):
-            rep += self.segments[i]
-        
-        return rep  # Return the complete string representation of the number.
+        limbs = self.limbs
+        width = self.chunksize
+
+        # The most significant segment is written without padding, all others are zero-padded.
+        parts = ["-" if self.negative else "", str(limbs[-1])]
+        parts.extend([f"{limbs[i]:0{width}d}" for i in range(len(limbs) - 2, -1, -1)])
+
+        return "".join(parts)  # Return the complete string representation of the number.
+
+
+    def __format__(self, format_spec: str) -> str:
+        """
+        Formats the number like an `int`, with the `d`, `n`, `e`, `E`, `g` and `G` types.
+
+        Fill, alignment, sign, width, zero padding and the `,` and `_` separators follow
+        the format specification mini-language. The scientific types round half to even
+        and read only the top limbs and the length of the number, so summarizing a huge
+        number never converts all of its digits.
+
+        Args:
+            format_spec (str): The format specification.
+
+        Returns:
+            str: The formatted number.
+        """
+        match = _FORMAT_SPEC.fullmatch(format_spec)
+        if match is None:
+            raise ValueError(f"Invalid format specifier '{format_spec}' for object of type 'num'")
+        spec = match.groupdict()
+        kind = spec["type"]
+        precision = None if spec["precision"] is None else int(spec["precision"])
+        if precision is not None and kind in "dn":
+            raise ValueError("Precision not allowed in integer format specifier")
+
+        if kind in "dn":
+            body, tail = str(abs(self)), ""
+        elif kind in "eE":
+            body, tail = self._format_scientific(6 if precision is None else precision, spec["alt"], kind)
+        else:
+            body, tail = self._format_general(6 if precision is None else max(precision, 1), spec["alt"], kind)
+
+        sign = "-" if self.negative else "" if spec["sign"] in (None, "-") else spec["sign"]
+        fill = spec["fill"] or ("0" if spec["zero"] and not spec["align"] else " ")
+        align = spec["align"] or ("=" if spec["zero"] else ">")
+        width = int(spec["width"] or 0)
+
+        # Zero padding after the sign extends the grouped integer digits like for `int`
+        separator = spec["grouping"]
+        if align == "=" and fill == "0" and separator:
+            while len(sign) + len(_group(body, separator)) + len(tail) < width:
+                body = "0" + body
+        if separator:
+            body = _group(body, separator)
+
+        padding = max(width - len(sign) - len(body) - len(tail), 0)
+        if align == "<":
+            return sign + body + tail + fill * padding
+        if align == "^":
+            return fill * (padding // 2) + sign + body + tail + fill * (padding - padding // 2)
+        if align == "=":
+            return sign + fill * padding + body + tail
+        return fill * padding + sign + body + tail
+
+
+    def _format_scientific(self, precision: int, alternate: str | None, kind: str) -> tuple:
+        """
+        Formats the magnitude in scientific notation with `precision` digits after the point.
+
+        Args:
+            precision (int): The number of digits after the decimal point.
+            alternate (str | None): "#" to keep the decimal point without fractional digits.
+            kind (str): "e" or "E".
+
+        Returns:
+            tuple: The integer part and the rest (fraction and exponent) of the formatted number.
+        """
+        digits, exponent = self._significand(precision + 1, "half_even")
+        exponent += len(digits) - 1
+        digits += "0" * (precision + 1 - len(digits))
+
+        fraction = "." + digits[1:] if precision or alternate else ""
+        return digits[0], f"{fraction}{kind}{exponent:+03d}"
+
+
+    def _format_general(self, precision: int, alternate: str | None, kind: str) -> tuple:
+        """
+        Formats the magnitude in general format with `precision` significant digits.
+
+        Numbers with at most `precision` digits are written in full, longer ones in
+        scientific notation without trailing zeros (unless `alternate` is set).
+
+        Args:
+            precision (int): The number of significant digits, at least 1.
+            alternate (str | None): "#" to keep the trailing zeros and the decimal point.
+            kind (str): "g" or "G".
+
+        Returns:
+            tuple: The integer part and the rest (fraction and exponent) of the formatted number.
+        """
+        if self.digits <= precision:
+            digits = str(abs(self))
+            if alternate:
+                return digits, "." + "0" * (precision - len(digits))
+            return digits, ""
+
+        marker = "E" if kind == "G" else "e"
+        head, tail = self._format_scientific(precision - 1, alternate, marker)
+        if not alternate:
+            fraction, _, exponent = tail.rpartition(marker)
+            tail = fraction.rstrip("0").rstrip(".") + marker + exponent
+        return head, tail
+
+
+    def iter_digits(self, chunk: int = DIGIT_CHUNK_SIZE):
+        """
+        Streams the decimal representation, most significant digits first.
+
+        Only one piece of about `chunk` digits exists at a time, so printing a huge
+        number does not need a second copy of it as one string. The pieces join to `str(self)`.
+
+        Args:
+            chunk (int): The number of digits per piece, rounded to whole limbs.
+
+        Yields:
+            str: Consecutive pieces of the decimal representation, the sign in the first one.
+        """
+        limbs = self.limbs
+        width = self.chunksize
+        yield ("-" if self.negative else "") + str(limbs[-1])
+
+        # Every following piece covers `step` zero-padded limbs
+        step = max(chunk // width, 1)
+        for top in range(len(limbs) - 1, 0, -step):
+            yield "".join([f"{limbs[i]:0{width}d}" for i in range(top - 1, max(top - step, 0) - 1, -1)])
+
+
+    def write_to(self, file, chunk: int = DIGIT_CHUNK_SIZE) -> int:
+        """
+        Writes the decimal representation to a text file piece by piece.
+
+        Args:
+            file: A writable text file object.
+            chunk (int): The number of digits written at once.
+
+        Returns:
+            int: The number of characters written.
+        """
+        written = 0
+        for piece in self.iter_digits(chunk):
+            file.write(piece)
+            written += len(piece)
+        return written
+
+
+    def leading_digits(self, k: int) -> str:
+        """
+        Returns the `k` most significant decimal digits, reading only the top limbs.
+
+        Args:
+            k (int): The number of digits.
+
+        Returns:
+            str: The leading digits without the sign, all digits if there are fewer than `k`.
+        """
+        if k < 0:
+            raise ValueError("k must be a non-negative integer")
+        limbs = self.limbs
+        width = self.chunksize
+
+        # The top limb holds at least one digit, the other limbs `width` digits each
+        stop = max(len(limbs) - 2 - -(-max(k - 1, 0) // width), -1)
+        parts = [str(limbs[-1])]
+        parts.extend([f"{limbs[i]:0{width}d}" for i in range(len(limbs) - 2, stop, -1)])
+        return "".join(parts)[:k]
+
+
+    def trailing_digits(self, k: int) -> str:
+        """
+        Returns the `k` least significant decimal digits, reading only the bottom limbs.
+
+        Args:
+            k (int): The number of digits.
+
+        Returns:
+            str: The trailing digits with their zeros, all digits if there are fewer than `k`.
+        """
+        if k < 0:
+            raise ValueError("k must be a non-negative integer")
+        if k >= self.digits:
+            return str(abs(self))
+        width = self.chunksize
+        count = -(-k // width)
+        return "".join([f"{self.limbs[i]:0{width}d}" for i in range(count - 1, -1, -1)])[count * width - k:]
+
+
+    def __int__(self) -> int:
+        """
+        Converts the number into a Python integer.
+
+        Returns:
+            int: The value of the number.
+        """
+        value = _limbs_to_int(self.limbs, self.chunkbase)
+        return -value if self.negative else value
 
 
     def __repr__(self) -> str:
         """
-        Returns a detailed string representation of the number, suitable for debugging.
+        Returns a short representation of the number, suitable for debugging.
 
-        If the number is negative, a minus sign is prefixed.
-        The first segment is followed by an exponent (E) if the number has more than one segment.
-
-        Returns:
-        - A string representation that includes an exponent notation if the number has multiple segments.
-        """
-        rep = ""  # Initialize an empty string for the result.
-        
-        # If the number is negative, add a minus sign.
-        if self.negative:
-            rep = "-"
-        
-        # Add the first segment of the number to the result.
-        rep += self.segments[0]
-
-        # If the number has more than one segment, append the exponent notation.
-        if len(self.segments) > 1:
-            rep += "E"  # Add the "E" for scientific notation (exponent).
-            
-            # Calculate the exponent based on the number of segments and chunk size.
-            idiv = ((len(self.segments) - 1) * self.chunksize) // 10
-            fdiv = ((len(self.segments) - 1) * self.chunksize) / 10
-            
-            # Use the integer division result if it matches the float division result,
-            # otherwise, use the float division result (to preserve precision).
-            rep += str(idiv if idiv == fdiv else fdiv)
-        
-        return rep  # Return the detailed string representation suitable for debugging.
+        Numbers with up to `_REPR_DIGITS` digits are shown in full, longer ones in scientific
+        notation with that many significant digits, so the representation stays cheap.
 
+        Returns:
+            str: The representation, like `num(12345)` or `num(1.2345678901234567890e+99)`.
+        """
+        if self.digits <= _REPR_DIGITS:
+            return f"num({self})"
+        return f"num({self:.{_REPR_DIGITS - 1}e})"
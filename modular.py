@@ -0,0 +1,226 @@
+from gcd import modinv
+from math_lib import (num, _add_limbs, _cmp_limbs, _mul_limbs, _normalize, _reciprocal, _shift_down,
+                      _sliding_window_pow, _sub_limbs)
+
+
+class ModContext():
+    def __init__(self, modulus: "num | int", method: str | None = None):
+        """
+        Prepares the reduction constants for repeated arithmetic modulo `modulus`.
+
+        Barrett reduction precomputes the reciprocal `floor(base**(2n) / modulus)`,
+        Montgomery reduction precomputes `-modulus**-1 mod base**n` and keeps all values
+        in Montgomery form `x * base**n mod modulus`. Either way the setup is paid once
+        per modulus and every reduction afterwards costs two multiplications.
+
+        Values returned by `reduce` and the arithmetic methods are in the internal form
+        of the context and must be turned back with `to_num`.
+
+        Args:
+            modulus (num | int): The positive modulus.
+            method (str | None): "barrett", "montgomery" or `None` to use Montgomery
+                                 whenever the modulus is coprime to the limb base.
+        """
+        self.modulus = modulus if isinstance(modulus, num) else num(modulus)
+        if self.modulus.negative or not self.modulus:
+            raise ValueError("ModContext needs a positive modulus.")
+
+        self.chunksize = self.modulus.chunksize
+        self.base = self.modulus.chunkbase
+        self.limbs = list(self.modulus.limbs)
+        self.size = len(self.limbs)
+
+        # Montgomery form needs an odd modulus that is also coprime to 5 (the base is a power of 10)
+        coprime = self.limbs[0] % 2 != 0 and self.limbs[0] % 5 != 0
+        if method is None:
+            method = "montgomery" if coprime else "barrett"
+        if method == "montgomery" and not coprime:
+            raise ValueError("Montgomery reduction needs a modulus coprime to 10.")
+        if method not in ("barrett", "montgomery"):
+            raise ValueError(f"unknown reduction method: {method!r}")
+        self.method = method
+
+        if method == "barrett":
+            self.reciprocal = _reciprocal(self.limbs, self.base)
+        else:
+            self.m_prime = self._negative_inverse()
+
+
+    def _negative_inverse(self) -> list:
+        """
+        Computes `-modulus**-1 mod base**n` by Hensel lifting.
+
+        Every step `x = x * (2 - modulus * x)` doubles the number of correct limbs.
+
+        Returns:
+            list: The limbs of the negative inverse.
+        """
+        base, n = self.base, self.size
+
+        # Start with the inverse modulo a single limb
+        x = [pow(self.limbs[0], -1, base)]
+        correct = 1
+        while correct < n:
+            correct = min(2 * correct, n)
+
+            # Compute 2 - modulus * x modulo base**correct
+            mx = _normalize(_mul_limbs(self.limbs[:correct], x, base)[:correct])
+            two = _sub_limbs([2] + [0] * (correct - 1) + [1], mx, base)
+            x = _normalize(_mul_limbs(x, _normalize(two[:correct]), base)[:correct])
+
+        # Negate modulo base**n
+        return _normalize(_sub_limbs([0] * n + [1], x, base)[:n])
+
+
+    def _wrap(self, limbs: list) -> num:
+        """
+        Wraps reduced limbs into a `num` with the chunksize of the modulus.
+
+        Args:
+            limbs (list): The normalized limbs.
+
+        Returns:
+            num: The residue.
+        """
+        return num._from_limbs(limbs, False, self.chunksize)
+
+
+    def _reduce_product(self, t: list) -> list:
+        """
+        Reduces a product of two residues with the precomputed constants.
+
+        Args:
+            t (list): The limbs of a value below `modulus * base**n`.
+
+        Returns:
+            list: The reduced limbs (the Montgomery product for Montgomery contexts).
+        """
+        base, n = self.base, self.size
+
+        if self.method == "barrett":
+            # Estimate the quotient from the leading limbs, it is at most a few units too small
+            q = _shift_down(_mul_limbs(_shift_down(t, n - 1), self.reciprocal, base), n + 1)
+            r = _sub_limbs(t, _mul_limbs(q, self.limbs, base), base)
+        else:
+            # REDC: add the multiple of the modulus that clears the low limbs, then drop them
+            u = _normalize(_mul_limbs(_normalize(t[:n]), self.m_prime, base)[:n])
+            r = _shift_down(_add_limbs(t, _mul_limbs(u, self.limbs, base), base), n)
+
+        while _cmp_limbs(r, self.limbs) >= 0:
+            r = _sub_limbs(r, self.limbs, base)
+        return r
+
+
+    def reduce(self, value: "num | int") -> num:
+        """
+        Brings an arbitrary number into the internal form of the context.
+
+        Args:
+            value (num | int): The number to reduce.
+
+        Returns:
+            num: The residue in internal form.
+        """
+        residue = self.modulus._coerce(value) % self.modulus
+        if self.method == "montgomery":
+            # Montgomery form is value * base**n mod modulus
+            shifted = num._from_limbs([0] * self.size + list(residue.limbs), False, self.chunksize)
+            residue = shifted % self.modulus
+        return residue
+
+
+    def to_num(self, residue: num) -> num:
+        """
+        Turns a residue in internal form back into a plain `num` below the modulus.
+
+        Args:
+            residue (num): The residue in internal form.
+
+        Returns:
+            num: The represented value.
+        """
+        if self.method == "barrett":
+            return +residue
+        return self._wrap(self._reduce_product(list(residue.limbs)))
+
+
+    def add(self, a: num, b: num) -> num:
+        """
+        Adds two residues.
+
+        Args:
+            a (num): The first residue in internal form.
+            b (num): The second residue in internal form.
+
+        Returns:
+            num: The sum in internal form.
+        """
+        limbs = _add_limbs(a.limbs, b.limbs, self.base)
+        if _cmp_limbs(limbs, self.limbs) >= 0:
+            limbs = _sub_limbs(limbs, self.limbs, self.base)
+        return self._wrap(limbs)
+
+
+    def sub(self, a: num, b: num) -> num:
+        """
+        Subtracts two residues.
+
+        Args:
+            a (num): The minuend in internal form.
+            b (num): The subtrahend in internal form.
+
+        Returns:
+            num: The difference in internal form.
+        """
+        if _cmp_limbs(a.limbs, b.limbs) >= 0:
+            return self._wrap(_sub_limbs(a.limbs, b.limbs, self.base))
+
+        # Wrap around through the modulus
+        return self._wrap(_sub_limbs(_add_limbs(a.limbs, self.limbs, self.base), b.limbs, self.base))
+
+
+    def mul(self, a: num, b: num) -> num:
+        """
+        Multiplies two residues.
+
+        Args:
+            a (num): The first residue in internal form.
+            b (num): The second residue in internal form.
+
+        Returns:
+            num: The product in internal form.
+        """
+        # Squares keep the shared limbs so the multiplication takes the squaring path
+        limbs = list(a.limbs)
+        product = _mul_limbs(limbs, limbs if a is b else list(b.limbs), self.base)
+        return self._wrap(self._reduce_product(product))
+
+
+    def pow(self, a: num, exponent: "num | int") -> num:
+        """
+        Raises a residue to a non-negative power with sliding-window exponentiation.
+
+        Args:
+            a (num): The residue in internal form.
+            exponent (num | int): The non-negative exponent.
+
+        Returns:
+            num: The power in internal form.
+        """
+        exponent = int(exponent)
+        if exponent < 0:
+            return self.pow(self.inverse(a), -exponent)
+        return _sliding_window_pow(a, exponent, self.reduce(1), self.mul)
+
+
+    def inverse(self, a: num) -> num:
+        """
+        Computes the modular inverse of a residue.
+
+        Args:
+            a (num): The residue in internal form.
+
+        Returns:
+            num: The inverse in internal form.
+        """
+        return self.reduce(modinv(self.to_num(a), self.modulus))
@@ -0,0 +1,327 @@
+from array import array
+
+from math_lib import num
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only `numarray` needs it
+    np = None
+
+
+# Limbs of a `numarray` hold `CHUNKSIZE` decimal digits, like the default `num`
+CHUNKSIZE = 10
+BASE = 10**CHUNKSIZE
+
+# Multiplication works on half limbs so that sums of limb products fit into int64
+_HALF = 10**(CHUNKSIZE // 2)
+
+
+def _carry_rows(coefficients: "np.ndarray", base: int) -> "np.ndarray":
+    """
+    Propagates the carries of every row of a coefficient matrix at once.
+
+    The loop runs over the columns, every step is vectorized across all rows.
+    Coefficients may be negative as long as the value of each row is not.
+
+    Args:
+        coefficients (np.ndarray): The int64 coefficients, least significant column first.
+            The top column has to be large enough to take the final carry.
+        base (int): The limb base of the result.
+
+    Returns:
+        np.ndarray: The same matrix with every entry reduced below `base`.
+    """
+    for j in range(coefficients.shape[1] - 1):
+        carry = coefficients[:, j] // base
+        coefficients[:, j] -= carry * base
+        coefficients[:, j + 1] += carry
+    return coefficients
+
+
+def _trim(limbs: "np.ndarray") -> "np.ndarray":
+    """
+    Drops the most significant columns that are zero in every row.
+
+    Args:
+        limbs (np.ndarray): The limb matrix.
+
+    Returns:
+        np.ndarray: The matrix with at least one column left.
+    """
+    used = np.flatnonzero(limbs.any(axis=0))
+    width = int(used[-1]) + 1 if len(used) else 1
+    return limbs[:, :width]
+
+
+def _pad(limbs: "np.ndarray", width: int) -> "np.ndarray":
+    """
+    Pads a limb matrix with zero columns up to `width`.
+
+    Args:
+        limbs (np.ndarray): The limb matrix.
+        width (int): The width to pad to.
+
+    Returns:
+        np.ndarray: The padded matrix.
+    """
+    if limbs.shape[1] >= width:
+        return limbs
+    return np.pad(limbs, ((0, 0), (0, width - limbs.shape[1])))
+
+
+class numarray():
+    __slots__ = ("limbs", "negative")
+
+    def __init__(self, values: "list[num | int]"):
+        """
+        Stores many numbers as one 2-D NumPy limb matrix.
+
+        Every row holds the limbs of one number in base `10**CHUNKSIZE`, least
+        significant column first, the signs are kept in a separate boolean vector.
+
+        Args:
+            values (list[num | int]): The numbers to store.
+        """
+        if np is None:
+            raise ImportError("numarray needs NumPy, install it with `pip install numpy`.")
+
+        # Bring every value to the limb base of the matrix
+        template = num(0, CHUNKSIZE)
+        values = [template._coerce(value) for value in values]
+
+        width = max((len(value.limbs) for value in values), default=1)
+        self.limbs = np.zeros((len(values), width), dtype=np.int64)
+        for row, value in enumerate(values):
+            self.limbs[row, :len(value.limbs)] = np.frombuffer(value.limbs, dtype=np.uint64)
+        self.negative = np.array([value.negative for value in values], dtype=bool)
+
+
+    @classmethod
+    def _from_matrix(cls, limbs: "np.ndarray", negative: "np.ndarray") -> "numarray":
+        """
+        Creates a `numarray` directly from a reduced limb matrix and sign vector.
+
+        Args:
+            limbs (np.ndarray): The int64 limb matrix, every entry below `BASE`.
+            negative (np.ndarray): The sign of every row.
+
+        Returns:
+            numarray: The new array.
+        """
+        ret = object.__new__(cls)
+        ret.limbs = _trim(limbs)
+
+        # Zero rows are never negative
+        ret.negative = negative & ret.limbs.any(axis=1)
+        return ret
+
+
+    @classmethod
+    def _coerce(cls, values: "numarray | num | int") -> "numarray":
+        """
+        Converts an operand into a `numarray`, scalars become a single broadcast row.
+
+        Args:
+            values (numarray | num | int): The operand.
+
+        Returns:
+            numarray: The operand as an array.
+        """
+        return values if isinstance(values, numarray) else cls([values])
+
+
+    def _signed(self, width: int) -> "np.ndarray":
+        """
+        Returns the limbs padded to `width` with the sign applied to every limb.
+
+        Args:
+            width (int): The width of the result.
+
+        Returns:
+            np.ndarray: The signed limb matrix.
+        """
+        return _pad(self.limbs, width) * np.where(self.negative, -1, 1)[:, None]
+
+
+    def _add_signed(self, sec_arr: "numarray", subtract: bool) -> "numarray":
+        """
+        Adds or subtracts two arrays row by row.
+
+        The signed limbs are added column-wise, the sign of each row is read off its
+        most significant non-zero column, and a single carry pass normalizes the rows.
+
+        Args:
+            sec_arr (numarray): The second operand.
+            subtract (bool): Whether to subtract `sec_arr` instead of adding it.
+
+        Returns:
+            numarray: The element-wise sum or difference.
+        """
+        width = max(self.limbs.shape[1], sec_arr.limbs.shape[1]) + 1
+        other = sec_arr._signed(width)
+        coefficients = self._signed(width) - other if subtract else self._signed(width) + other
+
+        # Every column is below the base in magnitude, so the top non-zero column decides the sign
+        nonzero = coefficients != 0
+        top = width - 1 - np.argmax(nonzero[:, ::-1], axis=1)
+        negative = coefficients[np.arange(len(coefficients)), top] < 0
+        coefficients[negative] *= -1
+
+        return numarray._from_matrix(_carry_rows(coefficients, BASE), negative)
+
+
+    def __add__(self, sec_arr: "numarray | num | int") -> "numarray":
+        """
+        Adds another array or a scalar to every row.
+
+        Args:
+            sec_arr (numarray | num | int): An array of the same length, or a scalar.
+
+        Returns:
+            numarray: The element-wise sum.
+        """
+        return self._add_signed(numarray._coerce(sec_arr), False)
+
+
+    def __radd__(self, sec_arr: "num | int") -> "numarray":
+        """
+        Handles `scalar + numarray`.
+
+        Args:
+            sec_arr (num | int): The scalar.
+
+        Returns:
+            numarray: The element-wise sum.
+        """
+        return self + sec_arr
+
+
+    def __sub__(self, sec_arr: "numarray | num | int") -> "numarray":
+        """
+        Subtracts another array or a scalar from every row.
+
+        Args:
+            sec_arr (numarray | num | int): An array of the same length, or a scalar.
+
+        Returns:
+            numarray: The element-wise difference.
+        """
+        return self._add_signed(numarray._coerce(sec_arr), True)
+
+
+    def __rsub__(self, sec_arr: "num | int") -> "numarray":
+        """
+        Handles `scalar - numarray`.
+
+        Args:
+            sec_arr (num | int): The scalar.
+
+        Returns:
+            numarray: The element-wise difference.
+        """
+        return numarray._coerce(sec_arr)._add_signed(self, True)
+
+
+    def __mul__(self, sec_arr: "numarray | num | int") -> "numarray":
+        """
+        Multiplies every row with another array or a scalar.
+
+        The limbs are split into half limbs so that the column sums of the schoolbook
+        products fit into int64. The product loop runs over the columns of `self`,
+        every step multiplies and accumulates whole rows at once.
+
+        Args:
+            sec_arr (numarray | num | int): An array of the same length, or a scalar.
+
+        Returns:
+            numarray: The element-wise product.
+        """
+        sec_arr = numarray._coerce(sec_arr)
+
+        def halves(limbs: "np.ndarray") -> "np.ndarray":
+            # Split every limb into its low and high half
+            split = np.empty((limbs.shape[0], 2 * limbs.shape[1]), dtype=np.int64)
+            split[:, 0::2] = limbs % _HALF
+            split[:, 1::2] = limbs // _HALF
+            return split
+
+        a, b = halves(self.limbs), halves(sec_arr.limbs)
+        rows = max(a.shape[0], b.shape[0])
+        products = np.zeros((rows, a.shape[1] + b.shape[1]), dtype=np.int64)
+        for i in range(a.shape[1]):
+            products[:, i:i + b.shape[1]] += a[:, i:i + 1] * b
+
+        # Carry in half limbs and join the halves back into full limbs
+        products = _carry_rows(products, _HALF)
+        limbs = products[:, 0::2] + products[:, 1::2] * _HALF
+        return numarray._from_matrix(limbs, self.negative ^ sec_arr.negative)
+
+
+    def __rmul__(self, sec_arr: "num | int") -> "numarray":
+        """
+        Handles `scalar * numarray`.
+
+        Args:
+            sec_arr (num | int): The scalar.
+
+        Returns:
+            numarray: The element-wise product.
+        """
+        return self * sec_arr
+
+
+    def __neg__(self) -> "numarray":
+        """
+        Negates every row.
+
+        Returns:
+            numarray: The negated array.
+        """
+        return numarray._from_matrix(self.limbs.copy(), ~self.negative)
+
+
+    def __len__(self) -> int:
+        """
+        Returns the number of stored values.
+
+        Returns:
+            int: The number of rows.
+        """
+        return self.limbs.shape[0]
+
+
+    def __getitem__(self, index: int) -> num:
+        """
+        Returns one stored value as a `num`.
+
+        Args:
+            index (int): The row index.
+
+        Returns:
+            num: The value of the row.
+        """
+        row = self.limbs[index]
+        used = np.flatnonzero(row)
+        width = int(used[-1]) + 1 if len(used) else 1
+        limbs = array("Q", row[:width].astype(np.uint64).tobytes())
+        return num._from_limbs(limbs, bool(self.negative[index]), CHUNKSIZE)
+
+
+    def to_list(self) -> list:
+        """
+        Converts the array back into a list of `num` values.
+
+        Returns:
+            list: The stored values.
+        """
+        return [self[i] for i in range(len(self))]
+
+
+    def __repr__(self) -> str:
+        """
+        Returns a short description of the array, suitable for debugging.
+
+        Returns:
+            str: The length and limb width of the array.
+        """
+        return f"numarray(len={len(self)}, limbs={self.limbs.shape[1]})"
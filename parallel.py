@@ -0,0 +1,255 @@
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import math_lib
+from math_lib import _add_limbs, _mul_limbs, _normalize, _sub_limbs
+
+
+# Operand length (in limbs) below which multiplications stay serial
+PARALLEL_THRESHOLD = 4000
+
+
+def _init_worker() -> None:
+    """
+    Keeps worker processes serial, forked workers would otherwise inherit the parallel hook.
+    """
+    math_lib._PARALLEL = None
+
+
+def _multiply_block(operands: str, x_offset: int, x_length: int, y_offset: int, y_length: int,
+                    products: str, out_offset: int, base: int) -> int:
+    """
+    Multiplies two operands stored in shared memory inside a worker process.
+
+    Args:
+        operands (str): The name of the shared block holding the operand limbs.
+        x_offset (int): The position of the first operand in that block.
+        x_length (int): The number of limbs of the first operand.
+        y_offset (int): The position of the second operand, equal to `x_offset` for squares.
+        y_length (int): The number of limbs of the second operand.
+        products (str): The name of the shared block receiving the product limbs.
+        out_offset (int): The position of the product in that block.
+        base (int): The limb base.
+
+    Returns:
+        int: The number of limbs written for the product.
+    """
+    source = shared_memory.SharedMemory(name=operands)
+    target = shared_memory.SharedMemory(name=products)
+    try:
+        limbs = source.buf.cast("Q")
+        x = limbs[x_offset:x_offset + x_length].tolist()
+        y = x if y_offset == x_offset else limbs[y_offset:y_offset + y_length].tolist()
+        del limbs
+
+        product = array("Q", _mul_limbs(x, y, base))
+        out = target.buf.cast("Q")
+        out[out_offset:out_offset + len(product)] = product
+        del out
+        return len(product)
+    finally:
+        source.close()
+        target.close()
+
+
+class _ParallelMultiplier():
+    def __init__(self, workers: int, threshold: int):
+        """
+        Holds the process pool that the limb multiplication hands large products to.
+
+        Args:
+            workers (int): The number of worker processes.
+            threshold (int): The operand length (in limbs) from which products run in parallel.
+        """
+        self.workers = workers
+        self.threshold = threshold
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+
+
+    def _plan(self, a: list, b: list, depth: int, leaves: list):
+        """
+        Splits a product into independent sub-products.
+
+        Balanced operands are split with Karatsuba, so every level turns one product
+        into three half-size ones. A much shorter `b` is multiplied with blocks of `a`.
+
+        Args:
+            a (list): The limbs of the first operand.
+            b (list): The limbs of the second operand.
+            depth (int): The number of Karatsuba levels left.
+            leaves (list): Collects the `(x, y)` operand pairs of the sub-products.
+
+        Returns:
+            tuple: The recombination tree, see `_combine`.
+        """
+        if len(a) < len(b):
+            a, b = b, a
+
+        if depth == 0:
+            leaves.append((a, b))
+            return ("leaf", len(leaves) - 1)
+
+        # Unbalanced operands: one sub-product per block of `a`
+        if 2 * len(b) <= len(a):
+            size = max(len(b), -(-len(a) // self.workers))
+            children = []
+            for start in range(0, len(a), size):
+                leaves.append((_normalize(a[start:start + size]), b))
+                children.append((start, ("leaf", len(leaves) - 1)))
+            return ("blocks", children)
+
+        # Karatsuba: a0 * b0, a1 * b1 and (a0 + a1) * (b0 + b1)
+        half = (len(a) + 1) // 2
+        a0, a1 = _normalize(a[:half]), a[half:]
+        b0, b1 = _normalize(b[:half]), b[half:] or [0]
+        square = a is b
+        low = self._plan(a0, a0 if square else b0, depth - 1, leaves)
+        high = self._plan(a1, a1 if square else b1, depth - 1, leaves)
+        a_sum = _add_limbs(a0, a1, self.base)
+        mid = self._plan(a_sum, a_sum if square else _add_limbs(b0, b1, self.base), depth - 1, leaves)
+        return ("karatsuba", half, low, high, mid)
+
+
+    def _combine(self, node: tuple, results: list) -> list:
+        """
+        Recombines the sub-products of a plan into the full product.
+
+        Args:
+            node (tuple): The plan node returned by `_plan`.
+            results (list): The limbs of every leaf product.
+
+        Returns:
+            list: The limbs of the product of the node.
+        """
+        base = self.base
+        if node[0] == "leaf":
+            return results[node[1]]
+
+        if node[0] == "blocks":
+            product = [0]
+            for start, child in node[1]:
+                block = self._combine(child, results)
+                product = _add_limbs(product, [0] * start + block if block != [0] else block, base)
+            return product
+
+        _, half, low, high, mid = node
+        z0 = self._combine(low, results)
+        z2 = self._combine(high, results)
+        z1 = _sub_limbs(_sub_limbs(self._combine(mid, results), z0, base), z2, base)
+        product = _add_limbs(z0, [0] * half + z1 if z1 != [0] else z1, base)
+        return _add_limbs(product, [0] * (2 * half) + z2 if z2 != [0] else z2, base)
+
+
+    def multiply(self, a, b, base: int) -> list:
+        """
+        Multiplies two limb sequences with the sub-products spread over the pool.
+
+        The operands of all sub-products are written into one shared memory block and
+        the workers write their products into a second one, so no limbs are pickled.
+        Multiplications inside the workers use the regular serial dispatch.
+
+        Args:
+            a: The first limb sequence.
+            b: The second limb sequence.
+            base (int): The limb base.
+
+        Returns:
+            list: The limbs of the product, least significant first.
+        """
+        self.base = base
+
+        # Enough Karatsuba levels to give every worker at least one sub-product
+        depth = 1
+        while 3**depth < self.workers:
+            depth += 1
+        # Squares keep one shared list so that every sub-product stays a square
+        x = list(a)
+        y = x if a is b or a == b else list(b)
+        leaves = []
+        plan = self._plan(x, y, depth, leaves)
+
+        # Lay out the operands (squares store theirs once) and the product slots
+        offsets = []
+        operand_size = product_size = 0
+        for x, y in leaves:
+            x_offset = operand_size
+            operand_size += len(x)
+            y_offset = x_offset if x is y else operand_size
+            operand_size += 0 if x is y else len(y)
+            offsets.append((x_offset, y_offset, product_size))
+            product_size += len(x) + len(y)
+
+        operands = shared_memory.SharedMemory(create=True, size=8 * operand_size)
+        products = shared_memory.SharedMemory(create=True, size=8 * product_size)
+        try:
+            limbs = operands.buf.cast("Q")
+            for (x, y), (x_offset, y_offset, _) in zip(leaves, offsets):
+                limbs[x_offset:x_offset + len(x)] = array("Q", x)
+                if y_offset != x_offset:
+                    limbs[y_offset:y_offset + len(y)] = array("Q", y)
+            del limbs
+
+            futures = [self.executor.submit(_multiply_block, operands.name, x_offset, len(x), y_offset, len(y),
+                                            products.name, out_offset, base)
+                       for (x, y), (x_offset, y_offset, out_offset) in zip(leaves, offsets)]
+
+            out = products.buf.cast("Q")
+            results = [out[out_offset:out_offset + future.result()].tolist()
+                       for future, (_, _, out_offset) in zip(futures, offsets)]
+            del out
+        finally:
+            operands.close()
+            operands.unlink()
+            products.close()
+            products.unlink()
+
+        return self._combine(plan, results)
+
+
+    def shutdown(self) -> None:
+        """
+        Stops the worker processes.
+        """
+        self.executor.shutdown()
+
+
+def enable(workers: int | None = None, threshold: int = PARALLEL_THRESHOLD) -> None:
+    """
+    Turns on parallel multiplication for every `num` product above `threshold` limbs.
+
+    Division, powers and everything else built on the limb multiplication profit as well.
+
+    Args:
+        workers (int | None): The number of worker processes, all CPU cores by default.
+        threshold (int): The operand length (in limbs) from which products run in parallel.
+    """
+    disable()
+    math_lib._PARALLEL = _ParallelMultiplier(workers or os.cpu_count() or 1, threshold)
+
+
+def disable() -> None:
+    """
+    Turns parallel multiplication off again and stops the worker processes.
+    """
+    if math_lib._PARALLEL is not None:
+        math_lib._PARALLEL.shutdown()
+        math_lib._PARALLEL = None
+
+
+@contextmanager
+def parallel(workers: int | None = None, threshold: int = PARALLEL_THRESHOLD):
+    """
+    Enables parallel multiplication for the duration of a `with` block.
+
+    Args:
+        workers (int | None): The number of worker processes, all CPU cores by default.
+        threshold (int): The operand length (in limbs) from which products run in parallel.
+    """
+    enable(workers, threshold)
+    try:
+        yield
+    finally:
+        disable()
@@ -0,0 +1,346 @@
+import random
+from itertools import compress
+from math import isqrt, prod
+
+from math_lib import num
+from modular import ModContext
+from roots import isqrt as num_isqrt
+
+
+# Number of odd numbers covered by one segment of the sieve, a bytearray of this size stays in the L1 cache
+SIEVE_SEGMENT_SIZE = 1 << 15
+
+# Primes below this bound are divided out before any probable-prime test
+TRIAL_DIVISION_BOUND = 1000
+
+# Primes below this bound are sieved out of candidate windows when searching for primes
+CANDIDATE_SIEVE_BOUND = 1 << 16
+
+# Below this bound Miller-Rabin with the first 13 primes as bases is deterministic
+_MILLER_RABIN_BOUND = 3317044064679887385961981
+_MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+
+def iter_primes(start: int = 2, stop: int | None = None):
+    """
+    Streams the primes in `[start, stop)` from a segmented sieve of Eratosthenes.
+
+    Every segment holds only odd numbers, one byte each, and is crossed off with
+    slice assignments by the base primes up to the square root of its end. The base
+    primes themselves come from the same sieve and are extended as the segments move up.
+
+    Args:
+        start (int): The lower bound (inclusive).
+        stop (int | None): The upper bound (exclusive), `None` for an endless stream.
+
+    Yields:
+        int: The primes in increasing order.
+    """
+    if start <= 2 and (stop is None or stop > 2):
+        yield 2
+
+    low = max(start, 3) | 1
+    base_primes, base_limit = [], 1
+    while stop is None or low < stop:
+        high = low + 2 * SIEVE_SEGMENT_SIZE
+        if stop is not None:
+            high = min(high, stop)
+
+        # Grow the base primes geometrically so they are only rebuilt a few times
+        root = isqrt(high - 1)
+        if root > base_limit:
+            base_limit = max(root, 2 * base_limit)
+            base_primes = list(iter_primes(3, base_limit + 1))
+
+        size = (high - low + 1) // 2
+        segment = bytearray([1]) * size
+        for p in base_primes:
+            if p * p >= high:
+                break
+            # First odd multiple of p in the segment, never p itself
+            first = max(p * p, (low + p - 1) // p * p)
+            if first % 2 == 0:
+                first += p
+            index = (first - low) // 2
+            segment[index::p] = bytes(len(range(index, size, p)))
+
+        yield from compress(range(low, high, 2), segment)
+        low = high | 1
+
+
+def primes_up_to(n: int) -> list:
+    """
+    Lists all primes up to `n`.
+
+    Args:
+        n (int): The upper bound (inclusive).
+
+    Returns:
+        list: The primes in increasing order.
+    """
+    return list(iter_primes(2, n + 1))
+
+
+# Small primes with their product, residues modulo all of them take one pass over the limbs
+_TRIAL_PRIMES = primes_up_to(TRIAL_DIVISION_BOUND - 1)
+_TRIAL_PRODUCT = prod(_TRIAL_PRIMES)
+_SIEVE_PRIMES = primes_up_to(CANDIDATE_SIEVE_BOUND - 1)
+_SIEVE_PRODUCT = prod(_SIEVE_PRIMES)
+
+
+def _residues(n: num, primes: list, product: int) -> list:
+    """
+    Computes the residues of a number modulo many small primes at once.
+
+    The limbs are reduced modulo the product of all primes in a single pass, the
+    individual residues then come from the much shorter remainder.
+
+    Args:
+        n (num): The non-negative number.
+        primes (list): The small primes.
+        product (int): The product of `primes`.
+
+    Returns:
+        list: The residue of `n` modulo every prime.
+    """
+    remainder = 0
+    for limb in reversed(n.limbs):
+        remainder = (remainder * n.chunkbase + limb) % product
+    return [remainder % p for p in primes]
+
+
+def _jacobi(a: int, n: int) -> int:
+    """
+    Computes the Jacobi symbol `(a / n)` of small integers.
+
+    Args:
+        a (int): The numerator.
+        n (int): The odd positive denominator.
+
+    Returns:
+        int: -1, 0 or 1.
+    """
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+
+def _miller_rabin(n: num, ctx: ModContext, bases) -> bool:
+    """
+    Runs strong probable-prime tests on an odd number.
+
+    Args:
+        n (num): The odd number to test.
+        ctx (ModContext): The reduction context modulo `n`.
+        bases: The bases to test with.
+
+    Returns:
+        bool: Whether `n` is a strong probable prime to all bases.
+    """
+    # n - 1 = d * 2**s with odd d
+    d = int(n) - 1
+    s = (d & -d).bit_length() - 1
+    d >>= s
+
+    one, minus_one = ctx.reduce(1), ctx.reduce(-1)
+    for a in bases:
+        x = ctx.pow(ctx.reduce(a), d)
+        if x == one or x == minus_one:
+            continue
+        for _ in range(s - 1):
+            x = ctx.mul(x, x)
+            if x == minus_one:
+                break
+        else:
+            return False
+    return True
+
+
+def _strong_lucas(n: num, ctx: ModContext) -> bool:
+    """
+    Runs the strong Lucas probable-prime test with Selfridge's parameters.
+
+    `D` is the first of 5, -7, 9, -11, ... with Jacobi symbol `(D / n) == -1`,
+    `P = 1` and `Q = (1 - D) / 4`. The Lucas sequences are doubled along the bits
+    of `d`, where `n + 1 = d * 2**s`, in the internal form of `ctx`.
+
+    Args:
+        n (num): The odd number to test, not a perfect square.
+        ctx (ModContext): The reduction context modulo `n`.
+
+    Returns:
+        bool: Whether `n` is a strong Lucas probable prime.
+    """
+    D = 5
+    while True:
+        # The symbol only depends on n modulo 4 * |D|
+        symbol = _jacobi(D, _residues(n, [4 * abs(D)], 4 * abs(D))[0])
+        if symbol == -1:
+            break
+        if symbol == 0 and n != abs(D):
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+
+    def half(x: num) -> num:
+        # x / 2 modulo n, which commutes with the internal form of the context
+        return (x + n if x.limbs[0] % 2 else x) // 2
+
+    d = int(n) + 1
+    s = (d & -d).bit_length() - 1
+    d >>= s
+
+    Q = ctx.reduce((1 - D) // 4)
+    D = ctx.reduce(D)
+    U, V, Qk = ctx.reduce(1), ctx.reduce(1), Q
+    for bit in bin(d)[3:]:
+        # Double the index: U_2k = U_k V_k, V_2k = V_k**2 - 2 Q**k
+        U, V = ctx.mul(U, V), ctx.sub(ctx.mul(V, V), ctx.add(Qk, Qk))
+        Qk = ctx.mul(Qk, Qk)
+        if bit == "1":
+            # Step the index: U_k+1 = (U_k + V_k) / 2, V_k+1 = (D U_k + V_k) / 2
+            U, V = half(ctx.add(U, V)), half(ctx.add(ctx.mul(D, U), V))
+            Qk = ctx.mul(Qk, Q)
+
+    if not U or not V:
+        return True
+    for _ in range(s - 1):
+        V = ctx.sub(ctx.mul(V, V), ctx.add(Qk, Qk))
+        Qk = ctx.mul(Qk, Qk)
+        if not V:
+            return True
+    return False
+
+
+def is_prime(n: "num | int") -> bool:
+    """
+    Tests a number for primality.
+
+    Small prime factors are found by trial division, numbers below 3.3e24 are decided
+    by deterministic Miller-Rabin and larger ones by the Baillie-PSW test (Miller-Rabin
+    to base 2 and a strong Lucas test), which has no known counterexample.
+
+    Args:
+        n (num | int): The number to test.
+
+    Returns:
+        bool: Whether `n` is (almost certainly, above 3.3e24) prime.
+    """
+    n = n if isinstance(n, num) else num(n)
+    if n.negative or n < 2:
+        return False
+    if n < TRIAL_DIVISION_BOUND:
+        return int(n) in _TRIAL_PRIMES
+    if 0 in _residues(n, _TRIAL_PRIMES, _TRIAL_PRODUCT):
+        return False
+    if n < TRIAL_DIVISION_BOUND**2:
+        return True
+
+    ctx = ModContext(n)
+    if n < _MILLER_RABIN_BOUND:
+        return _miller_rabin(n, ctx, _MILLER_RABIN_BASES)
+    if not _miller_rabin(n, ctx, (2,)):
+        return False
+
+    # Perfect squares have no Lucas parameter with Jacobi symbol -1
+    if not num_isqrt(n)[1]:
+        return False
+    return _strong_lucas(n, ctx)
+
+
+def _candidates(start: num, width: int):
+    """
+    Sieves a window of candidates with the small primes.
+
+    The residues of `start` modulo all sieving primes are computed once for the whole
+    window, after that every prime crosses off its multiples with a slice assignment.
+
+    Args:
+        start (num): The first number of the window, larger than `CANDIDATE_SIEVE_BOUND`.
+        width (int): The number of consecutive numbers in the window.
+
+    Returns:
+        iterator: The offsets from `start` of the numbers without small prime factors.
+    """
+    window = bytearray([1]) * width
+    for p, r in zip(_SIEVE_PRIMES, _residues(start, _SIEVE_PRIMES, _SIEVE_PRODUCT)):
+        first = -r % p
+        window[first::p] = bytes(len(range(first, width, p)))
+    return compress(range(width), window)
+
+
+def _window_width(n: num) -> int:
+    """
+    Returns a candidate window width that usually contains a few primes around `n`.
+
+    Args:
+        n (num): The size of the numbers in the window.
+
+    Returns:
+        int: The width, about 20 average prime gaps.
+    """
+    return 64 * n.digits + 1024
+
+
+def next_prime(n: "num | int") -> num:
+    """
+    Finds the smallest prime larger than `n`.
+
+    Args:
+        n (num | int): The starting point.
+
+    Returns:
+        num: The next prime.
+    """
+    n = n if isinstance(n, num) else num(n)
+    if n < CANDIDATE_SIEVE_BOUND:
+        return num(next(iter_primes(max(int(n) + 1, 2))), n.chunksize)
+
+    start = n + 1
+    while True:
+        width = _window_width(start)
+        for offset in _candidates(start, width):
+            candidate = start + offset
+            if is_prime(candidate):
+                return candidate
+        start = start + width
+
+
+def random_prime(digits: int, rng: random.Random | None = None) -> num:
+    """
+    Generates a random prime with exactly `digits` decimal digits.
+
+    A random starting point is drawn once and the window behind it is sieved in one
+    batch, only the surviving candidates are tested with `is_prime`.
+
+    Args:
+        digits (int): The number of decimal digits, at least 1.
+        rng (random.Random | None): The random number generator, the `random` module by default.
+
+    Returns:
+        num: The prime.
+    """
+    if digits < 1:
+        raise ValueError("random_prime() needs at least one digit")
+    rng = rng or random
+    low, high = 10**(digits - 1), 10**digits
+
+    if high <= CANDIDATE_SIEVE_BOUND:
+        return num(rng.choice(list(iter_primes(low, high))))
+
+    while True:
+        first = rng.randrange(low, high)
+        start = num(first)
+        width = min(_window_width(start), high - first)
+        for offset in _candidates(start, width):
+            candidate = start + offset
+            if is_prime(candidate):
+                return candidate
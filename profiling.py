@@ -0,0 +1,310 @@
+import inspect
+import json
+import time
+from contextlib import contextmanager
+
+import math_lib
+from math_lib import num
+
+
+# Methods of `num` that are never timed, besides generators whose work happens after the call returns
+_UNPROFILED = ("_from_limbs", "__reduce__", "__init_subclass__", "__subclasshook__")
+
+
+def _bucket(limbs: int) -> int:
+    """
+    Maps an operand length to its histogram bucket.
+
+    Args:
+        limbs (int): The operand length in limbs.
+
+    Returns:
+        int: The smallest power of two that is at least `limbs`, the upper end of the bucket.
+    """
+    return 1 << (limbs - 1).bit_length() if limbs > 1 else 1
+
+
+def _size(arguments: tuple, result) -> int:
+    """
+    Determines the operand size of a profiled call.
+
+    Args:
+        arguments (tuple): The positional arguments of the call.
+        result: The return value of the call.
+
+    Returns:
+        int: The length in limbs of the longest `num` argument, or of a `num` result
+        for calls without `num` arguments.
+    """
+    sizes = [len(value.limbs) for value in arguments if isinstance(value, num)]
+    if sizes:
+        return max(sizes)
+    return len(result.limbs) if isinstance(result, num) else 0
+
+
+class Profiler():
+    def __init__(self):
+        """
+        Collects the statistics of every `num` operation while profiling is enabled.
+
+        Per operation (the method name, e.g. `__mul__`) it counts the calls, their total
+        wall time, the `num` values they allocated and a histogram of the operand sizes.
+        Calls made by an operation internally are part of that operation and not counted
+        on their own. The limb multiplications below all operations are counted separately.
+        """
+        self.reset()
+
+
+    def reset(self) -> None:
+        """
+        Clears all statistics.
+        """
+        self.operations = {}  # Method name -> statistics of its calls
+        self.allocations = 0  # Number of `num` values created
+        self.allocated_bytes = 0  # Size of their limbs
+        self.multiplications = 0  # Number of limb multiplications
+        self.multiplication_sizes = {}  # Histogram of the shorter operand of every multiplication
+        self.limb_products = 0  # Limb products computed by the schoolbook base cases
+        self.ntt_products = 0  # Multiplications done with number-theoretic transforms
+        self._active = False  # Set while an operation is timed, to skip its inner calls
+
+
+    def record_multiplication(self, a_length: int, b_length: int) -> None:
+        """
+        Counts one limb multiplication, called by `math_lib._mul_coefficients`.
+
+        Args:
+            a_length (int): The length of the first operand in limbs.
+            b_length (int): The length of the second operand in limbs.
+        """
+        self.multiplications += 1
+        bucket = _bucket(min(a_length, b_length))
+        self.multiplication_sizes[bucket] = self.multiplication_sizes.get(bucket, 0) + 1
+
+
+    def _record_allocation(self, value: num) -> None:
+        """
+        Counts one new `num` value.
+
+        Args:
+            value (num): The new value.
+        """
+        self.allocations += 1
+        self.allocated_bytes += len(value.limbs) * 8
+
+
+    def _record(self, name: str, seconds: float, size: int, allocations: int, allocated_bytes: int) -> None:
+        """
+        Adds one finished call to the statistics of its operation.
+
+        Args:
+            name (str): The method name.
+            seconds (float): The wall time of the call.
+            size (int): The operand size in limbs.
+            allocations (int): The number of `num` values the call created.
+            allocated_bytes (int): The size of their limbs.
+        """
+        stats = self.operations.get(name)
+        if stats is None:
+            stats = self.operations[name] = {"count": 0, "seconds": 0.0, "allocations": 0,
+                                             "allocated_bytes": 0, "sizes": {}}
+        stats["count"] += 1
+        stats["seconds"] += seconds
+        stats["allocations"] += allocations
+        stats["allocated_bytes"] += allocated_bytes
+        bucket = _bucket(size)
+        stats["sizes"][bucket] = stats["sizes"].get(bucket, 0) + 1
+
+
+    def _timed(self, name: str, function):
+        """
+        Wraps a method of `num` so that its calls are recorded.
+
+        Args:
+            name (str): The method name.
+            function: The original function.
+
+        Returns:
+            function: The recording wrapper.
+        """
+        def wrapper(*args, **kwargs):
+            # Inner calls of a timed operation only run, but the values they initialize still count
+            if self._active:
+                result = function(*args, **kwargs)
+                if name == "__init__":
+                    self._record_allocation(args[0])
+                return result
+
+            self._active = True
+            allocations, allocated_bytes = self.allocations, self.allocated_bytes
+            start = time.perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - start
+                self._active = False
+
+            if name == "__init__":
+                self._record_allocation(args[0])
+            self._record(name, seconds, _size(args, result), self.allocations - allocations,
+                         self.allocated_bytes - allocated_bytes)
+            return result
+
+        wrapper.__wrapped__ = function
+        wrapper.__name__ = function.__name__
+        wrapper.__doc__ = function.__doc__
+        return wrapper
+
+
+    def _allocating(self, function):
+        """
+        Wraps `num._from_limbs` so that every value it creates is counted.
+
+        Args:
+            function: The original function.
+
+        Returns:
+            function: The counting wrapper.
+        """
+        def wrapper(cls, *args, **kwargs):
+            value = function(cls, *args, **kwargs)
+            self._record_allocation(value)
+            return value
+
+        wrapper.__wrapped__ = function
+        return wrapper
+
+
+    def _install(self) -> dict:
+        """
+        Replaces the methods of `num` by recording wrappers.
+
+        Returns:
+            dict: The original class attributes, restored by `disable`.
+        """
+        originals = {}
+        for name, attribute in list(vars(num).items()):
+            if isinstance(attribute, (staticmethod, classmethod)):
+                function, kind = attribute.__func__, type(attribute)
+            elif inspect.isfunction(attribute):
+                function, kind = attribute, None
+            else:
+                continue
+            if name in _UNPROFILED or inspect.isgeneratorfunction(function):
+                continue
+            if name.startswith("_") and not (name.startswith("__") and name.endswith("__")):
+                continue
+
+            originals[name] = attribute
+            wrapper = self._timed(name, function)
+            setattr(num, name, kind(wrapper) if kind else wrapper)
+
+        originals["_from_limbs"] = vars(num)["_from_limbs"]
+        num._from_limbs = classmethod(self._allocating(originals["_from_limbs"].__func__))
+        return originals
+
+
+    def as_dict(self) -> dict:
+        """
+        Exports the statistics.
+
+        Returns:
+            dict: `operations` with the statistics of every operation, `multiplication` with
+            the limb multiplication counters and the totals `allocations` and `allocated_bytes`.
+            Histograms map the upper end of each operand size bucket (in limbs) to a count.
+        """
+        return {
+            "operations": {name: dict(stats, sizes=dict(sorted(stats["sizes"].items())))
+                           for name, stats in sorted(self.operations.items())},
+            "multiplication": {
+                "count": self.multiplications,
+                "sizes": dict(sorted(self.multiplication_sizes.items())),
+                "limb_products": self.limb_products,
+                "ntt_products": self.ntt_products,
+            },
+            "allocations": self.allocations,
+            "allocated_bytes": self.allocated_bytes,
+        }
+
+
+    def to_json(self, **kwargs) -> str:
+        """
+        Exports the statistics as JSON, with the histogram buckets as string keys.
+
+        Args:
+            **kwargs: Passed on to `json.dumps`.
+
+        Returns:
+            str: The statistics of `as_dict` as a JSON document.
+        """
+        return json.dumps(self.as_dict(), **kwargs)
+
+
+# Class attributes of `num` replaced by the active profiler
+_ORIGINALS = None
+
+
+def enable(profiler: Profiler | None = None) -> Profiler:
+    """
+    Starts recording every `num` operation.
+
+    While disabled, `num` runs its original methods, so profiling costs nothing.
+
+    Args:
+        profiler (Profiler | None): The profiler receiving the statistics, a new one by default.
+            Passing an earlier profiler continues its statistics.
+
+    Returns:
+        Profiler: The active profiler.
+    """
+    global _ORIGINALS
+    disable()
+    profiler = Profiler() if profiler is None else profiler
+    _ORIGINALS = profiler._install()
+    math_lib._PROFILER = profiler
+    return profiler
+
+
+def disable() -> Profiler | None:
+    """
+    Stops recording and restores the original methods of `num`.
+
+    Returns:
+        Profiler | None: The profiler that was active, with its statistics.
+    """
+    global _ORIGINALS
+    profiler = math_lib._PROFILER
+    if _ORIGINALS is not None:
+        for name, attribute in _ORIGINALS.items():
+            setattr(num, name, attribute)
+        _ORIGINALS = None
+    math_lib._PROFILER = None
+    return profiler
+
+
+def active() -> Profiler | None:
+    """
+    Returns the active profiler.
+
+    Returns:
+        Profiler | None: The profiler, or `None` while profiling is disabled.
+    """
+    return math_lib._PROFILER
+
+
+@contextmanager
+def profile(profiler: Profiler | None = None):
+    """
+    Records every `num` operation for the duration of a `with` block.
+
+    Args:
+        profiler (Profiler | None): The profiler receiving the statistics, a new one by default.
+
+    Yields:
+        Profiler: The active profiler, its statistics stay available after the block.
+    """
+    profiler = enable(profiler)
+    try:
+        yield profiler
+    finally:
+        disable()
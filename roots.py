@@ -0,0 +1,118 @@
+from math import isqrt as _isqrt_int
+
+from math_lib import (num, _add_limbs, _cmp_limbs, _divmod_limbs, _divmod_small, _int_to_limbs, _limbs_to_int,
+                      _mul_limbs, _mul_small, _shift_down, _sliding_window_pow, _sub_limbs)
+
+
+# Root length (in limbs) up to which roots are taken on Python integers
+ROOT_BASECASE_LIMBS = 4
+
+
+def _iroot_int(n: int, k: int) -> int:
+    """
+    Computes the integer k-th root of a small Python integer.
+
+    Args:
+        n (int): The non-negative radicand.
+        k (int): The degree of the root, at least 1.
+
+    Returns:
+        int: The floor of the k-th root of `n`.
+    """
+    if k == 2:
+        return _isqrt_int(n)
+    if n < 2:
+        return n
+
+    # Newton iteration from above, starting at a power of two beyond the root
+    x = 1 << -(-n.bit_length() // k)
+    while True:
+        y = ((k - 1) * x + n // x**(k - 1)) // k
+        if y >= x:
+            return x
+        x = y
+
+
+def _iroot_limbs(n: list, k: int, base: int) -> tuple:
+    """
+    Computes the integer k-th root of a limb sequence by Newton iteration with precision doubling.
+
+    The root of the leading limbs (dropping `k * j` limbs) is computed recursively and
+    gives about half of the digits of the root. Scaled by `base**j` and rounded up it is
+    an overestimate, and one Newton step from above doubles its precision. Newton steps
+    never drop below the root, so the first `x` with `x**k <= n` is the exact floor.
+    Usually this costs one division and one power per level of the recursion.
+
+    Args:
+        n (list): The limbs of the radicand.
+        k (int): The degree of the root, at least 2.
+        base (int): The limb base.
+
+    Returns:
+        tuple: The limbs of the floor of the k-th root and of its k-th power.
+    """
+    size = -(-len(n) // k)
+    if size <= ROOT_BASECASE_LIMBS:
+        root = _iroot_int(_limbs_to_int(n, base), k)
+        return _int_to_limbs(root, base), _int_to_limbs(root**k, base)
+
+    j = (size - 1) // 2
+    x = [0] * j + _add_limbs(_iroot_limbs(_shift_down(n, k * j), k, base)[0], [1], base)
+
+    # The starting value is always too large, so the first step needs no check
+    multiply = lambda a, b: _mul_limbs(a, b, base)
+    partial = _sliding_window_pow(x, k - 1, [1], multiply)
+    while True:
+        # x = ((k - 1) * x + n // x**(k - 1)) // k
+        quotient = _divmod_limbs(n, partial, base)[0]
+        x = _divmod_small(_add_limbs(_mul_small(x, k - 1, base), quotient, base), k, base)[0]
+
+        partial = _sliding_window_pow(x, k - 1, [1], multiply)
+        power = _mul_limbs(partial, x, base)
+        if _cmp_limbs(power, n) <= 0:
+            return x, power
+
+
+def iroot(n: "num | int", k: int) -> tuple:
+    """
+    Computes the integer k-th root of a number together with its remainder.
+
+    Negative radicands are only allowed for odd `k`, their root is rounded towards zero.
+
+    Args:
+        n (num | int): The radicand.
+        k (int): The degree of the root, at least 1.
+
+    Returns:
+        tuple: `(root, remainder)` as `num` values with `root**k + remainder == n`.
+    """
+    n = n if isinstance(n, num) else num(n)
+    if k < 1:
+        raise ValueError("iroot() degree must be positive")
+    if n.negative and k % 2 == 0:
+        raise ValueError("iroot() of a negative number needs an odd degree")
+
+    base = n.chunkbase
+    limbs = list(n.limbs)
+    root, power = (limbs, limbs) if k == 1 else _iroot_limbs(limbs, k, base)
+
+    # The remainder keeps the sign of the radicand
+    remainder = _sub_limbs(limbs, power, base)
+    return (num._from_limbs(root, n.negative, n.chunksize),
+            num._from_limbs(remainder, n.negative, n.chunksize))
+
+
+def isqrt(n: "num | int") -> tuple:
+    """
+    Computes the integer square root of a non-negative number together with its remainder.
+
+    Args:
+        n (num | int): The non-negative radicand.
+
+    Returns:
+        tuple: `(root, remainder)` as `num` values with `root**2 + remainder == n`.
+    """
+    n = n if isinstance(n, num) else num(n)
+    if n.negative:
+        raise ValueError("isqrt() argument must be nonnegative")
+    return iroot(n, 2)
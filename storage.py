@@ -0,0 +1,74 @@
+import mmap
+import os
+import sys
+
+from math_lib import num, FORMAT_VERSION, _FORMAT_MAGIC, _HEADER, _copy_limbs
+
+
+def save(value: num, file) -> None:
+    """
+    Writes a number to a file in the binary format of `num.to_bytes`.
+
+    The limbs are written straight from their buffer, so even multi-GB numbers are
+    saved without building a second copy in memory. Several numbers can be written
+    one after another into the same open file and read back with `load`.
+
+    Args:
+        value (num): The number to save.
+        file: A path or a binary file object opened for writing.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "wb") as handle:
+            save(value, handle)
+        return
+
+    file.write(_HEADER.pack(_FORMAT_MAGIC, FORMAT_VERSION, value.negative, value.chunksize, len(value.limbs)))
+    limbs = value.limbs
+    if sys.byteorder != "little":
+        limbs = _copy_limbs(limbs)
+        limbs.byteswap()
+    file.write(limbs)
+
+
+def load(file) -> num:
+    """
+    Reads a number written by `save` into memory.
+
+    Args:
+        file: A path or a binary file object opened for reading, positioned at the number.
+
+    Returns:
+        num: The number.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "rb") as handle:
+            return load(handle)
+
+    header = file.read(_HEADER.size)
+    count = _HEADER.unpack(header)[4] if len(header) == _HEADER.size else 0
+
+    # Read the limbs straight into the buffer that holds them afterwards
+    data = bytearray(len(header) + 8 * count)
+    data[:len(header)] = header
+    if file.readinto(memoryview(data)[len(header):]) != 8 * count:
+        raise ValueError("file ends before the limbs of the num")
+    return num.from_bytes(data)
+
+
+def open_mapped(path) -> num:
+    """
+    Opens a number saved with `save` as a read-only memory map, without reading it.
+
+    The limbs of the returned number live in the mapped file and are only paged in as
+    they are used. Arithmetic creates new numbers in memory as usual, in-place operators
+    copy the limbs first. The mapping is released with the last number that uses it.
+
+    Args:
+        path: The path of a file that holds exactly one saved number.
+
+    Returns:
+        num: The memory-mapped number.
+    """
+    with open(path, "rb") as handle:
+        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    return num.from_bytes(mapped, copy=False)